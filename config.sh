@@ -9,6 +9,34 @@ CLANG_OPT_LEVELS="-O0 -O1 -O2 -O3 -Os -Oz"
 # 高级优化
 ENABLE_LTO=true
 ENABLE_PGO=true
+ENABLE_STATIC=true
+
+# 运行时内存测量（峰值RSS、缺页、上下文切换）
+ENABLE_MEMORY_PROFILE=true
+MEMORY_PROFILE_RUNS=5
+
+# 微基准测试（每种算法实现的单次调用耗时）
+ENABLE_MICROBENCH=true
+MICROBENCH_REPEATS=5
+MICROBENCH_MIN_TIME_MS=10
+
+# 函数级运行时剖析（-finstrument-functions插桩版本）
+ENABLE_FUNCTION_PROFILE=true
+FUNCTION_PROFILE_RUNS=5
+
+# 优化备注（-fsave-optimization-record，每个函数的内联/向量化/展开/错失次数）
+ENABLE_OPT_REMARKS=true
+
+# 压缩后大小（去除符号的可执行文件和.text段，zlib/lzma/bz2）
+ENABLE_COMPRESSED_SIZE=true
+
+# 相同代码检测（函数机器码哈希索引，需要objdump输出）
+ENABLE_IDENTICAL_CODE=true
+IDENTICAL_CODE_THRESHOLD=0.8
+
+# 工件存储（objdump/readelf/nm输出分块去重压缩，保存在results/artifacts.db）
+ENABLE_ARTIFACT_STORE=true
+KEEP_TEXT_ARTIFACTS=false
 
 # 输出目录
 BUILD_DIR="build"
@@ -9,6 +9,57 @@ import os
 import argparse
 from pathlib import Path
 
+import derived_tables
+import symbol_sizes
+from compressed_size import COMPRESSED_METRICS
+from microbench import SIZES_FILE as BENCH_SIZES_FILE, SIZE_COLUMNS as BENCH_SIZE_COLUMNS
+from opt_remarks import REMARK_CATEGORIES
+from bootstrap_stats import bootstrap_ci, bootstrap_difference, DEFAULT_CONFIDENCE
+
+
+# 需要检验显著性的优化级别对 (基准, 对比)
+OPT_LEVEL_PAIRS = [('-O2', '-O3'), ('-O2', '-Os'), ('-Os', '-Oz'), ('-O2', 'lto'), ('-O2', 'pgo')]
+
+# 运行时内存占用的对比基准和对比配置
+MEMORY_BASELINE = '-O2'
+MEMORY_CONFIGS = ['-O3', '-Os', 'lto', 'static']
+
+# 运行时内存指标列
+MEMORY_METRICS = ['peak_rss_kb', 'minor_faults', 'major_faults',
+                  'voluntary_ctx_switches', 'involuntary_ctx_switches']
+
+# 微基准测试加速比的对比基准
+BENCH_BASELINE = '-O0'
+
+# 函数级剖析: 按自身时间从高到低累计占比达到该值之前的函数视为热点
+HOT_TIME_SHARE = 0.9
+
+# 不参与热点判定的函数: main只运行一次，其自身时间主要是驱动循环和所调用函数的插桩计时开销
+HOT_EXCLUDED_FUNCTIONS = ['main']
+
+# 汇总报告中列出函数级剖析结果的优化级别
+PROFILE_REPORT_OPT = '-O2'
+
+# 优化备注: 函数大小变化的对比基准，以及可归因的优化决策（按优先级）
+REMARKS_BASELINE = '-O2'
+GROWTH_CAUSES = ['inlined', 'unrolled', 'vectorized']
+
+# 汇总报告中列出函数大小增长归因的优化级别
+REMARKS_REPORT_OPT = '-O3'
+
+# 每种压缩对象对应的未压缩大小列
+UNCOMPRESSED_COLUMNS = {'stripped': 'stripped_size', 'text': 'text_section_size'}
+
+# 可选测量结果在results/中的默认文件名，文件不存在时跳过对应分析
+OPTIONAL_INPUTS = {
+    'memory': 'memory_footprint.csv',
+    'bench': 'microbench.csv',
+    'compressed': 'compressed_size.csv',
+    'hashes': 'function_hashes.csv',
+    'profile': 'function_profile.csv',
+    'remarks': 'opt_remarks.csv',
+}
+
 
 def load_data(csv_file):
     """
@@ -37,6 +88,159 @@ def load_data(csv_file):
         raise Exception(f"加载数据失败: {e}")
 
 
+def load_memory_data(csv_file):
+    """
+    加载运行时内存测量CSV文件
+    
+    Args:
+        csv_file: CSV文件路径
+        
+    Returns:
+        pandas DataFrame包含每次运行的内存指标
+        
+    Raises:
+        ValueError: 如果缺少必需列
+    """
+    df = load_data(csv_file)
+    
+    required_columns = ['program', 'compiler', 'opt_level', 'exit_status'] + MEMORY_METRICS
+    missing_columns = set(required_columns) - set(df.columns)
+    if missing_columns:
+        raise ValueError(f"内存测量文件缺少必需列: {missing_columns}")
+    
+    return df
+
+
+def load_bench_data(csv_file):
+    """
+    加载微基准测试CSV文件
+    
+    Args:
+        csv_file: CSV文件路径
+        
+    Returns:
+        pandas DataFrame包含每次测量的单次调用耗时
+        
+    Raises:
+        ValueError: 如果缺少必需列
+    """
+    df = load_data(csv_file)
+    
+    required_columns = ['program', 'compiler', 'opt_level', 'function', 'ns_per_call']
+    missing_columns = set(required_columns) - set(df.columns)
+    if missing_columns:
+        raise ValueError(f"微基准测试文件缺少必需列: {missing_columns}")
+    
+    return df
+
+
+def load_bench_sizes(csv_file):
+    """
+    加载基准测试工具中被测函数的大小，文件不存在时返回空表
+    
+    Args:
+        csv_file: CSV文件路径
+        
+    Returns:
+        pandas DataFrame，包含 program, compiler, opt_level, function, function_size
+    """
+    if not os.path.exists(csv_file):
+        return pd.DataFrame(columns=BENCH_SIZE_COLUMNS)
+    return pd.read_csv(csv_file)[BENCH_SIZE_COLUMNS]
+
+
+def load_compressed_data(csv_file):
+    """
+    加载压缩大小CSV文件
+    
+    Args:
+        csv_file: CSV文件路径
+        
+    Returns:
+        pandas DataFrame包含每个单元的压缩后大小
+        
+    Raises:
+        ValueError: 如果缺少必需列
+    """
+    df = load_data(csv_file)
+    
+    required_columns = ['program', 'compiler', 'opt_level'] + list(UNCOMPRESSED_COLUMNS.values())
+    missing_columns = set(required_columns) - set(df.columns)
+    if missing_columns:
+        raise ValueError(f"压缩大小文件缺少必需列: {missing_columns}")
+    
+    return df
+
+
+def load_function_hashes(csv_file):
+    """
+    加载函数哈希索引CSV文件
+    
+    Args:
+        csv_file: CSV文件路径
+        
+    Returns:
+        pandas DataFrame包含每个构建中每个函数的大小和规范化哈希
+        
+    Raises:
+        ValueError: 如果缺少必需列
+    """
+    df = load_data(csv_file)
+    
+    required_columns = ['program', 'compiler', 'opt_level', 'function', 'size', 'hash']
+    missing_columns = set(required_columns) - set(df.columns)
+    if missing_columns:
+        raise ValueError(f"函数哈希索引缺少必需列: {missing_columns}")
+    
+    return df
+
+
+def load_function_profile(csv_file):
+    """
+    加载函数级剖析CSV文件
+    
+    Args:
+        csv_file: CSV文件路径
+        
+    Returns:
+        pandas DataFrame包含每个函数每次运行的平均调用次数和自身时间
+        
+    Raises:
+        ValueError: 如果缺少必需列
+    """
+    df = load_data(csv_file)
+    
+    required_columns = ['program', 'compiler', 'opt_level', 'function', 'calls', 'self_ns']
+    missing_columns = set(required_columns) - set(df.columns)
+    if missing_columns:
+        raise ValueError(f"函数级剖析文件缺少必需列: {missing_columns}")
+    
+    return df
+
+
+def load_opt_remarks(csv_file):
+    """
+    加载优化备注CSV文件
+    
+    Args:
+        csv_file: CSV文件路径
+        
+    Returns:
+        pandas DataFrame包含每个函数的内联、向量化、展开和错失优化次数
+        
+    Raises:
+        ValueError: 如果缺少必需列
+    """
+    df = load_data(csv_file)
+    
+    required_columns = ['program', 'compiler', 'opt_level', 'function', 'timestamp'] + REMARK_CATEGORIES
+    missing_columns = set(required_columns) - set(df.columns)
+    if missing_columns:
+        raise ValueError(f"优化备注文件缺少必需列: {missing_columns}")
+    
+    return df
+
+
 def validate_data(df):
     """
     验证数据完整性和必需列
@@ -89,12 +293,12 @@ def validate_data(df):
 
 def calculate_statistics(df, output_file):
     """
-    计算统计信息：平均值、中位数、标准差
+    计算统计信息：平均值、中位数、标准差和总大小均值的bootstrap置信区间
     按程序、编译器和优化级别分组
     
     Args:
         df: pandas DataFrame
-        output_file: 输出CSV文件路径
+        output_file: 输出CSV文件路径，为None时不保存
         
     Returns:
         统计结果DataFrame
@@ -116,55 +320,69 @@ def calculate_statistics(df, output_file):
     stats.columns = ['_'.join(col).strip('_') if col[1] else col[0] 
                      for col in stats.columns.values]
     
+    # 总大小均值的bootstrap置信区间
+    ci = bootstrap_ci(df, 'total_size', ['program', 'compiler', 'opt_level'])
+    ci = ci.rename(columns={'ci_low': 'total_size_ci_low', 'ci_high': 'total_size_ci_high'})
+    stats = stats.merge(ci[['program', 'compiler', 'opt_level', 'total_size_ci_low', 'total_size_ci_high']],
+                        on=['program', 'compiler', 'opt_level'], how='left')
+    
     # 保存结果
-    stats.to_csv(output_file, index=False)
-    print(f"统计结果已保存到: {output_file}")
+    if output_file is not None:
+        stats.to_csv(output_file, index=False)
+        print(f"统计结果已保存到: {output_file}")
     print(f"生成了 {len(stats)} 条统计记录")
     
     return stats
 
 
-def compare_compilers(df, output_file):
+def compare_compilers(df, output_file, sizes=None):
     """
     比较GCC和Clang编译器
     计算相同优化级别下的代码大小差异和百分比差异
+    只有差异的bootstrap置信区间不包含0时才判定更小的编译器；
+    样本不足（任一编译器只有一次测量）时无法检验，直接按大小判定
     
     Args:
         df: pandas DataFrame
-        output_file: 输出CSV文件路径
+        output_file: 输出CSV文件路径，为None时不保存
+        sizes: 已计算的program_sizes派生表，为None时从df计算
         
     Returns:
         编译器比较结果DataFrame
     """
     print("\n比较编译器...")
     
-    # 获取GCC和Clang的数据
-    gcc_data = df[df['compiler'] == 'gcc'].copy()
-    clang_data = df[df['compiler'] == 'clang'].copy()
-    
-    # 合并数据以进行比较
-    comparison = pd.merge(
-        gcc_data[['program', 'opt_level', 'total_size']],
-        clang_data[['program', 'opt_level', 'total_size']],
-        on=['program', 'opt_level'],
-        suffixes=('_gcc', '_clang'),
-        how='outer'
-    )
+    if sizes is None:
+        sizes = derived_tables.program_sizes(df)
+    
+    # 每个编译器在每个 (程序, 优化级别) 上的平均大小
+    means = sizes.pivot(index=['program', 'opt_level'], columns='compiler', values='total_size')
+    comparison = pd.DataFrame({
+        'total_size_gcc': means['gcc'] if 'gcc' in means else float('nan'),
+        'total_size_clang': means['clang'] if 'clang' in means else float('nan')
+    }, index=means.index).reset_index()
     
     # 计算差异
     comparison['size_diff'] = comparison['total_size_clang'] - comparison['total_size_gcc']
     comparison['size_diff_pct'] = (comparison['size_diff'] / comparison['total_size_gcc'] * 100).round(2)
     
-    # 添加比较结果标签
-    comparison['smaller_compiler'] = comparison.apply(
-        lambda row: 'gcc' if row['total_size_gcc'] < row['total_size_clang'] 
-        else ('clang' if row['total_size_clang'] < row['total_size_gcc'] else 'equal'),
-        axis=1
-    )
+    # 差异的置信区间和显著性（clang - gcc）
+    diff = bootstrap_difference(df, 'total_size', ['program', 'opt_level'], 'compiler', 'gcc', 'clang')
+    comparison = comparison.merge(diff[['program', 'opt_level', 'ci_low', 'ci_high', 'p_value', 'significant']],
+                                  on=['program', 'opt_level'], how='left')
+    comparison['significant'] = comparison['significant'].fillna(False).astype(bool)
+    
+    # 添加比较结果标签，差异不显著时视为相同；样本不足时没有p值，按大小判定
+    insufficient = comparison['p_value'].isna() & comparison['size_diff'].notna()
+    decided = comparison['significant'] | insufficient
+    comparison['smaller_compiler'] = 'equal'
+    comparison.loc[decided & (comparison['size_diff'] > 0), 'smaller_compiler'] = 'gcc'
+    comparison.loc[decided & (comparison['size_diff'] < 0), 'smaller_compiler'] = 'clang'
     
     # 保存结果
-    comparison.to_csv(output_file, index=False)
-    print(f"编译器比较结果已保存到: {output_file}")
+    if output_file is not None:
+        comparison.to_csv(output_file, index=False)
+        print(f"编译器比较结果已保存到: {output_file}")
     print(f"生成了 {len(comparison)} 条比较记录")
     
     # 打印汇总统计
@@ -172,11 +390,57 @@ def compare_compilers(df, output_file):
     clang_wins = (comparison['smaller_compiler'] == 'clang').sum()
     print(f"GCC生成更小代码: {gcc_wins} 次")
     print(f"Clang生成更小代码: {clang_wins} 次")
+    if insufficient.any():
+        print(f"样本不足、未做显著性检验: {insufficient.sum()} 次")
     
     return comparison
 
 
-def analyze_optimization_impact(df, output_file):
+def compare_opt_levels(df, output_file, pairs=OPT_LEVEL_PAIRS):
+    """
+    检验优化级别之间的代码大小差异是否显著（如 -O2 vs -O3, -Os vs -Oz）
+    按编译器和程序分组，所有分组一次性进行bootstrap
+    
+    Args:
+        df: pandas DataFrame
+        output_file: 输出CSV文件路径，为None时不保存
+        pairs: (基准优化级别, 对比优化级别) 列表
+        
+    Returns:
+        优化级别显著性检验结果DataFrame
+    """
+    print("\n检验优化级别差异显著性...")
+    
+    results = []
+    for opt_a, opt_b in pairs:
+        diff = bootstrap_difference(df, 'total_size', ['program', 'compiler'], 'opt_level', opt_a, opt_b)
+        diff.insert(2, 'opt_a', opt_a)
+        diff.insert(3, 'opt_b', opt_b)
+        results.append(diff)
+    
+    significance_df = pd.concat(results, ignore_index=True)
+    significance_df = significance_df.rename(columns={'mean_a': 'size_a', 'mean_b': 'size_b',
+                                                      'diff': 'size_diff'})
+    
+    # 保存结果
+    if output_file is not None:
+        significance_df.to_csv(output_file, index=False)
+        print(f"优化级别显著性检验已保存到: {output_file}")
+    print(f"生成了 {len(significance_df)} 条检验记录")
+    
+    # 打印每对优化级别中对比级别显著更小的次数
+    for (opt_a, opt_b), group in significance_df.groupby(['opt_a', 'opt_b'], sort=False):
+        smaller = (group['significant'] & (group['size_diff'] < 0)).sum()
+        larger = (group['significant'] & (group['size_diff'] > 0)).sum()
+        insufficient = group['p_value'].isna().sum()
+        print(f"  {opt_b} vs {opt_a}: 显著更小 {smaller} 次, 显著更大 {larger} 次, "
+              f"无显著差异 {len(group) - smaller - larger - insufficient} 次, "
+              f"样本不足 {insufficient} 次")
+    
+    return significance_df
+
+
+def analyze_optimization_impact(df, output_file, impact_df=None):
     """
     分析优化级别的影响
     计算相对于-O0的代码大小减少百分比
@@ -184,47 +448,21 @@ def analyze_optimization_impact(df, output_file):
     
     Args:
         df: pandas DataFrame
-        output_file: 输出CSV文件路径
+        output_file: 输出CSV文件路径，为None时不保存
+        impact_df: 已计算的派生影响矩阵，为None时从df计算
         
     Returns:
         优化影响分析结果DataFrame
     """
     print("\n分析优化影响...")
     
-    results = []
-    
-    # 按程序和编译器分组
-    for (program, compiler), group in df.groupby(['program', 'compiler']):
-        # 获取-O0基准
-        baseline = group[group['opt_level'] == '-O0']
-        if baseline.empty:
-            continue
-        
-        baseline_size = baseline['total_size'].values[0]
-        
-        # 计算每个优化级别相对于-O0的减少
-        for _, row in group.iterrows():
-            opt_level = row['opt_level']
-            total_size = row['total_size']
-            
-            size_reduction = baseline_size - total_size
-            reduction_pct = (size_reduction / baseline_size * 100).round(2)
-            
-            results.append({
-                'program': program,
-                'compiler': compiler,
-                'opt_level': opt_level,
-                'baseline_size': baseline_size,
-                'optimized_size': total_size,
-                'size_reduction': size_reduction,
-                'reduction_pct': reduction_pct
-            })
-    
-    impact_df = pd.DataFrame(results)
+    if impact_df is None:
+        impact_df = derived_tables.impact_matrix(df)
     
     # 保存结果
-    impact_df.to_csv(output_file, index=False)
-    print(f"优化影响分析已保存到: {output_file}")
+    if output_file is not None:
+        impact_df.to_csv(output_file, index=False)
+        print(f"优化影响分析已保存到: {output_file}")
     print(f"生成了 {len(impact_df)} 条分析记录")
     
     # 识别最有效的优化级别
@@ -236,7 +474,484 @@ def analyze_optimization_impact(df, output_file):
     return impact_df
 
 
-def generate_summary_report(df, stats_df, comparison_df, impact_df, output_file):
+def analyze_memory_footprint(memory_df, output_file):
+    """
+    分析运行时内存占用
+    按程序、编译器和优化级别汇总峰值RSS、缺页和上下文切换，
+    并检验-O3、-Os、LTO和静态链接相对于-O2的峰值RSS变化是否显著
+    
+    Args:
+        memory_df: 运行时内存测量DataFrame（每次运行一行）
+        output_file: 输出CSV文件路径，为None时不保存
+        
+    Returns:
+        内存占用分析结果DataFrame
+    """
+    print("\n分析运行时内存占用...")
+    
+    keys = ['program', 'compiler', 'opt_level']
+    memory_df = memory_df[memory_df['exit_status'] == 0]
+    
+    # 每个单元的平均指标和峰值RSS的置信区间
+    footprint = memory_df.groupby(keys, as_index=False)[MEMORY_METRICS].mean()
+    footprint.insert(3, 'runs', memory_df.groupby(keys).size().values)
+    ci = bootstrap_ci(memory_df, 'peak_rss_kb', keys)
+    footprint = footprint.merge(ci[keys + ['ci_low', 'ci_high']].rename(
+        columns={'ci_low': 'peak_rss_ci_low', 'ci_high': 'peak_rss_ci_high'}), on=keys, how='left')
+    
+    # 相对于基准优化级别的变化
+    baseline = footprint[footprint['opt_level'] == MEMORY_BASELINE]
+    footprint = footprint.merge(
+        baseline[['program', 'compiler', 'peak_rss_kb', 'minor_faults']].rename(
+            columns={'peak_rss_kb': 'baseline_peak_rss_kb', 'minor_faults': 'baseline_minor_faults'}),
+        on=['program', 'compiler'], how='left')
+    footprint['peak_rss_delta_kb'] = footprint['peak_rss_kb'] - footprint['baseline_peak_rss_kb']
+    footprint['peak_rss_delta_pct'] = (footprint['peak_rss_delta_kb']
+                                       / footprint['baseline_peak_rss_kb'] * 100).round(2)
+    footprint['minor_faults_delta'] = footprint['minor_faults'] - footprint['baseline_minor_faults']
+    
+    # 峰值RSS变化的显著性
+    diffs = []
+    for config in MEMORY_CONFIGS:
+        diff = bootstrap_difference(memory_df, 'peak_rss_kb', ['program', 'compiler'],
+                                    'opt_level', MEMORY_BASELINE, config)
+        diff['opt_level'] = config
+        diffs.append(diff[['program', 'compiler', 'opt_level', 'p_value', 'significant']])
+    footprint = footprint.merge(pd.concat(diffs, ignore_index=True), on=keys, how='left')
+    footprint = footprint.rename(columns={'p_value': 'peak_rss_p_value',
+                                          'significant': 'peak_rss_significant'})
+    
+    # 保存结果
+    if output_file is not None:
+        footprint.to_csv(output_file, index=False)
+        print(f"内存占用分析已保存到: {output_file}")
+    print(f"生成了 {len(footprint)} 条内存分析记录")
+    
+    # 打印各配置相对于基准的平均变化
+    print(f"\n相对于{MEMORY_BASELINE}的平均峰值RSS变化:")
+    changes = footprint[footprint['opt_level'].isin(MEMORY_CONFIGS)]
+    for (compiler, opt_level), group in changes.groupby(['compiler', 'opt_level']):
+        print(f"  {compiler} {opt_level}: {group['peak_rss_delta_kb'].mean():+.1f} KB "
+              f"({group['peak_rss_delta_pct'].mean():+.2f}%), "
+              f"缺页 {group['minor_faults_delta'].mean():+.1f}")
+    
+    return footprint
+
+
+def analyze_microbenchmarks(bench_df, function_sizes, output_file):
+    """
+    分析每种算法实现的运行时间与函数大小
+    按程序、编译器、优化级别和函数汇总单次调用耗时，计算相对于-O0（同一编译器）的加速比，
+    并与基准测试工具中的函数大小关联，得到每个优化级别的速度/大小权衡
+    
+    Args:
+        bench_df: 微基准测试DataFrame（每次测量一行）
+        function_sizes: 被测函数大小DataFrame（load_bench_sizes的结果）
+        output_file: 输出CSV文件路径，为None时不保存
+        
+    Returns:
+        微基准测试分析结果DataFrame
+    """
+    print("\n分析微基准测试结果...")
+    
+    keys = ['program', 'compiler', 'opt_level', 'function']
+    
+    # 中位数对偶发的调度干扰不敏感
+    bench = bench_df.groupby(keys, as_index=False).agg(
+        runs=('ns_per_call', 'size'),
+        median_ns=('ns_per_call', 'median'),
+        min_ns=('ns_per_call', 'min'))
+    ci = bootstrap_ci(bench_df, 'ns_per_call', keys)
+    bench = bench.merge(ci[keys + ['ci_low', 'ci_high']].rename(
+        columns={'ci_low': 'ns_ci_low', 'ci_high': 'ns_ci_high'}), on=keys, how='left')
+    
+    # 函数大小；在基准测试工具中被完全内联的函数没有符号，大小为空
+    bench = bench.merge(function_sizes, on=keys, how='left')
+    
+    # 相对于基准优化级别的加速比和大小变化
+    baseline = bench[bench['opt_level'] == BENCH_BASELINE][
+        ['program', 'compiler', 'function', 'median_ns', 'function_size']].rename(
+        columns={'median_ns': 'baseline_ns', 'function_size': 'baseline_function_size'})
+    bench = bench.merge(baseline, on=['program', 'compiler', 'function'], how='left')
+    bench['speedup'] = (bench['baseline_ns'] / bench['median_ns']).round(3)
+    bench['size_change_pct'] = ((bench['function_size'] - bench['baseline_function_size'])
+                                / bench['baseline_function_size'] * 100).round(2)
+    bench = bench.drop(columns=['baseline_ns', 'baseline_function_size'])
+    
+    # 保存结果
+    if output_file is not None:
+        bench.to_csv(output_file, index=False)
+        print(f"微基准测试分析已保存到: {output_file}")
+    print(f"生成了 {len(bench)} 条微基准测试记录")
+    
+    # 打印各优化级别相对于基准的平均加速比和函数大小变化
+    print(f"\n相对于{BENCH_BASELINE}的平均加速比:")
+    changes = bench[bench['opt_level'] != BENCH_BASELINE]
+    for (compiler, opt_level), group in changes.groupby(['compiler', 'opt_level']):
+        print(f"  {compiler} {opt_level}: {group['speedup'].mean():.2f}x, "
+              f"函数大小 {group['size_change_pct'].mean():+.2f}%")
+    
+    return bench
+
+
+def analyze_transfer_size(compressed_df, output_file):
+    """
+    分析传输大小（压缩后大小）最小的编译器和优化级别
+    对每个程序和每种 对象/算法/级别 组合找出压缩后最小的配置，
+    并与未压缩时最小的配置比较——两者经常不同
+    
+    Args:
+        compressed_df: 压缩大小DataFrame（每个单元一行，重复测量取平均）
+        output_file: 输出CSV文件路径，为None时不保存
+        
+    Returns:
+        传输大小分析结果DataFrame
+    """
+    print("\n分析压缩后传输大小...")
+    
+    keys = ['program', 'compiler', 'opt_level']
+    metrics = [col for col in COMPRESSED_METRICS if col in compressed_df.columns]
+    sizes = compressed_df.groupby(keys, as_index=False)[
+        list(UNCOMPRESSED_COLUMNS.values()) + metrics].mean()
+    
+    rows = []
+    for program, group in sizes.groupby('program'):
+        for target, uncompressed_col in UNCOMPRESSED_COLUMNS.items():
+            # 未压缩大小并列最小时（去除符号的文件按页对齐，很常见）取其中压缩后最小的
+            candidates = group[group[uncompressed_col] == group[uncompressed_col].min()]
+            for metric in metrics:
+                if not metric.startswith(f'{target}_'):
+                    continue
+                _, codec, level = metric.rsplit('_', 2)
+                best = group.loc[group[metric].idxmin()]
+                reference = candidates.loc[candidates[metric].idxmin()]
+                rows.append({
+                    'program': program,
+                    'target': target,
+                    'codec': codec,
+                    'level': int(level),
+                    'best_compiler': best['compiler'],
+                    'best_opt_level': best['opt_level'],
+                    'best_size': best[metric],
+                    'compression_ratio': round(best[metric] / best[uncompressed_col], 4),
+                    'uncompressed_best_compiler': reference['compiler'],
+                    'uncompressed_best_opt_level': reference['opt_level'],
+                    'uncompressed_best_compressed_size': reference[metric],
+                    'saving_vs_uncompressed_best': reference[metric] - best[metric],
+                    'winner_differs': reference[metric] > best[metric],
+                })
+    transfer = pd.DataFrame(rows)
+    
+    # 保存结果
+    if output_file is not None:
+        transfer.to_csv(output_file, index=False)
+        print(f"传输大小分析已保存到: {output_file}")
+    print(f"生成了 {len(transfer)} 条传输大小记录")
+    
+    # 打印压缩后最优配置与未压缩最优配置不同的比例
+    print("\n压缩后最优配置与未压缩最优配置不同的程序数:")
+    for (target, codec, level), group in transfer.groupby(['target', 'codec', 'level']):
+        print(f"  {target:8s} {codec}-{level}: {group['winner_differs'].sum()}/{len(group)}, "
+              f"平均节省 {group['saving_vs_uncompressed_best'].mean():.1f} 字节")
+    
+    return transfer
+
+
+def analyze_identical_code(hash_df, near_df, output_file, groups_file=None):
+    """
+    分析相同代码
+    按程序估计相同代码折叠（ICF，同一可执行文件内的相同函数只保留一份）
+    和跨构建去重（所有构建中的相同函数只存一份）可以节省的字节数
+    
+    Args:
+        hash_df: 函数哈希索引DataFrame（每个构建的每个函数一行）
+        near_df: 近似相同函数对DataFrame（可为None）
+        output_file: 按程序汇总的输出CSV文件路径，为None时不保存
+        groups_file: 相同函数分组的输出CSV文件路径，为None时不保存
+        
+    Returns:
+        按程序汇总的相同代码分析结果DataFrame
+    """
+    print("\n分析相同代码...")
+    
+    build_keys = ['program', 'compiler', 'opt_level']
+    
+    # 构建内: 每组相同函数折叠后只保留一份
+    within = hash_df.groupby(build_keys + ['hash']).agg(copies=('size', 'size'), size=('size', 'first'))
+    within = within[within['copies'] > 1].reset_index()
+    within['savings'] = (within['copies'] - 1) * within['size']
+    
+    # 跨构建: 每个程序的所有构建中相同的函数只存一份
+    unique = hash_df.drop_duplicates(['program', 'hash'])
+    
+    summary = hash_df.groupby('program').agg(
+        builds=('opt_level', lambda s: hash_df.loc[s.index, ['compiler', 'opt_level']]
+                .drop_duplicates().shape[0]),
+        functions=('hash', 'size'),
+        function_bytes=('size', 'sum'))
+    summary['icf_groups'] = within.groupby('program').size()
+    summary['icf_savings_bytes'] = within.groupby('program')['savings'].sum()
+    summary = summary.fillna({'icf_groups': 0, 'icf_savings_bytes': 0})
+    summary['icf_savings_per_build'] = (summary['icf_savings_bytes'] / summary['builds']).round(1)
+    summary['unique_functions'] = unique.groupby('program').size()
+    summary['dedup_savings_bytes'] = summary['function_bytes'] - unique.groupby('program')['size'].sum()
+    summary['dedup_savings_pct'] = (summary['dedup_savings_bytes']
+                                    / summary['function_bytes'] * 100).round(2)
+    
+    if near_df is not None and not near_df.empty:
+        counts = near_df.groupby(['program', 'scope']).size().unstack(fill_value=0)
+        summary['near_identical_within'] = counts.get('within', 0)
+        summary['near_identical_across'] = counts.get('across', 0)
+    else:
+        summary['near_identical_within'] = 0
+        summary['near_identical_across'] = 0
+    summary = summary.fillna({'near_identical_within': 0, 'near_identical_across': 0})
+    int_columns = ['icf_groups', 'icf_savings_bytes', 'near_identical_within', 'near_identical_across']
+    summary[int_columns] = summary[int_columns].astype(int)
+    summary = summary.reset_index()
+    
+    # 相同函数分组: 同一程序中哈希相同的所有函数
+    if groups_file is not None:
+        members = hash_df.assign(member=hash_df['compiler'] + ' ' + hash_df['opt_level'] + ' '
+                                 + hash_df['function'])
+        groups = members.groupby(['program', 'hash']).agg(
+            size=('size', 'first'),
+            copies=('member', 'size'),
+            builds=('opt_level', lambda s: members.loc[s.index, ['compiler', 'opt_level']]
+                    .drop_duplicates().shape[0]),
+            members=('member', '; '.join)).reset_index()
+        groups = groups[groups['copies'] > 1]
+        groups.insert(2, 'scope', (groups['copies'] > groups['builds']).map(
+            {True: 'within', False: 'across'}))
+        groups.sort_values(['program', 'size'], ascending=[True, False]).to_csv(groups_file, index=False)
+        print(f"相同函数分组已保存到: {groups_file}")
+    
+    # 保存结果
+    if output_file is not None:
+        summary.to_csv(output_file, index=False)
+        print(f"相同代码分析已保存到: {output_file}")
+    
+    # 打印每个程序可节省的字节数
+    print("\n相同代码折叠/去重可节省的字节数:")
+    for _, row in summary.iterrows():
+        print(f"  {row['program']:15s}: ICF {row['icf_savings_bytes']} 字节, "
+              f"跨构建去重 {row['dedup_savings_bytes']} 字节 ({row['dedup_savings_pct']:.2f}%)")
+    
+    return summary
+
+
+def analyze_function_profile(profile_df, function_sizes, output_file):
+    """
+    将函数级剖析与函数大小关联，计算每个函数的"每热点微秒字节数"
+    每个可执行文件中自身时间累计占比前90%的函数是热点，值得为速度编译；
+    其余函数几乎不占运行时间，应当为大小编译。main不参与占比计算，总是标记为大小
+    
+    Args:
+        profile_df: 函数级剖析DataFrame（每个构建的每个函数一行）
+        function_sizes: 函数大小DataFrame（symbol_sizes.load_function_sizes的结果）
+        output_file: 输出CSV文件路径，为None时不保存
+        
+    Returns:
+        函数热度分析结果DataFrame
+    """
+    print("\n分析函数级剖析结果...")
+    
+    build_keys = ['program', 'compiler', 'opt_level']
+    keys = build_keys + ['function']
+    
+    # 重复剖析的结果取平均
+    hotness = profile_df.groupby(keys, as_index=False)[['calls', 'self_ns']].mean()
+    hotness['self_us'] = (hotness['self_ns'] / 1000).round(3)
+    hotness = hotness.drop(columns='self_ns')
+    
+    # 自身时间占比和热点判定，占比只在参与判定的函数之间计算
+    hotness = hotness.sort_values(build_keys + ['self_us'], ascending=[True] * 3 + [False])
+    ranked = ~hotness['function'].isin(HOT_EXCLUDED_FUNCTIONS)
+    ranked_us = hotness['self_us'].where(ranked)
+    total = ranked_us.groupby([hotness[key] for key in build_keys]).transform('sum')
+    hotness['self_time_share'] = (ranked_us / total).round(4)
+    preceding = (hotness.groupby(build_keys)['self_time_share'].cumsum()
+                 - hotness['self_time_share'])
+    hotness['hot'] = ranked & (preceding < HOT_TIME_SHARE)
+    
+    # 函数大小取自未插桩的构建；被完全内联的函数没有符号，大小为空
+    hotness = hotness.merge(function_sizes, on=keys, how='left')
+    hotness['bytes_per_hot_us'] = (hotness['function_size']
+                                   / hotness['self_us'].where(hotness['self_us'] > 0)).round(2)
+    hotness['compile_for'] = hotness['hot'].map({True: 'speed', False: 'size'})
+    
+    # 保存结果
+    if output_file is not None:
+        hotness.to_csv(output_file, index=False)
+        print(f"函数热度分析已保存到: {output_file}")
+    print(f"生成了 {len(hotness)} 条函数热度记录")
+    
+    # 打印热点函数占用的代码比例
+    print("\n热点函数的代码大小占比:")
+    for (compiler, opt_level), group in hotness.groupby(['compiler', 'opt_level']):
+        sized = group.dropna(subset=['function_size'])
+        hot_bytes = sized.loc[sized['hot'], 'function_size'].sum()
+        print(f"  {compiler} {opt_level}: {hot_bytes / sized['function_size'].sum() * 100:.1f}% "
+              f"的函数字节占 {HOT_TIME_SHARE * 100:.0f}% 的自身时间")
+    
+    return hotness
+
+
+def analyze_optimization_remarks(remarks_df, function_sizes, hotness_df, output_file):
+    """
+    将优化备注与函数大小和运行时间关联，把函数大小增长归因到具体的优化决策
+    每个函数与同一编译器-O2下的大小和备注次数比较：大小增长的函数中，
+    内联、展开或向量化次数增加最多的一类视为增长原因；都没有增加时为other
+    
+    Args:
+        remarks_df: 优化备注DataFrame（每次收集中每个构建的每个函数一行）
+        function_sizes: 函数大小DataFrame（symbol_sizes.load_function_sizes的结果）
+        hotness_df: 函数热度分析结果DataFrame（可选，提供自身时间）
+        output_file: 输出CSV文件路径，为None时不保存
+        
+    Returns:
+        函数大小增长归因DataFrame
+    """
+    print("\n分析优化备注...")
+    
+    build_keys = ['program', 'compiler', 'opt_level']
+    keys = build_keys + ['function']
+    
+    # 与其他追加的测量结果一样，重复收集的结果取平均：每次收集的次数之和除以该单元的收集次数
+    collections = remarks_df.groupby(build_keys)['timestamp'].transform('nunique')
+    remarks = remarks_df[keys].join(remarks_df[REMARK_CATEGORIES].div(collections, axis=0))
+    remarks = remarks.groupby(keys, as_index=False)[REMARK_CATEGORIES].sum()
+    
+    # 外连接: 没有备注的函数和被完全内联（没有符号）的函数都保留；
+    # nm中的其他符号（CRT启动代码、静态链接的libc函数等）只保留在该程序任一配置的备注中出现过的函数
+    cells = remarks[build_keys].drop_duplicates()
+    program_functions = remarks[['program', 'function']].drop_duplicates()
+    sizes = function_sizes.merge(cells, on=build_keys).merge(program_functions,
+                                                             on=['program', 'function'])
+    attribution = remarks.merge(sizes, on=keys, how='outer')
+    attribution[REMARK_CATEGORIES] = attribution[REMARK_CATEGORIES].fillna(0).round().astype(int)
+    
+    if hotness_df is not None:
+        attribution = attribution.merge(hotness_df[keys + ['self_us']], on=keys, how='left')
+    else:
+        attribution['self_us'] = float('nan')
+    
+    # 相对于基准优化级别的大小和备注次数变化；缺少基准单元的 (程序, 编译器) 不计算
+    baseline = attribution[attribution['opt_level'] == REMARKS_BASELINE][
+        ['program', 'compiler', 'function', 'function_size'] + REMARK_CATEGORIES].rename(
+        columns={col: f'baseline_{col}' for col in ['function_size'] + REMARK_CATEGORIES})
+    attribution = attribution.merge(baseline, on=['program', 'compiler', 'function'], how='left')
+    has_baseline = attribution[['program', 'compiler']].apply(tuple, axis=1).isin(
+        set(baseline[['program', 'compiler']].apply(tuple, axis=1)))
+    attribution['size_growth'] = (attribution['function_size'].fillna(0)
+                                  - attribution['baseline_function_size'].fillna(0)).where(has_baseline)
+    for category in REMARK_CATEGORIES:
+        attribution[f'{category}_delta'] = (attribution[category]
+                                            - attribution[f'baseline_{category}'].fillna(0)).where(has_baseline)
+    
+    # 增长原因: 次数增加最多的优化决策，并列时按GROWTH_CAUSES的顺序
+    deltas = attribution[[f'{cause}_delta' for cause in GROWTH_CAUSES]].fillna(0)
+    deltas.columns = GROWTH_CAUSES
+    cause = deltas.idxmax(axis=1).where(deltas.max(axis=1) > 0, 'other')
+    attribution['growth_cause'] = cause.where(attribution['size_growth'] > 0, '')
+    attribution = attribution.drop(columns=[f'baseline_{category}' for category in REMARK_CATEGORIES])
+    attribution = attribution.sort_values(keys).reset_index(drop=True)
+    
+    # 保存结果
+    if output_file is not None:
+        attribution.to_csv(output_file, index=False)
+        print(f"优化备注归因已保存到: {output_file}")
+    print(f"生成了 {len(attribution)} 条优化备注记录")
+    
+    # 打印各配置的函数大小增长按原因的分布
+    print(f"\n相对于同一编译器{REMARKS_BASELINE}的函数大小增长（按原因）:")
+    growth = attribution[(attribution['opt_level'] != REMARKS_BASELINE) & (attribution['size_growth'] > 0)]
+    for (compiler, opt_level), group in growth.groupby(['compiler', 'opt_level']):
+        by_cause = group.groupby('growth_cause')['size_growth'].sum()
+        parts = ', '.join(f"{name} {by_cause[name]:.0f}" for name in GROWTH_CAUSES + ['other']
+                          if name in by_cause)
+        print(f"  {compiler} {opt_level}: +{group['size_growth'].sum():.0f} 字节 ({parts})")
+    
+    return attribution
+
+
+def analyze_optional_inputs(inputs, results_dir, analysis_dir):
+    """
+    分析可选的测量结果，输入文件不存在的分析跳过
+
+    analyze_data.py和监视模式共用，使两者的汇总报告包含相同的章节。
+
+    Args:
+        inputs: 输入名称（OPTIONAL_INPUTS的键）到CSV文件路径的字典
+        results_dir: 结果目录，函数大小取自其中保存的nm输出
+        analysis_dir: 分析输出目录
+
+    Returns:
+        generate_summary_report可选参数名到分析结果DataFrame的字典，跳过的分析为None
+    """
+    analysis_dir = Path(analysis_dir)
+    inputs = {name: Path(path) for name, path in inputs.items()}
+    results = dict.fromkeys(['memory_df', 'bench_df', 'transfer_df', 'identical_df',
+                             'hotness_df', 'remarks_df'])
+
+    # 运行时内存占用分析
+    if inputs['memory'].exists():
+        results['memory_df'] = analyze_memory_footprint(load_memory_data(inputs['memory']),
+                                                        analysis_dir / 'memory_footprint.csv')
+    else:
+        print(f"\n未找到内存测量文件，跳过内存分析: {inputs['memory']}")
+
+    # 函数大小取自测试脚本保存的nm输出，供函数热度和增长归因分析使用
+    function_sizes = symbol_sizes.load_function_sizes(results_dir)
+
+    # 微基准测试分析，被测函数大小取自实际运行的基准测试工具，与测量结果位于同一目录
+    if inputs['bench'].exists():
+        results['bench_df'] = analyze_microbenchmarks(
+            load_bench_data(inputs['bench']),
+            load_bench_sizes(inputs['bench'].parent / BENCH_SIZES_FILE),
+            analysis_dir / 'microbench.csv')
+    else:
+        print(f"\n未找到微基准测试文件，跳过微基准分析: {inputs['bench']}")
+
+    # 压缩后传输大小分析
+    if inputs['compressed'].exists():
+        results['transfer_df'] = analyze_transfer_size(load_compressed_data(inputs['compressed']),
+                                                       analysis_dir / 'transfer_size.csv')
+    else:
+        print(f"\n未找到压缩大小文件，跳过传输大小分析: {inputs['compressed']}")
+
+    # 相同代码分析，近似相同函数对与索引位于同一目录
+    if inputs['hashes'].exists():
+        near_file = inputs['hashes'].parent / 'near_identical_functions.csv'
+        near_df = pd.read_csv(near_file) if near_file.exists() else None
+        results['identical_df'] = analyze_identical_code(
+            load_function_hashes(inputs['hashes']), near_df,
+            analysis_dir / 'identical_code.csv', analysis_dir / 'identical_functions.csv')
+    else:
+        print(f"\n未找到函数哈希索引，跳过相同代码分析: {inputs['hashes']}")
+
+    # 函数热度分析
+    if inputs['profile'].exists():
+        results['hotness_df'] = analyze_function_profile(load_function_profile(inputs['profile']),
+                                                         function_sizes,
+                                                         analysis_dir / 'function_hotness.csv')
+    else:
+        print(f"\n未找到函数级剖析文件，跳过函数热度分析: {inputs['profile']}")
+
+    # 优化备注归因，运行时间取自函数热度分析
+    if inputs['remarks'].exists():
+        results['remarks_df'] = analyze_optimization_remarks(
+            load_opt_remarks(inputs['remarks']), function_sizes, results['hotness_df'],
+            analysis_dir / 'remark_attribution.csv')
+    else:
+        print(f"\n未找到优化备注文件，跳过增长归因分析: {inputs['remarks']}")
+
+    return results
+
+
+def generate_summary_report(df, stats_df, comparison_df, impact_df, output_file, memory_df=None,
+                            bench_df=None, transfer_df=None, identical_df=None, hotness_df=None,
+                            remarks_df=None):
     """
     生成汇总报告
     整合所有分析结果，生成易读的文本报告
@@ -247,6 +962,12 @@ def generate_summary_report(df, stats_df, comparison_df, impact_df, output_file)
         comparison_df: 编译器比较结果DataFrame
         impact_df: 优化影响分析结果DataFrame
         output_file: 输出文本文件路径
+        memory_df: 内存占用分析结果DataFrame（可选）
+        bench_df: 微基准测试分析结果DataFrame（可选）
+        transfer_df: 传输大小分析结果DataFrame（可选）
+        identical_df: 相同代码分析结果DataFrame（可选）
+        hotness_df: 函数热度分析结果DataFrame（可选）
+        remarks_df: 优化备注归因结果DataFrame（可选）
     """
     print("\n生成汇总报告...")
     
@@ -292,7 +1013,11 @@ def generate_summary_report(df, stats_df, comparison_df, impact_df, output_file)
         equal = (comparison_df['smaller_compiler'] == 'equal').sum()
         f.write(f"GCC生成更小代码: {gcc_wins} 次 ({gcc_wins/len(comparison_df)*100:.1f}%)\n")
         f.write(f"Clang生成更小代码: {clang_wins} 次 ({clang_wins/len(comparison_df)*100:.1f}%)\n")
-        f.write(f"相同大小: {equal} 次 ({equal/len(comparison_df)*100:.1f}%)\n")
+        f.write(f"无显著差异: {equal} 次 ({equal/len(comparison_df)*100:.1f}%)\n")
+        f.write(f"（基于{DEFAULT_CONFIDENCE*100:.0f}% bootstrap置信区间）\n")
+        insufficient = (comparison_df['p_value'].isna() & comparison_df['size_diff'].notna()).sum()
+        if insufficient:
+            f.write(f"其中 {insufficient} 次样本不足（单次测量），未做显著性检验，按大小直接比较\n")
         f.write(f"\n平均大小差异: {comparison_df['size_diff'].abs().mean():.2f} 字节\n")
         f.write("\n")
         
@@ -328,6 +1053,112 @@ def generate_summary_report(df, stats_df, comparison_df, impact_df, output_file)
             f.write(f"  大小范围: {program_data['total_size'].min()} - {program_data['total_size'].max()} 字节\n")
             f.write(f"  最大减少: {(1 - program_data['total_size'].min() / program_data['total_size'].max()) * 100:.2f}%\n")
         
+        # 8. 运行时内存占用
+        if memory_df is not None and not memory_df.empty:
+            f.write("\n")
+            f.write(f"8. 运行时内存占用（相对于{MEMORY_BASELINE}的平均变化）\n")
+            f.write("-" * 80 + "\n")
+            changes = memory_df[memory_df['opt_level'].isin(MEMORY_CONFIGS)]
+            for compiler in sorted(changes['compiler'].unique()):
+                f.write(f"\n{compiler.upper()}:\n")
+                compiler_changes = changes[changes['compiler'] == compiler]
+                for opt_level in MEMORY_CONFIGS:
+                    group = compiler_changes[compiler_changes['opt_level'] == opt_level]
+                    if group.empty:
+                        continue
+                    significant = group['peak_rss_significant'].fillna(False).astype(bool).sum()
+                    f.write(f"  {opt_level:8s}: 峰值RSS {group['peak_rss_delta_kb'].mean():+8.1f} KB "
+                           f"({group['peak_rss_delta_pct'].mean():+6.2f}%), "
+                           f"次缺页 {group['minor_faults_delta'].mean():+7.1f}, "
+                           f"显著 {significant}/{len(group)} 个程序\n")
+        
+        # 9. 微基准测试
+        if bench_df is not None and not bench_df.empty:
+            f.write("\n")
+            f.write(f"9. 微基准测试（相对于{BENCH_BASELINE}的加速比与函数大小变化）\n")
+            f.write("-" * 80 + "\n")
+            for (program, function), group in bench_df.groupby(['program', 'function']):
+                f.write(f"\n{program} / {function}:\n")
+                for _, row in group.sort_values(['compiler', 'opt_level']).iterrows():
+                    size = (f"{row['function_size']:.0f} 字节" if pd.notna(row['function_size'])
+                            else "已内联")
+                    f.write(f"  {row['compiler']:6s} {row['opt_level']:6s}: "
+                           f"{row['median_ns']:10.2f} ns/次, {row['speedup']:6.2f}x, {size}\n")
+        
+        # 10. 压缩后传输大小
+        if transfer_df is not None and not transfer_df.empty:
+            f.write("\n")
+            f.write("10. 压缩后传输大小最小的配置（各算法最高压缩级别）\n")
+            f.write("-" * 80 + "\n")
+            highest = transfer_df.groupby('codec')['level'].transform('max') == transfer_df['level']
+            for target, target_df in transfer_df[highest].groupby('target'):
+                f.write(f"\n{target}:\n")
+                for _, row in target_df.sort_values(['program', 'codec']).iterrows():
+                    marker = (f"  (未压缩最优: {row['uncompressed_best_compiler']} "
+                              f"{row['uncompressed_best_opt_level']}, "
+                              f"多 {row['saving_vs_uncompressed_best']:.0f} 字节)"
+                              if row['winner_differs'] else "")
+                    f.write(f"  {row['program']:15s} {row['codec']}-{row['level']}: "
+                           f"{row['best_compiler']:6s} {row['best_opt_level']:6s} "
+                           f"{row['best_size']:8.0f} 字节{marker}\n")
+        
+        # 11. 相同代码
+        if identical_df is not None and not identical_df.empty:
+            f.write("\n")
+            f.write("11. 相同代码（ICF与跨构建去重可节省的字节数）\n")
+            f.write("-" * 80 + "\n")
+            for _, row in identical_df.iterrows():
+                f.write(f"{row['program']:15s}: ICF {row['icf_savings_bytes']:6d} 字节 "
+                       f"({row['icf_groups']} 组), "
+                       f"跨构建去重 {row['dedup_savings_bytes']:6d} 字节 ({row['dedup_savings_pct']:5.2f}%), "
+                       f"近似相同 构建内 {row['near_identical_within']} 对 / "
+                       f"跨构建 {row['near_identical_across']} 对\n")
+        
+        # 12. 函数热度
+        if hotness_df is not None and not hotness_df.empty:
+            report_df = hotness_df[hotness_df['opt_level'] == PROFILE_REPORT_OPT]
+            f.write("\n")
+            f.write(f"12. 函数热度（{PROFILE_REPORT_OPT}，每热点微秒字节数越小越值得为速度编译）\n")
+            f.write("-" * 80 + "\n")
+            f.write(f"自身时间占比不计入{'、'.join(HOT_EXCLUDED_FUNCTIONS)}，"
+                    f"占比累计前{HOT_TIME_SHARE * 100:.0f}%的函数标记为speed\n")
+            for (program, compiler), group in report_df.groupby(['program', 'compiler']):
+                f.write(f"\n{program} ({compiler}):\n")
+                for _, row in group.iterrows():
+                    size = (f"{row['function_size']:6.0f} 字节" if pd.notna(row['function_size'])
+                            else "    已内联")
+                    ratio = (f"{row['bytes_per_hot_us']:10.2f}" if pd.notna(row['bytes_per_hot_us'])
+                             else "         -")
+                    share = (f"{row['self_time_share'] * 100:5.1f}%"
+                             if pd.notna(row['self_time_share']) else "  不计")
+                    f.write(f"  {row['function']:20s} {row['calls']:10.0f} 次 "
+                           f"{row['self_us']:10.2f} µs ({share}) "
+                           f"{size} {ratio} 字节/µs -> {row['compile_for']}\n")
+        
+        # 13. 函数大小增长归因
+        if remarks_df is not None and not remarks_df.empty:
+            f.write("\n")
+            f.write(f"13. 函数大小增长归因（相对于同一编译器的{REMARKS_BASELINE}，按优化备注）\n")
+            f.write("-" * 80 + "\n")
+            f.write(f"每个函数的大小增长和备注次数变化都与同一程序、同一编译器的{REMARKS_BASELINE}构建比较，"
+                    f"只包含在优化备注中出现过的函数\n")
+            growth = remarks_df[(remarks_df['opt_level'] != REMARKS_BASELINE)
+                                & (remarks_df['size_growth'] > 0)]
+            for (compiler, opt_level), group in growth.groupby(['compiler', 'opt_level']):
+                by_cause = group.groupby('growth_cause')['size_growth'].sum()
+                parts = ', '.join(f"{name} {by_cause[name]:.0f}" for name in GROWTH_CAUSES + ['other']
+                                  if name in by_cause)
+                f.write(f"{compiler} {opt_level}: +{group['size_growth'].sum():.0f} 字节 ({parts})\n")
+            
+            report_df = growth[growth['opt_level'] == REMARKS_REPORT_OPT]
+            for (program, compiler), group in report_df.groupby(['program', 'compiler']):
+                f.write(f"\n{program} ({compiler} {REMARKS_REPORT_OPT}):\n")
+                for _, row in group.sort_values('size_growth', ascending=False).iterrows():
+                    self_us = f"{row['self_us']:10.2f} µs" if pd.notna(row['self_us']) else "           -"
+                    f.write(f"  {row['function']:20s} {row['size_growth']:+7.0f} 字节 "
+                           f"内联 {row['inlined_delta']:+3.0f} 展开 {row['unrolled_delta']:+3.0f} "
+                           f"向量化 {row['vectorized_delta']:+3.0f} {self_us} -> {row['growth_cause']}\n")
+        
         f.write("\n")
         f.write("=" * 80 + "\n")
         f.write("报告生成完成\n")
@@ -362,6 +1193,48 @@ def parse_arguments():
         help='输入CSV文件路径 (默认: results/code_size.csv)'
     )
     
+    parser.add_argument(
+        '--memory', '-m',
+        type=str,
+        default='results/memory_footprint.csv',
+        help='运行时内存测量CSV文件路径，不存在时跳过内存分析 (默认: results/memory_footprint.csv)'
+    )
+    
+    parser.add_argument(
+        '--bench', '-b',
+        type=str,
+        default='results/microbench.csv',
+        help='微基准测试CSV文件路径，不存在时跳过微基准分析 (默认: results/microbench.csv)'
+    )
+    
+    parser.add_argument(
+        '--compressed', '-c',
+        type=str,
+        default='results/compressed_size.csv',
+        help='压缩大小CSV文件路径，不存在时跳过传输大小分析 (默认: results/compressed_size.csv)'
+    )
+    
+    parser.add_argument(
+        '--hashes',
+        type=str,
+        default='results/function_hashes.csv',
+        help='函数哈希索引CSV文件路径，不存在时跳过相同代码分析 (默认: results/function_hashes.csv)'
+    )
+    
+    parser.add_argument(
+        '--profile', '-p',
+        type=str,
+        default='results/function_profile.csv',
+        help='函数级剖析CSV文件路径，不存在时跳过函数热度分析 (默认: results/function_profile.csv)'
+    )
+    
+    parser.add_argument(
+        '--remarks', '-r',
+        type=str,
+        default='results/opt_remarks.csv',
+        help='优化备注CSV文件路径，不存在时跳过增长归因分析 (默认: results/opt_remarks.csv)'
+    )
+    
     parser.add_argument(
         '--output', '-o',
         type=str,
@@ -394,7 +1267,16 @@ def main():
     stats_file = analysis_dir / 'summary_statistics.csv'
     comparison_file = analysis_dir / 'compiler_comparison.csv'
     impact_file = analysis_dir / 'optimization_impact.csv'
+    significance_file = analysis_dir / 'opt_level_significance.csv'
+    memory_file = analysis_dir / 'memory_footprint.csv'
+    bench_file = analysis_dir / 'microbench.csv'
+    transfer_file = analysis_dir / 'transfer_size.csv'
+    identical_file = analysis_dir / 'identical_code.csv'
+    identical_groups_file = analysis_dir / 'identical_functions.csv'
+    hotness_file = analysis_dir / 'function_hotness.csv'
+    remarks_file = analysis_dir / 'remark_attribution.csv'
     report_file = analysis_dir / 'summary_report.txt'
+    tables_dir = analysis_dir / 'derived'
     
     try:
         # 加载和验证数据
@@ -408,13 +1290,21 @@ def main():
         df = load_data(input_file)
         df = validate_data(df)
         
+        # 派生表与visualize.py共用
+        tables = derived_tables.load_tables(input_file, tables_dir, df)
+        
         # 执行分析
         stats_df = calculate_statistics(df, stats_file)
-        comparison_df = compare_compilers(df, comparison_file)
-        impact_df = analyze_optimization_impact(df, impact_file)
+        comparison_df = compare_compilers(df, comparison_file, tables['program_sizes'])
+        impact_df = analyze_optimization_impact(df, impact_file, tables['impact_matrix'])
+        compare_opt_levels(df, significance_file)
+        
+        # 可选测量结果的分析，与监视模式共用
+        inputs = {name: getattr(args, name) for name in OPTIONAL_INPUTS}
+        optional = analyze_optional_inputs(inputs, input_file.parent, analysis_dir)
         
         # 生成汇总报告
-        generate_summary_report(df, stats_df, comparison_df, impact_df, report_file)
+        generate_summary_report(df, stats_df, comparison_df, impact_df, report_file, **optional)
         
         print("\n" + "=" * 80)
         print("分析完成！")
@@ -423,7 +1313,22 @@ def main():
         print(f"  - 统计结果: {stats_file}")
         print(f"  - 编译器比较: {comparison_file}")
         print(f"  - 优化影响: {impact_file}")
+        print(f"  - 优化级别显著性: {significance_file}")
+        if optional['memory_df'] is not None:
+            print(f"  - 内存占用: {memory_file}")
+        if optional['bench_df'] is not None:
+            print(f"  - 微基准测试: {bench_file}")
+        if optional['transfer_df'] is not None:
+            print(f"  - 传输大小: {transfer_file}")
+        if optional['identical_df'] is not None:
+            print(f"  - 相同代码: {identical_file}")
+            print(f"  - 相同函数分组: {identical_groups_file}")
+        if optional['hotness_df'] is not None:
+            print(f"  - 函数热度: {hotness_file}")
+        if optional['remarks_df'] is not None:
+            print(f"  - 增长归因: {remarks_file}")
         print(f"  - 汇总报告: {report_file}")
+        print(f"  - 派生表: {tables_dir}")
         
     except Exception as e:
         print(f"\n错误: {e}", file=sys.stderr)
@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+工件存储脚本 - 将objdump/readelf/nm的文本输出按内容寻址分块、去重并压缩，
+保存在单个SQLite文件中，并按 (工具, 程序, 编译器, 优化级别) 随机读取
+
+分块边界由行内容决定（内容定义分块），相同的行序列在不同文件、不同位置
+都切出相同的块，因此不同配置间重复的内容（CRT启动代码、PLT桩、节头表等）只存一份。
+反汇编行中含地址，只有地址也相同的片段才能去重（如各构建中位置不变的PLT和CRT辅助函数）。
+"""
+
+import sqlite3
+import hashlib
+import threading
+import zlib
+import re
+import sys
+import argparse
+from collections import namedtuple
+from pathlib import Path
+
+import profile_memory
+from project_config import load_config, config_cells, list_programs
+
+
+# 工件键
+ArtifactKey = namedtuple('ArtifactKey', ['tool', 'program', 'compiler', 'opt_level'])
+
+# 各工具输出在results/下的子目录和文件扩展名
+TOOL_SUFFIXES = {'objdump': 'asm', 'readelf': 'txt', 'nm': 'txt'}
+
+# 工具输出文件名: 程序_编译器_优化级别.扩展名
+ARTIFACT_FILE = re.compile(r'^(?P<program>.+)_(?P<compiler>gcc|clang)_(?P<opt_level>[^_]+)\.(asm|txt)$')
+
+# 默认存储文件（位于results/下）
+STORE_NAME = 'artifacts.db'
+
+# 内容定义分块: 行哈希的低位全为0时在该行之后切分，平均约每16行一个块。
+# 块越小越容易去重，但每块的压缩率越低、元数据越多；按本项目的工件实测，
+# 这组参数使PLT桩和CRT辅助函数成为独立的块，去重后字节数约为原始的2/3，压缩后大小与大块相当
+BOUNDARY_MASK = 0xF
+MIN_CHUNK_BYTES = 256
+MAX_CHUNK_BYTES = 64 * 1024
+
+COMPRESSION_LEVEL = 9
+
+# 块以sha256摘要（32字节）寻址，工件的块列表是摘要的拼接
+DIGEST_BYTES = 32
+
+# 存储格式版本（PRAGMA user_version）
+SCHEMA_VERSION = 1
+
+# 单条SQL语句中的参数个数上限（旧版SQLite为999）
+QUERY_BATCH = 500
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS chunks (
+    hash BLOB PRIMARY KEY,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    tool TEXT NOT NULL,
+    program TEXT NOT NULL,
+    compiler TEXT NOT NULL,
+    opt_level TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    digest BLOB NOT NULL,
+    chunks BLOB NOT NULL,
+    PRIMARY KEY (tool, program, compiler, opt_level)
+);
+'''
+
+
+def split_chunks(data):
+    """
+    按行做内容定义分块
+
+    Args:
+        data: 工件内容字节串
+
+    Returns:
+        块字节串列表，拼接后等于data
+    """
+    chunks = []
+    start = 0
+    position = 0
+    for line in data.splitlines(keepends=True):
+        position += len(line)
+        size = position - start
+        if size >= MAX_CHUNK_BYTES or (size >= MIN_CHUNK_BYTES
+                                       and zlib.crc32(line) & BOUNDARY_MASK == 0):
+            chunks.append(data[start:position])
+            start = position
+    if start < len(data):
+        chunks.append(data[start:])
+    return chunks
+
+
+def split_digests(blob):
+    """
+    将块列表拆分为各块的摘要
+
+    Args:
+        blob: 拼接的块摘要
+
+    Returns:
+        摘要字节串列表
+    """
+    return [blob[i:i + DIGEST_BYTES] for i in range(0, len(blob), DIGEST_BYTES)]
+
+
+class ArtifactStore:
+    """
+    内容寻址的工件存储
+
+    用法:
+        with ArtifactStore('results/artifacts.db') as store:
+            store.put(ArtifactKey('nm', 'fibonacci', 'gcc', '-O2'), text)
+            text = store.get(ArtifactKey('nm', 'fibonacci', 'gcc', '-O2'))
+
+    同一个实例可以在多个线程中使用。
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._init_schema()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """关闭存储"""
+        self._db.close()
+
+    def _init_schema(self):
+        """
+        创建表，或检查已有存储的格式版本
+
+        Raises:
+            RuntimeError: 如果已有存储的格式版本不受支持
+        """
+        version = self._db.execute('PRAGMA user_version').fetchone()[0]
+        tables = self._db.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'").fetchone()[0]
+        if tables and version != SCHEMA_VERSION:
+            self._db.close()
+            raise RuntimeError(f"存储格式版本不受支持: {self.path} (版本 {version}，需要 {SCHEMA_VERSION})，"
+                               f"请删除后重新生成工件")
+        self._db.executescript(SCHEMA)
+        self._db.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def _select_chunks(self, columns, hashes):
+        """
+        分批按哈希查询块，避免超出SQL参数个数上限
+        """
+        hashes = list(set(hashes))
+        rows = []
+        for i in range(0, len(hashes), QUERY_BATCH):
+            batch = hashes[i:i + QUERY_BATCH]
+            rows.extend(self._db.execute(
+                f'SELECT {columns} FROM chunks WHERE hash IN ({",".join("?" * len(batch))})', batch))
+        return rows
+
+    def put(self, key, text):
+        """
+        写入（或替换）一个工件
+
+        Args:
+            key: ArtifactKey
+            text: 工件文本
+
+        Returns:
+            新写入的压缩块字节数（已存在的块不重复写入）
+        """
+        data = text.encode('utf-8')
+        hashes = []
+        new_chunks = []
+        for chunk in split_chunks(data):
+            digest = hashlib.sha256(chunk).digest()
+            hashes.append(digest)
+            new_chunks.append((digest, len(chunk), chunk))
+
+        with self._lock, self._db:
+            existing = {row[0] for row in self._select_chunks('hash', hashes)}
+            written = 0
+            for digest, size, chunk in new_chunks:
+                if digest in existing:
+                    continue
+                compressed = zlib.compress(chunk, COMPRESSION_LEVEL)
+                self._db.execute('INSERT INTO chunks VALUES (?, ?, ?)', (digest, size, compressed))
+                existing.add(digest)
+                written += len(compressed)
+            self._db.execute('INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?, ?)',
+                             (*key, len(data), hashlib.sha256(data).digest(), b''.join(hashes)))
+        return written
+
+    def get(self, key):
+        """
+        读取一个工件
+
+        Args:
+            key: ArtifactKey
+
+        Returns:
+            工件文本，不存在时返回None
+
+        Raises:
+            ValueError: 如果工件内容校验失败
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT digest, chunks FROM artifacts '
+                'WHERE tool = ? AND program = ? AND compiler = ? AND opt_level = ?', key).fetchone()
+            if row is None:
+                return None
+            digest, hashes = row[0], split_digests(row[1])
+            blobs = dict(self._select_chunks('hash, data', hashes))
+
+        data = b''.join(zlib.decompress(blobs[h]) for h in hashes)
+        if hashlib.sha256(data).digest() != digest:
+            raise ValueError(f"工件内容校验失败: {key}")
+        return data.decode('utf-8')
+
+    def keys(self, tool=None):
+        """
+        列出存储中的工件键
+
+        Args:
+            tool: 仅列出该工具的工件（可选）
+
+        Returns:
+            排序后的ArtifactKey列表
+        """
+        query = 'SELECT tool, program, compiler, opt_level FROM artifacts'
+        params = ()
+        if tool is not None:
+            query += ' WHERE tool = ?'
+            params = (tool,)
+        with self._lock:
+            return sorted(ArtifactKey(*row) for row in self._db.execute(query, params))
+
+    def delete(self, key):
+        """
+        删除一个工件；不再被引用的块由gc()回收
+        """
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM artifacts '
+                             'WHERE tool = ? AND program = ? AND compiler = ? AND opt_level = ?', key)
+
+    def gc(self):
+        """
+        删除不再被任何工件引用的块
+
+        Returns:
+            删除的块数
+        """
+        with self._lock, self._db:
+            referenced = set()
+            for (hashes,) in self._db.execute('SELECT chunks FROM artifacts'):
+                referenced.update(split_digests(hashes))
+            unreferenced = [(h,) for (h,) in self._db.execute('SELECT hash FROM chunks')
+                            if h not in referenced]
+            self._db.executemany('DELETE FROM chunks WHERE hash = ?', unreferenced)
+        return len(unreferenced)
+
+    def stats(self):
+        """
+        返回存储统计: 工件数、原始字节数、块数、去重后字节数和压缩后字节数
+        """
+        with self._lock:
+            artifacts, raw_bytes = self._db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM artifacts').fetchone()
+            chunks, unique_bytes, stored_bytes = self._db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) '
+                'FROM chunks').fetchone()
+        return {'artifacts': artifacts, 'raw_bytes': raw_bytes, 'chunks': chunks,
+                'unique_bytes': unique_bytes, 'stored_bytes': stored_bytes}
+
+
+def artifact_path(results_dir, key):
+    """
+    返回工件在results/下对应的文本文件路径
+    """
+    return (Path(results_dir) / key.tool
+            / f'{key.program}_{key.compiler}_{key.opt_level}.{TOOL_SUFFIXES[key.tool]}')
+
+
+def read_artifact(results_dir, key):
+    """
+    读取一个工件: 优先读取results/下的文本文件，不存在时从存储中读取
+
+    Args:
+        results_dir: 结果目录
+        key: ArtifactKey
+
+    Returns:
+        工件文本，两处都不存在时返回None
+    """
+    path = artifact_path(results_dir, key)
+    if path.exists():
+        return path.read_text(encoding='utf-8', errors='replace')
+
+    store_file = Path(results_dir) / STORE_NAME
+    if not store_file.exists():
+        return None
+    with ArtifactStore(store_file) as store:
+        return store.get(key)
+
+
+def list_artifacts_on_disk(results_dir, tool):
+    """
+    列出某个工具在results/下的文本文件对应的工件键
+    """
+    keys = []
+    for path in sorted((Path(results_dir) / tool).glob(f'*.{TOOL_SUFFIXES[tool]}')):
+        match = ARTIFACT_FILE.match(path.name)
+        if match:
+            keys.append(ArtifactKey(tool, match['program'], match['compiler'], match['opt_level']))
+    return keys
+
+
+def list_artifacts(results_dir, tool):
+    """
+    列出某个工具的所有工件键（文本文件和存储中的并集）
+
+    Args:
+        results_dir: 结果目录
+        tool: 工具名称（objdump、readelf或nm）
+
+    Returns:
+        排序后的ArtifactKey列表
+    """
+    keys = set(list_artifacts_on_disk(results_dir, tool))
+    store_file = Path(results_dir) / STORE_NAME
+    if store_file.exists():
+        with ArtifactStore(store_file) as store:
+            keys.update(store.keys(tool))
+    return sorted(keys)
+
+
+def artifact_cells(store, results_dir):
+    """
+    列出存储和results/下文本文件中出现的所有 (程序, 编译器, 优化级别) 单元
+    """
+    cells = {tuple(key[1:]) for key in store.keys()}
+    for tool in TOOL_SUFFIXES:
+        cells.update(tuple(key[1:]) for key in list_artifacts_on_disk(results_dir, tool))
+    return cells
+
+
+def delete_cells(store, results_dir, cells):
+    """
+    删除这些单元的所有工件（存储中的键和results/下的文本文件）；不再被引用的块由gc()回收
+
+    Args:
+        store: ArtifactStore
+        results_dir: 结果目录
+        cells: (程序, 编译器, 优化级别) 单元集合
+
+    Returns:
+        删除的单元数
+    """
+    for cell in cells:
+        for tool in TOOL_SUFFIXES:
+            key = ArtifactKey(tool, *cell)
+            store.delete(key)
+            artifact_path(results_dir, key).unlink(missing_ok=True)
+    return len(cells)
+
+
+def configured_cells(config_file):
+    """
+    列出config.sh当前配置会生成工具输出的单元（不含只用于内存测量的配置）
+
+    Args:
+        config_file: config.sh路径
+
+    Returns:
+        单元元组集合
+    """
+    config_file = Path(config_file)
+    config = load_config(config_file)
+    programs = list_programs(config_file.parent / config['SRC_DIR'])
+    return {cell for cell in config_cells(config, programs)
+            if cell[2] not in profile_memory.MEMORY_ONLY_OPT_LEVELS}
+
+
+def ingest(store, results_dir, prune=False, cells=None):
+    """
+    将results/下的工具输出文本文件写入存储
+
+    Args:
+        store: ArtifactStore
+        results_dir: 结果目录
+        prune: 写入后删除文本文件
+        cells: 仅写入这些 (程序, 编译器, 优化级别) 单元（可选）
+
+    Returns:
+        (写入的工件数, 新写入的压缩字节数)
+    """
+    count = 0
+    written = 0
+    for tool in TOOL_SUFFIXES:
+        for path in sorted((Path(results_dir) / tool).glob(f'*.{TOOL_SUFFIXES[tool]}')):
+            match = ARTIFACT_FILE.match(path.name)
+            if not match:
+                continue
+            key = ArtifactKey(tool, match['program'], match['compiler'], match['opt_level'])
+            if cells is not None and tuple(key[1:]) not in cells:
+                continue
+            written += store.put(key, path.read_text(encoding='utf-8', errors='replace'))
+            count += 1
+            if prune:
+                path.unlink()
+    return count, written
+
+
+def parse_arguments():
+    """
+    解析命令行参数
+
+    Returns:
+        argparse.Namespace: 解析后的参数
+    """
+    parser = argparse.ArgumentParser(
+        description='代码空间优化工件存储脚本 - 分块去重压缩保存objdump/readelf/nm输出',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  %(prog)s ingest                             # 将results/下的工具输出写入存储
+  %(prog)s ingest --prune                     # 写入后删除文本文件
+  %(prog)s ingest --config config.sh          # 同时删除配置中已不存在的单元的工件
+  %(prog)s get nm fibonacci gcc -- -O2        # 读取一个工件（以-开头的优化级别前需加--）
+  %(prog)s export                             # 从存储恢复results/下的文本文件
+  %(prog)s stats                              # 显示存储统计
+        """
+    )
+
+    parser.add_argument(
+        '--results', '-r',
+        type=str,
+        default='results',
+        help='结果目录 (默认: results)'
+    )
+
+    parser.add_argument(
+        '--store', '-s',
+        type=str,
+        help=f'存储文件路径 (默认: <结果目录>/{STORE_NAME})'
+    )
+
+    parser.add_argument(
+        '--version', '-v',
+        action='version',
+        version='%(prog)s 1.0'
+    )
+
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = commands.add_parser('ingest', help='将工具输出文本文件写入存储')
+    ingest_parser.add_argument('--prune', action='store_true', help='写入后删除文本文件')
+    ingest_parser.add_argument('--config', type=str,
+                               help='删除该配置（config.sh）不再生成的单元（已移除的程序、编译器或'
+                                    '优化级别）的工件和文本文件')
+
+    get_parser = commands.add_parser('get', help='读取一个工件并输出到标准输出')
+    get_parser.add_argument('tool', choices=sorted(TOOL_SUFFIXES))
+    get_parser.add_argument('program')
+    get_parser.add_argument('compiler')
+    get_parser.add_argument('opt_level')
+
+    commands.add_parser('list', help='列出存储中的工件')
+    commands.add_parser('export', help='从存储恢复所有文本文件')
+    commands.add_parser('gc', help='删除不再被引用的块')
+    commands.add_parser('stats', help='显示存储统计')
+
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_arguments()
+
+    results_dir = Path(args.results)
+    store_file = Path(args.store) if args.store else results_dir / STORE_NAME
+
+    try:
+        with ArtifactStore(store_file) as store:
+            if args.command == 'ingest':
+                if args.config:
+                    stale = artifact_cells(store, results_dir) - configured_cells(args.config)
+                    print(f"删除 {delete_cells(store, results_dir, stale)} 个已不在配置中的单元")
+                count, written = ingest(store, results_dir, args.prune)
+                removed = store.gc()
+                print(f"写入 {count} 个工件，新增 {written} 字节压缩数据，回收 {removed} 个块")
+            elif args.command == 'get':
+                text = store.get(ArtifactKey(args.tool, args.program, args.compiler, args.opt_level))
+                if text is None:
+                    raise KeyError(f"工件不存在: {args.tool} {args.program} {args.compiler} {args.opt_level}")
+                sys.stdout.write(text)
+                return
+            elif args.command == 'list':
+                for key in store.keys():
+                    print(' '.join(key))
+                return
+            elif args.command == 'export':
+                keys = store.keys()
+                for key in keys:
+                    path = artifact_path(results_dir, key)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    path.write_text(store.get(key), encoding='utf-8')
+                print(f"恢复了 {len(keys)} 个工件到: {results_dir}")
+            elif args.command == 'gc':
+                print(f"回收 {store.gc()} 个块")
+
+            stats = store.stats()
+            ratio = stats['raw_bytes'] / stats['stored_bytes'] if stats['stored_bytes'] else 0
+            print(f"存储: {store_file}")
+            print(f"  工件: {stats['artifacts']} 个，原始 {stats['raw_bytes']} 字节")
+            print(f"  块: {stats['chunks']} 个，去重后 {stats['unique_bytes']} 字节，"
+                  f"压缩后 {stats['stored_bytes']} 字节（{ratio:.1f}x）")
+
+    except Exception as e:
+        print(f"\n错误: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
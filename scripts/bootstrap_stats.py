@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Bootstrap统计模块 - 为重复测量计算置信区间和差异显著性
+
+所有分组一次性向量化处理：按样本数对分组分块，
+每块用一个 (分组, 重采样, 样本) 三维索引数组完成NumPy重采样，
+避免逐分组的Python循环。
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# 默认重采样次数和置信水平
+DEFAULT_RESAMPLES = 2000
+DEFAULT_CONFIDENCE = 0.95
+
+# 每块重采样数组的最大元素数，限制内存占用：
+# int32下标数组约64MB，取样得到的float64数组约128MB，峰值约192MB
+CHUNK_ELEMENTS = 16_000_000
+
+# 差异检验每组所需的最少样本数
+MIN_SAMPLES = 2
+
+
+def group_matrix(df, value_col, group_cols):
+    """
+    将长表转换为按分组填充的二维数组
+
+    Args:
+        df: pandas DataFrame
+        value_col: 数值列名
+        group_cols: 分组列名列表
+
+    Returns:
+        (keys, values, counts) 元组：
+        keys为分组键DataFrame，values为 (分组数, 最大样本数) 数组（不足处填0），
+        counts为每个分组的样本数
+    """
+    data = df[group_cols + [value_col]].dropna()
+    codes = data.groupby(group_cols, sort=True).ngroup().to_numpy()
+    keys = data[group_cols].drop_duplicates().sort_values(group_cols).reset_index(drop=True)
+
+    counts = np.bincount(codes, minlength=len(keys))
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    positions = np.arange(len(sorted_codes)) - starts[sorted_codes]
+
+    values = np.zeros((len(keys), counts.max() if len(counts) else 0), dtype=np.float64)
+    values[sorted_codes, positions] = data[value_col].to_numpy(dtype=np.float64)[order]
+    return keys, values, counts
+
+
+def iter_chunks(widths, n_resamples):
+    """
+    按样本数把分组划分为块，块内样本数相同，块的重采样数组不超过CHUNK_ELEMENTS
+
+    Args:
+        widths: 每个分组的样本数；二维时每列对应一组参与比较的样本
+        n_resamples: 重采样次数
+
+    Yields:
+        分组下标数组
+    """
+    widths = widths.reshape(len(widths), -1)
+    for width in np.unique(widths, axis=0):
+        idx = np.flatnonzero((widths == width).all(axis=1))
+        size = max(1, CHUNK_ELEMENTS // (n_resamples * max(int(width.sum()), 1)))
+        for start in range(0, len(idx), size):
+            yield idx[start:start + size]
+
+
+def resample_means(values, counts, idx, n_resamples, rng):
+    """
+    对一块样本数相同的分组同时进行bootstrap重采样，返回重采样均值
+
+    Args:
+        values: (分组数, 最大样本数) 数组
+        counts: 每个分组的样本数
+        idx: 块内分组下标（由iter_chunks生成）
+        n_resamples: 重采样次数
+        rng: numpy.random.Generator
+
+    Returns:
+        (块内分组数, n_resamples) 均值数组
+    """
+    width = int(counts[idx[0]])
+    chunk_values = values[idx, :width]
+
+    if width == 1:
+        # 单样本分组的重采样均值恒等于样本本身
+        return np.repeat(chunk_values, n_resamples, axis=1)
+
+    # 在展平的数组上取样，比take_along_axis更快
+    picks = rng.integers(0, width, (len(idx), n_resamples, width), dtype=np.int32)
+    picks += (np.arange(len(idx), dtype=np.int32) * width)[:, None, None]
+    return chunk_values.ravel().take(picks).sum(axis=2) / width
+
+
+def bootstrap_ci(df, value_col, group_cols, n_resamples=DEFAULT_RESAMPLES,
+                 confidence=DEFAULT_CONFIDENCE, seed=0):
+    """
+    计算每个分组均值的bootstrap百分位置信区间
+
+    Args:
+        df: pandas DataFrame
+        value_col: 数值列名
+        group_cols: 分组列名列表
+        n_resamples: 重采样次数
+        confidence: 置信水平
+        seed: 随机种子，保证结果可复现
+
+    Returns:
+        DataFrame，包含分组列和 n, mean, ci_low, ci_high
+    """
+    keys, values, counts = group_matrix(df, value_col, group_cols)
+    if keys.empty:
+        result = keys.copy()
+        result['n'] = pd.Series(dtype=int)
+        for col in ['mean', 'ci_low', 'ci_high']:
+            result[col] = pd.Series(dtype=float)
+        return result
+    rng = np.random.default_rng(seed)
+    alpha = (1 - confidence) / 2
+
+    ci = np.empty((len(keys), 2))
+    for idx in iter_chunks(counts, n_resamples):
+        means = resample_means(values, counts, idx, n_resamples, rng)
+        ci[idx] = np.quantile(means, [alpha, 1 - alpha], axis=1).T
+
+    result = keys.copy()
+    result['n'] = counts
+    result['mean'] = values.sum(axis=1) / np.maximum(counts, 1)
+    result['ci_low'] = ci[:, 0]
+    result['ci_high'] = ci[:, 1]
+    return result
+
+
+def bootstrap_difference(df, value_col, group_cols, compare_col, a, b,
+                         n_resamples=DEFAULT_RESAMPLES, confidence=DEFAULT_CONFIDENCE, seed=0):
+    """
+    比较每个分组中 compare_col == a 与 compare_col == b 两组测量的均值差异
+
+    差异定义为 mean(b) - mean(a)。两组独立重采样，差异的置信区间不包含0时视为显著。
+    任一组少于2个样本时无法估计差异的分布（样本不足），p值为NaN且不视为显著。
+
+    Args:
+        df: pandas DataFrame
+        value_col: 数值列名
+        group_cols: 分组列名列表
+        compare_col: 区分两组的列名
+        a: 第一组的取值
+        b: 第二组的取值
+        n_resamples: 重采样次数
+        confidence: 置信水平
+        seed: 随机种子
+
+    Returns:
+        DataFrame，包含分组列和 mean_a, mean_b, diff, ci_low, ci_high, p_value, significant；
+        只包含两组都有数据的分组
+    """
+    keys_a, values_a, counts_a = group_matrix(df[df[compare_col] == a], value_col, group_cols)
+    keys_b, values_b, counts_b = group_matrix(df[df[compare_col] == b], value_col, group_cols)
+
+    # 对齐两组的分组键
+    keys_a['_row_a'] = np.arange(len(keys_a))
+    keys_b['_row_b'] = np.arange(len(keys_b))
+    keys = keys_a.merge(keys_b, on=group_cols, how='inner')
+    rows_a = keys.pop('_row_a').to_numpy()
+    rows_b = keys.pop('_row_b').to_numpy()
+
+    result = keys.copy()
+    if keys.empty:
+        for col in ['mean_a', 'mean_b', 'diff', 'ci_low', 'ci_high', 'p_value']:
+            result[col] = pd.Series(dtype=float)
+        result['significant'] = pd.Series(dtype=bool)
+        return result
+
+    values_a, counts_a = values_a[rows_a], counts_a[rows_a]
+    values_b, counts_b = values_b[rows_b], counts_b[rows_b]
+
+    rng = np.random.default_rng(seed)
+    alpha = (1 - confidence) / 2
+    ci = np.empty((len(keys), 2))
+    p_value = np.empty(len(keys))
+
+    # 两组使用相同的分块，块内两组各自的样本数都相同
+    for idx in iter_chunks(np.column_stack([counts_a, counts_b]), n_resamples):
+        diff = (resample_means(values_b, counts_b, idx, n_resamples, rng)
+                - resample_means(values_a, counts_a, idx, n_resamples, rng))
+        ci[idx] = np.quantile(diff, [alpha, 1 - alpha], axis=1).T
+        # 双侧bootstrap p值
+        p = 2 * np.minimum((diff <= 0).mean(axis=1), (diff >= 0).mean(axis=1))
+        p_value[idx] = np.minimum(p, 1.0)
+
+    # 样本不足: 单样本组的重采样均值恒定，区间宽度为0，不能据此判断显著性
+    insufficient = (counts_a < MIN_SAMPLES) | (counts_b < MIN_SAMPLES)
+    p_value[insufficient] = np.nan
+
+    result['mean_a'] = values_a.sum(axis=1) / counts_a
+    result['mean_b'] = values_b.sum(axis=1) / counts_b
+    result['diff'] = result['mean_b'] - result['mean_a']
+    result['ci_low'] = ci[:, 0]
+    result['ci_high'] = ci[:, 1]
+    result['p_value'] = p_value
+    result['significant'] = ((ci[:, 0] > 0) | (ci[:, 1] < 0)) & ~insufficient
+    return result
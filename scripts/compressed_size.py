@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+压缩大小测量脚本 - 计算去除符号后的可执行文件和.text段
+在zlib、lzma和bz2各压缩级别下的大小，用于评估固件/OTA更新包的传输大小
+"""
+
+import pandas as pd
+import subprocess
+import tempfile
+import zlib
+import lzma
+import bz2
+import sys
+import os
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import profile_memory
+from project_config import load_config_cells
+from elf_reader import read_section
+
+
+# 压缩算法及测量的压缩级别
+# lzma预设7-9只增大字典（每个压缩器最多约674 MiB内存），对这些小文件没有收益
+CODECS = {
+    'zlib': (lambda data, level: zlib.compress(data, level), (1, 6, 9)),
+    'lzma': (lambda data, level: lzma.compress(data, preset=level), (0, 3, 6)),
+    'bz2': (lambda data, level: bz2.compress(data, level), (1, 9)),
+}
+
+# 被压缩的对象: 去除符号后的整个可执行文件、仅.text段
+TARGETS = ['stripped', 'text']
+
+# 压缩大小列: 对象_算法_级别，如 stripped_lzma_6
+COMPRESSED_METRICS = [f'{target}_{codec}_{level}'
+                      for target in TARGETS
+                      for codec, (_, levels) in CODECS.items()
+                      for level in levels]
+
+# compressed_size.csv的列顺序
+COMPRESSED_COLUMNS = (['program', 'compiler', 'opt_level', 'stripped_size', 'text_section_size']
+                      + COMPRESSED_METRICS + ['timestamp'])
+
+
+def strip_image(executable, strip_tool='strip'):
+    """
+    返回去除所有符号和调试信息后的可执行文件内容，不修改原文件
+
+    Args:
+        executable: 可执行文件路径
+        strip_tool: strip工具路径
+
+    Returns:
+        去除符号后的文件内容
+
+    Raises:
+        RuntimeError: 如果strip失败
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stripped = Path(tmp_dir) / 'stripped'
+        result = subprocess.run([strip_tool, '--strip-all', '-o', str(stripped), str(executable)],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"strip失败: {executable}: {result.stderr.strip()}")
+        return stripped.read_bytes()
+
+
+def compressed_sizes(data, target):
+    """
+    计算数据在所有压缩算法和级别下的压缩后大小
+
+    Args:
+        data: 待压缩的字节串
+        target: 列名前缀（'stripped' 或 'text'）
+
+    Returns:
+        {列名: 压缩后字节数} 字典
+    """
+    return {f'{target}_{codec}_{level}': len(compress(data, level))
+            for codec, (compress, levels) in CODECS.items()
+            for level in levels}
+
+
+def measure_cell(executable, cell, strip_tool='strip'):
+    """
+    测量单个 (程序, 编译器, 优化级别) 单元的压缩大小
+
+    Args:
+        executable: 可执行文件路径
+        cell: (程序, 编译器, 优化级别) 元组
+        strip_tool: strip工具路径
+
+    Returns:
+        compressed_size.csv的行字典
+    """
+    program, compiler, opt_level = cell
+    stripped = strip_image(executable, strip_tool)
+    text = read_section(stripped, '.text')
+
+    row = {'program': program, 'compiler': compiler, 'opt_level': opt_level,
+           'stripped_size': len(stripped), 'text_section_size': len(text)}
+    row.update(compressed_sizes(stripped, 'stripped'))
+    row.update(compressed_sizes(text, 'text'))
+    row['timestamp'] = pd.Timestamp.now(tz='UTC').isoformat(timespec='seconds')
+    return row
+
+
+def parse_arguments():
+    """
+    解析命令行参数
+
+    Returns:
+        argparse.Namespace: 解析后的参数
+    """
+    parser = argparse.ArgumentParser(
+        description='代码空间优化压缩大小测量脚本 - 计算可执行文件和.text段的压缩后大小',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  %(prog)s                                    # 测量build/下所有程序
+  %(prog)s --jobs 8                           # 使用8个并行任务
+  %(prog)s --program fibonacci --compiler gcc # 仅测量指定程序和编译器
+        """
+    )
+
+    parser.add_argument(
+        '--build', '-b',
+        type=str,
+        default='build',
+        help='编译输出目录 (默认: build)'
+    )
+
+    parser.add_argument(
+        '--output', '-o',
+        type=str,
+        default='results/compressed_size.csv',
+        help='输出CSV文件路径 (默认: results/compressed_size.csv)'
+    )
+
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='并行任务数 (默认: CPU核数)'
+    )
+
+    parser.add_argument(
+        '--strip',
+        type=str,
+        default='strip',
+        help='strip工具路径 (默认: strip)'
+    )
+
+    parser.add_argument(
+        '--program',
+        type=str,
+        help='仅测量指定程序'
+    )
+
+    parser.add_argument(
+        '--compiler',
+        type=str,
+        help='仅测量指定编译器'
+    )
+
+    parser.add_argument(
+        '--version', '-v',
+        action='version',
+        version='%(prog)s 1.0'
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_arguments()
+
+    build_dir = Path(args.build)
+    output_file = Path(args.output)
+
+    try:
+        print("=" * 80)
+        print("开始压缩大小测量")
+        print("=" * 80)
+
+        if not build_dir.is_dir():
+            raise FileNotFoundError(f"编译输出目录不存在: {build_dir}")
+
+        # 只测量配置中的单元，已从配置中移除的单元在build/下留下的目录不再测量
+        cells = load_config_cells(Path(__file__).resolve().parent.parent / 'config.sh')
+        executables = [(executable, cell) for executable, cell
+                       in profile_memory.find_executables(build_dir, args.program, args.compiler, cells)
+                       if cell[2] not in profile_memory.MEMORY_ONLY_OPT_LEVELS]
+        print(f"找到 {len(executables)} 个可执行文件，使用 {args.jobs} 个并行任务")
+
+        # zlib、lzma和bz2在压缩时释放GIL，线程即可并行压缩
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+            rows = list(executor.map(lambda item: measure_cell(item[0], item[1], args.strip),
+                                     executables))
+
+        for row in rows:
+            print(f"  ✓ {row['program']} {row['compiler']} {row['opt_level']}: "
+                  f"stripped {row['stripped_size']} -> lzma {row['stripped_lzma_6']} 字节")
+
+        # 与code_size.csv一样追加记录
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        df = pd.DataFrame(rows, columns=COMPRESSED_COLUMNS)
+        df.to_csv(output_file, mode='a', index=False, header=not output_file.exists())
+
+        print(f"\n压缩大小结果已保存到: {output_file}")
+        print(f"记录了 {len(df)} 个单元")
+
+    except Exception as e:
+        print(f"\n错误: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
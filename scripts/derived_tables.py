@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+派生表模块 - analyze_data.py 和 visualize.py 共用的分析核心
+
+派生表只计算一次，连同输入文件指纹缓存到磁盘；
+输入未变化时两个脚本直接读取缓存，保证显示的数字一致，可视化不再重复聚合。
+"""
+
+import pandas as pd
+import hashlib
+import json
+from pathlib import Path
+
+
+# 派生表格式版本，修改计算方式时递增以使旧缓存失效
+TABLES_VERSION = 1
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def program_sizes(df):
+    """
+    每个 (程序, 编译器, 优化级别) 单元的平均代码大小
+
+    Args:
+        df: 代码大小数据DataFrame
+
+    Returns:
+        DataFrame，包含 program, compiler, opt_level, total_size
+    """
+    return df.groupby(['program', 'compiler', 'opt_level'], as_index=False)['total_size'].mean()
+
+
+def impact_matrix(df):
+    """
+    相对于-O0的代码大小减少矩阵
+
+    Args:
+        df: 代码大小数据DataFrame
+
+    Returns:
+        DataFrame，包含 program, compiler, opt_level, baseline_size,
+        optimized_size, size_reduction, reduction_pct
+    """
+    sizes = program_sizes(df)
+    baseline = sizes[sizes['opt_level'] == '-O0'][['program', 'compiler', 'total_size']]
+    baseline = baseline.rename(columns={'total_size': 'baseline_size'})
+
+    impact = sizes.merge(baseline, on=['program', 'compiler'], how='inner')
+    impact = impact.rename(columns={'total_size': 'optimized_size'})
+    impact['size_reduction'] = impact['baseline_size'] - impact['optimized_size']
+    impact['reduction_pct'] = (impact['size_reduction'] / impact['baseline_size'] * 100).round(2)
+    return impact[['program', 'compiler', 'opt_level', 'baseline_size', 'optimized_size',
+                   'size_reduction', 'reduction_pct']]
+
+
+def opt_level_means(df):
+    """
+    每个编译器在每个优化级别上所有程序的平均代码大小
+
+    Args:
+        df: 代码大小数据DataFrame
+
+    Returns:
+        DataFrame，包含 compiler, opt_level, total_size
+    """
+    return program_sizes(df).groupby(['compiler', 'opt_level'], as_index=False)['total_size'].mean()
+
+
+def compiler_pivot(df):
+    """
+    优化级别 x 编译器 的平均代码大小透视表
+
+    Args:
+        df: 代码大小数据DataFrame
+
+    Returns:
+        DataFrame，每行一个优化级别，每个编译器一列
+    """
+    pivot = opt_level_means(df).pivot(index='opt_level', columns='compiler', values='total_size')
+    pivot.columns.name = None
+    return pivot.reset_index()
+
+
+# 派生表名称 -> 计算函数
+TABLES = {
+    'program_sizes': program_sizes,
+    'impact_matrix': impact_matrix,
+    'opt_level_means': opt_level_means,
+    'compiler_pivot': compiler_pivot,
+}
+
+
+def build_tables(df):
+    """
+    计算所有派生表
+
+    Args:
+        df: 代码大小数据DataFrame
+
+    Returns:
+        {表名: DataFrame} 字典
+    """
+    return {name: compute(df) for name, compute in TABLES.items()}
+
+
+def input_fingerprint(csv_file):
+    """
+    计算输入文件的指纹（内容SHA-256和派生表版本）
+
+    Args:
+        csv_file: 输入CSV文件路径
+
+    Returns:
+        指纹字符串
+    """
+    digest = hashlib.sha256()
+    with open(csv_file, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return f'v{TABLES_VERSION}:{digest.hexdigest()}'
+
+
+def read_cached_tables(cache_dir, fingerprint):
+    """
+    读取缓存的派生表
+
+    Returns:
+        {表名: DataFrame} 字典，缓存不存在或指纹不匹配时返回None
+    """
+    manifest_file = cache_dir / MANIFEST_FILE
+    if not manifest_file.exists():
+        return None
+
+    try:
+        manifest = json.loads(manifest_file.read_text(encoding='utf-8'))
+    except ValueError:
+        return None
+
+    if manifest.get('fingerprint') != fingerprint or set(manifest.get('tables', [])) != set(TABLES):
+        return None
+
+    try:
+        return {name: pd.read_csv(cache_dir / f'{name}.csv') for name in TABLES}
+    except (FileNotFoundError, pd.errors.EmptyDataError):
+        return None
+
+
+def write_cached_tables(cache_dir, fingerprint, tables):
+    """
+    保存派生表和指纹清单，清单最后写入，避免留下不完整的缓存
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for name, table in tables.items():
+        table.to_csv(cache_dir / f'{name}.csv', index=False)
+
+    manifest = {'fingerprint': fingerprint, 'tables': sorted(tables)}
+    (cache_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+
+
+def load_tables(csv_file, cache_dir, df=None):
+    """
+    加载派生表：输入指纹与缓存一致时直接读取，否则重新计算并写入缓存
+
+    Args:
+        csv_file: 输入CSV文件路径
+        cache_dir: 派生表缓存目录
+        df: 已加载并验证的数据；为None时按analyze_data.py的方式加载和验证
+
+    Returns:
+        {表名: DataFrame} 字典
+    """
+    cache_dir = Path(cache_dir)
+    fingerprint = input_fingerprint(csv_file)
+
+    tables = read_cached_tables(cache_dir, fingerprint)
+    if tables is not None:
+        print(f"使用缓存的派生表: {cache_dir}")
+        return tables
+
+    if df is None:
+        # 与analyze_data.py使用相同的加载和验证流程，保证两边数字一致
+        import analyze_data
+        df = analyze_data.validate_data(analyze_data.load_data(csv_file))
+
+    tables = build_tables(df)
+    write_cached_tables(cache_dir, fingerprint, tables)
+    print(f"派生表已保存到: {cache_dir}")
+    return tables
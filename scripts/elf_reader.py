@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+ELF读取模块 - 在进程内读取ELF文件的节和函数符号，不依赖外部工具
+"""
+
+import struct
+from collections import namedtuple
+
+
+# 节头中用到的字段
+Section = namedtuple('Section', ['name', 'type', 'addr', 'offset', 'size', 'link'])
+
+# 函数符号: 名称、地址、大小、所在节的索引
+Symbol = namedtuple('Symbol', ['name', 'value', 'size', 'shndx'])
+
+# ELF节类型
+SHT_SYMTAB = 2
+SHT_NOBITS = 8
+
+# ELF符号类型
+STT_FUNC = 2
+
+
+def _layout(image):
+    """
+    返回 (字节序前缀, 是否64位)
+
+    Raises:
+        ValueError: 如果不是ELF文件
+    """
+    if image[:4] != b'\x7fELF':
+        raise ValueError("不是ELF文件")
+    return ('<' if image[5] == 1 else '>'), image[4] == 2
+
+
+def _c_string(table, offset):
+    """
+    从字符串表中读取以NUL结尾的字符串
+    """
+    return table[offset:table.find(b'\0', offset)].decode('ascii', 'replace')
+
+
+def read_sections(image):
+    """
+    读取ELF文件的所有节头
+
+    Args:
+        image: ELF文件内容
+
+    Returns:
+        Section列表，按节索引排列
+
+    Raises:
+        ValueError: 如果不是ELF文件
+    """
+    endian, is_64 = _layout(image)
+    if is_64:
+        shoff, = struct.unpack_from(endian + 'Q', image, 0x28)
+        shentsize, shnum, shstrndx = struct.unpack_from(endian + 'HHH', image, 0x3A)
+        header_format = endian + 'IIQQQQII'
+    else:
+        shoff, = struct.unpack_from(endian + 'I', image, 0x20)
+        shentsize, shnum, shstrndx = struct.unpack_from(endian + 'HHH', image, 0x2E)
+        header_format = endian + 'IIIIIIII'
+
+    # (名称偏移, 类型, 标志, 地址, 文件偏移, 大小, 链接)
+    headers = [struct.unpack_from(header_format, image, shoff + i * shentsize)[:7]
+               for i in range(shnum)]
+    if not headers:
+        return []
+
+    strtab_offset, strtab_size = headers[shstrndx][4], headers[shstrndx][5]
+    strtab = image[strtab_offset:strtab_offset + strtab_size]
+    return [Section(_c_string(strtab, name), section_type, addr, offset, size, link)
+            for name, section_type, _, addr, offset, size, link in headers]
+
+
+def section_data(image, section):
+    """
+    返回节在文件中的内容，不占文件空间的节（如.bss）返回空字节串
+    """
+    if section.type == SHT_NOBITS:
+        return b''
+    return image[section.offset:section.offset + section.size]
+
+
+def read_section(image, name):
+    """
+    从ELF文件内容中读取指定节的原始字节
+
+    Args:
+        image: ELF文件内容
+        name: 节名称，如 '.text'
+
+    Returns:
+        节内容字节串，节不存在时返回空字节串
+
+    Raises:
+        ValueError: 如果不是ELF文件
+    """
+    for section in read_sections(image):
+        if section.name == name:
+            return section_data(image, section)
+    return b''
+
+
+def function_symbols(image, sections=None):
+    """
+    读取符号表（.symtab）中所有大小非零的函数符号
+
+    Args:
+        image: ELF文件内容
+        sections: read_sections的结果（可选，避免重复解析）
+
+    Returns:
+        Symbol列表，按地址排列；去除了符号的文件返回空列表
+    """
+    endian, is_64 = _layout(image)
+    sections = sections if sections is not None else read_sections(image)
+    symtab = next((s for s in sections if s.type == SHT_SYMTAB), None)
+    if symtab is None:
+        return []
+
+    strtab = section_data(image, sections[symtab.link])
+    data = section_data(image, symtab)
+    symbols = []
+    if is_64:
+        entry = struct.Struct(endian + 'IBBHQQ')
+        for offset in range(0, len(data) - entry.size + 1, entry.size):
+            name, info, _, shndx, value, size = entry.unpack_from(data, offset)
+            if info & 0xf == STT_FUNC and size > 0:
+                symbols.append(Symbol(_c_string(strtab, name), value, size, shndx))
+    else:
+        entry = struct.Struct(endian + 'IIIBBH')
+        for offset in range(0, len(data) - entry.size + 1, entry.size):
+            name, value, size, info, _, shndx = entry.unpack_from(data, offset)
+            if info & 0xf == STT_FUNC and size > 0:
+                symbols.append(Symbol(_c_string(strtab, name), value, size, shndx))
+    return sorted(symbols, key=lambda symbol: symbol.value)
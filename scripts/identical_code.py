@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+相同代码检测脚本 - 为每个函数的机器码建立哈希索引，
+找出同一可执行文件内（ICF候选）和不同 (编译器, 优化级别) 构建之间相同或近似相同的函数
+
+函数边界和字节取自ELF符号表和.text段；指向函数外部的地址字段
+（rel32调用/跳转目标、RIP相对位移）根据objdump -d的输出置零，
+使位于不同地址、引用不同布局的相同代码得到相同的哈希。
+"""
+
+import pandas as pd
+import numpy as np
+import hashlib
+import struct
+import re
+import sys
+import argparse
+from collections import defaultdict
+from pathlib import Path
+
+import artifact_store
+import elf_reader
+import profile_memory
+from project_config import load_config_cells
+
+
+# function_hashes.csv的列顺序
+HASH_COLUMNS = ['program', 'compiler', 'opt_level', 'function', 'address', 'size', 'hash']
+
+# near_identical_functions.csv的列顺序
+NEAR_COLUMNS = ['program', 'scope', 'compiler_a', 'opt_level_a', 'function_a', 'size_a',
+                'compiler_b', 'opt_level_b', 'function_b', 'size_b', 'similarity']
+
+# 近似相同的判定: 字节n-gram集合的Jaccard相似度阈值
+DEFAULT_THRESHOLD = 0.8
+SHINGLE_BYTES = 4
+
+# MinHash签名长度和LSH分段: 16段×4行，相似度约0.5以上的函数对才会成为候选
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+
+# objdump -d 指令行: 地址: 字节 [指令]，过长的指令字节会续行且没有指令部分
+OBJDUMP_LINE = re.compile(r'^\s*([0-9a-f]+):\t([0-9a-f ]+?)\s*(?:\t(.*))?$')
+FUNCTION_HEADER = re.compile(r'^[0-9a-f]+ <(.+)>:$')
+
+# 指令中的RIP相对位移和直接跳转/调用目标
+RIP_DISPLACEMENT = re.compile(r'(-?0x[0-9a-f]+)\(%rip\)')
+BRANCH_TARGET = re.compile(r'^(?:call|jmp|j[a-z]+|loop[a-z]*)\w*\s+([0-9a-f]+) <')
+
+
+def parse_instructions(asm_text):
+    """
+    解析objdump -d输出中的指令
+
+    Args:
+        asm_text: objdump -d 的输出文本
+
+    Returns:
+        [(地址, 指令字节, 指令文本)] 列表
+    """
+    instructions = []
+    for line in asm_text.splitlines():
+        match = OBJDUMP_LINE.match(line)
+        if not match:
+            continue
+        raw = bytes.fromhex(match.group(2).replace(' ', ''))
+        if match.group(3) is None and instructions:
+            # 续行: 上一条指令的剩余字节
+            address, previous, text = instructions[-1]
+            instructions[-1] = (address, previous + raw, text)
+        else:
+            instructions.append((int(match.group(1), 16), raw, match.group(3) or ''))
+    return instructions
+
+
+def address_fields(instructions):
+    """
+    找出指令中依赖代码布局的地址字段
+
+    Args:
+        instructions: parse_instructions的结果
+
+    Returns:
+        [(地址, 字段长度, 跳转目标或None)] 列表；跳转目标用于判断是否跳出函数，
+        RIP相对位移总是引用函数外部的数据或代码，目标为None
+    """
+    fields = []
+    for address, raw, text in instructions:
+        match = RIP_DISPLACEMENT.search(text)
+        if match:
+            displacement = struct.pack('<i', int(match.group(1), 16))
+            position = raw.find(displacement, 1)
+            if position > 0:
+                fields.append((address + position, 4, None))
+            continue
+
+        match = BRANCH_TARGET.match(text)
+        if match and len(raw) >= 5:
+            # 只有rel32形式的调用/跳转可能跳出函数，rel8的短跳转总在函数内部
+            fields.append((address + len(raw) - 4, 4, int(match.group(1), 16)))
+    return fields
+
+
+def normalized_functions(image, asm_text):
+    """
+    提取.text段中每个函数的规范化机器码
+
+    Args:
+        image: 可执行文件内容
+        asm_text: 该文件的objdump -d输出
+
+    Returns:
+        [(函数名, 地址, 规范化字节)] 列表，同一地址的别名只保留第一个
+    """
+    sections = elf_reader.read_sections(image)
+    text_index = next((i for i, s in enumerate(sections) if s.name == '.text'), None)
+    if text_index is None:
+        return []
+    text = sections[text_index]
+    text_data = elf_reader.section_data(image, text)
+    fields = address_fields(parse_instructions(asm_text))
+    starts = [field[0] for field in fields]
+
+    functions = []
+    seen = set()
+    for symbol in elf_reader.function_symbols(image, sections):
+        if symbol.shndx != text_index or symbol.value in seen:
+            continue
+        seen.add(symbol.value)
+        start, end = symbol.value, symbol.value + symbol.size
+        code = bytearray(text_data[start - text.addr:end - text.addr])
+
+        # 置零函数内部的地址字段；跳转目标在函数内部的相对跳转与位置无关，保留
+        for position, length, target in fields[np.searchsorted(starts, start):
+                                               np.searchsorted(starts, end)]:
+            if target is not None and start <= target < end:
+                continue
+            offset = position - start
+            code[offset:offset + length] = bytes(length)
+        functions.append((symbol.name, start, bytes(code)))
+    return functions
+
+
+def shingles(code):
+    """
+    返回函数字节的n-gram集合（每个n-gram打包成一个整数）
+    """
+    data = np.frombuffer(code, dtype=np.uint8).astype(np.uint64)
+    if len(data) < SHINGLE_BYTES:
+        return np.array([], dtype=np.uint64)
+    windows = np.lib.stride_tricks.sliding_window_view(data, SHINGLE_BYTES)
+    weights = np.uint64(256) ** np.arange(SHINGLE_BYTES, dtype=np.uint64)
+    return np.unique(windows @ weights)
+
+
+def minhash_signatures(shingle_sets, seed=0):
+    """
+    计算MinHash签名（乘移位哈希，uint64溢出即取模）
+
+    Args:
+        shingle_sets: 每个函数的n-gram集合列表
+        seed: 随机种子，保证结果可复现
+
+    Returns:
+        (函数数, MINHASH_PERMUTATIONS) 的uint64数组；空集合的签名全为最大值
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**63, MINHASH_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, MINHASH_PERMUTATIONS, dtype=np.uint64)
+    signatures = np.full((len(shingle_sets), MINHASH_PERMUTATIONS), np.iinfo(np.uint64).max,
+                         dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for i, values in enumerate(shingle_sets):
+            if len(values):
+                signatures[i] = ((a[:, None] * values[None, :] + b[:, None]) >> np.uint64(32)).min(axis=1)
+    return signatures
+
+
+def near_identical_pairs(index, shingle_sets, threshold=DEFAULT_THRESHOLD):
+    """
+    用MinHash LSH找出候选函数对，再用精确的Jaccard相似度确认
+
+    Args:
+        index: 函数哈希索引DataFrame（与shingle_sets一一对应）
+        shingle_sets: 每个函数的n-gram集合列表
+        threshold: Jaccard相似度阈值
+
+    Returns:
+        [(i, j, 相似度)] 列表，i < j，哈希相同的函数对不包括在内
+    """
+    signatures = minhash_signatures(shingle_sets)
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    hashes = index['hash'].to_numpy()
+
+    candidates = set()
+    for band in range(LSH_BANDS):
+        buckets = defaultdict(list)
+        for i, key in enumerate(map(bytes, signatures[:, band * rows:(band + 1) * rows])):
+            if len(shingle_sets[i]):
+                buckets[key].append(i)
+        for members in buckets.values():
+            candidates.update((i, j) for k, i in enumerate(members) for j in members[k + 1:]
+                              if hashes[i] != hashes[j])
+
+    pairs = []
+    for i, j in sorted(candidates):
+        common = len(np.intersect1d(shingle_sets[i], shingle_sets[j], assume_unique=True))
+        similarity = common / (len(shingle_sets[i]) + len(shingle_sets[j]) - common)
+        if similarity >= threshold:
+            pairs.append((i, j, round(similarity, 4)))
+    return pairs
+
+
+def index_program(builds, threshold=DEFAULT_THRESHOLD):
+    """
+    为一个程序的所有构建建立函数哈希索引并查找近似相同的函数
+
+    Args:
+        builds: [((程序, 编译器, 优化级别), 规范化函数列表)] 列表
+        threshold: 近似相同的Jaccard相似度阈值
+
+    Returns:
+        (function_hashes.csv的DataFrame, near_identical_functions.csv的DataFrame)
+    """
+    rows = []
+    codes = []
+    for (program, compiler, opt_level), functions in builds:
+        for name, address, code in functions:
+            rows.append({'program': program, 'compiler': compiler, 'opt_level': opt_level,
+                         'function': name, 'address': f'0x{address:x}', 'size': len(code),
+                         'hash': hashlib.blake2b(code, digest_size=16).hexdigest()})
+            codes.append(code)
+    index = pd.DataFrame(rows, columns=HASH_COLUMNS)
+
+    shingle_sets = [shingles(code) for code in codes]
+    near_rows = []
+    for i, j, similarity in near_identical_pairs(index, shingle_sets, threshold):
+        a, b = index.iloc[i], index.iloc[j]
+        same_build = (a['compiler'], a['opt_level']) == (b['compiler'], b['opt_level'])
+        near_rows.append({'program': a['program'], 'scope': 'within' if same_build else 'across',
+                          'compiler_a': a['compiler'], 'opt_level_a': a['opt_level'],
+                          'function_a': a['function'], 'size_a': a['size'],
+                          'compiler_b': b['compiler'], 'opt_level_b': b['opt_level'],
+                          'function_b': b['function'], 'size_b': b['size'],
+                          'similarity': similarity})
+    return index, pd.DataFrame(near_rows, columns=NEAR_COLUMNS)
+
+
+def load_build(executable, cell, results_dir):
+    """
+    读取一个构建的规范化函数（objdump输出取自results/objdump或工件存储）
+
+    Returns:
+        规范化函数列表，缺少objdump输出时返回None
+    """
+    asm_text = artifact_store.read_artifact(results_dir, artifact_store.ArtifactKey('objdump', *cell))
+    if asm_text is None:
+        print(f"  ✗ 缺少objdump输出: {' '.join(cell)}", file=sys.stderr)
+        return None
+    return normalized_functions(Path(executable).read_bytes(), asm_text)
+
+
+def parse_arguments():
+    """
+    解析命令行参数
+
+    Returns:
+        argparse.Namespace: 解析后的参数
+    """
+    parser = argparse.ArgumentParser(
+        description='代码空间优化相同代码检测脚本 - 查找相同和近似相同的函数',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  %(prog)s                                    # 索引build/下所有程序
+  %(prog)s --threshold 0.9                    # 更严格的近似相同阈值
+  %(prog)s --program quicksort                # 仅重新索引指定程序，保留其他程序的索引
+        """
+    )
+
+    parser.add_argument(
+        '--build', '-b',
+        type=str,
+        default='build',
+        help='编译输出目录 (默认: build)'
+    )
+
+    parser.add_argument(
+        '--results', '-r',
+        type=str,
+        default='results',
+        help='结果目录，读取objdump/并写入索引 (默认: results)'
+    )
+
+    parser.add_argument(
+        '--threshold', '-t',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f'近似相同的Jaccard相似度阈值 (默认: {DEFAULT_THRESHOLD})'
+    )
+
+    parser.add_argument(
+        '--program',
+        type=str,
+        help='仅重新索引指定程序'
+    )
+
+    parser.add_argument(
+        '--compiler',
+        type=str,
+        help='仅重新索引有该编译器构建的程序（程序的所有构建一起索引）'
+    )
+
+    parser.add_argument(
+        '--version', '-v',
+        action='version',
+        version='%(prog)s 1.0'
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_arguments()
+
+    build_dir = Path(args.build)
+    results_dir = Path(args.results)
+    hash_file = results_dir / 'function_hashes.csv'
+    near_file = results_dir / 'near_identical_functions.csv'
+
+    try:
+        print("=" * 80)
+        print("开始相同代码检测")
+        print("=" * 80)
+
+        if not build_dir.is_dir():
+            raise FileNotFoundError(f"编译输出目录不存在: {build_dir}")
+
+        # 近似相同的函数对在同一程序的所有构建之间查找，因此受筛选影响的程序重新索引其全部构建，
+        # 其余程序保留已有索引中的行
+        # 已从配置中移除的单元在build/下留下的目录不再索引
+        cells = load_config_cells(Path(__file__).resolve().parent.parent / 'config.sh')
+        selected = profile_memory.find_executables(build_dir, args.program, args.compiler, cells)
+        programs = {cell[0] for _, cell in selected}
+        builds = defaultdict(list)
+        for executable, cell in profile_memory.find_executables(build_dir, cells=cells):
+            if cell[0] not in programs or cell[2] in profile_memory.MEMORY_ONLY_OPT_LEVELS:
+                continue
+            functions = load_build(executable, cell, results_dir)
+            if functions is not None:
+                builds[cell[0]].append((cell, functions))
+
+        indexes, pairs = [], []
+        if hash_file.exists():
+            existing = pd.read_csv(hash_file)
+            indexes.append(existing[~existing['program'].isin(programs)])
+        if near_file.exists():
+            existing = pd.read_csv(near_file)
+            pairs.append(existing[~existing['program'].isin(programs)])
+
+        for program in sorted(builds):
+            index, near = index_program(builds[program], args.threshold)
+            duplicated = index.duplicated(['compiler', 'opt_level', 'hash'], keep=False).sum()
+            print(f"  ✓ {program}: {len(index)} 个函数，构建内重复 {duplicated} 个，"
+                  f"近似相同 {len(near)} 对")
+            indexes.append(index)
+            pairs.append(near)
+
+        results_dir.mkdir(parents=True, exist_ok=True)
+        indexes = [frame for frame in indexes if not frame.empty]
+        pairs = [frame for frame in pairs if not frame.empty]
+        index = pd.concat(indexes, ignore_index=True) if indexes else pd.DataFrame(columns=HASH_COLUMNS)
+        near = pd.concat(pairs, ignore_index=True) if pairs else pd.DataFrame(columns=NEAR_COLUMNS)
+        index.to_csv(hash_file, index=False)
+        near.to_csv(near_file, index=False)
+
+        print(f"\n函数哈希索引已保存到: {hash_file}")
+        print(f"近似相同函数已保存到: {near_file}")
+
+    except Exception as e:
+        print(f"\n错误: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -181,6 +181,23 @@ test_image_file() {
     return 0
 }
 
+# 在scripts/可导入的环境中运行一段Python检查代码（断言失败即测试失败）
+test_python() {
+    local description=$1
+    local code=$2
+    
+    TESTS_TOTAL=$((TESTS_TOTAL + 1))
+    print_test "$description"
+    
+    if PYTHONPATH="$SCRIPT_DIR" python3 -c "$code" >> "$TEST_LOG" 2>&1; then
+        print_pass "检查通过"
+        return 0
+    else
+        print_fail "检查失败，详见日志: $TEST_LOG"
+        return 1
+    fi
+}
+
 # 主测试流程
 main() {
     print_header "集成测试 - 端到端测试"
@@ -223,14 +240,24 @@ main() {
     # 5. 验证分析工具输出
     print_header "步骤 5: 验证分析工具输出"
     
-    test_dir_exists "$PROJECT_ROOT/results/objdump" "检查objdump目录"
-    test_dir_exists "$PROJECT_ROOT/results/readelf" "检查readelf目录"
-    test_dir_exists "$PROJECT_ROOT/results/nm" "检查nm目录"
-    
-    # 检查是否有分析文件生成
-    local objdump_count=$(find "$PROJECT_ROOT/results/objdump" -name "*.asm" 2>/dev/null | wc -l)
-    local readelf_count=$(find "$PROJECT_ROOT/results/readelf" -name "*.txt" 2>/dev/null | wc -l)
-    local nm_count=$(find "$PROJECT_ROOT/results/nm" -name "*.txt" 2>/dev/null | wc -l)
+    # 归档后文本文件默认被删除（KEEP_TEXT_ARTIFACTS=false），此时从工件存储中统计
+    local store_file="$PROJECT_ROOT/results/artifacts.db"
+    local objdump_count readelf_count nm_count
+    if [ -f "$store_file" ]; then
+        test_file_exists "$store_file" "检查工件存储"
+        local stored=$(python3 scripts/artifact_store.py list 2>> "$TEST_LOG")
+        objdump_count=$(echo "$stored" | grep -c "^objdump " || true)
+        readelf_count=$(echo "$stored" | grep -c "^readelf " || true)
+        nm_count=$(echo "$stored" | grep -c "^nm " || true)
+    else
+        test_dir_exists "$PROJECT_ROOT/results/objdump" "检查objdump目录"
+        test_dir_exists "$PROJECT_ROOT/results/readelf" "检查readelf目录"
+        test_dir_exists "$PROJECT_ROOT/results/nm" "检查nm目录"
+        
+        objdump_count=$(find "$PROJECT_ROOT/results/objdump" -name "*.asm" 2>/dev/null | wc -l)
+        readelf_count=$(find "$PROJECT_ROOT/results/readelf" -name "*.txt" 2>/dev/null | wc -l)
+        nm_count=$(find "$PROJECT_ROOT/results/nm" -name "*.txt" 2>/dev/null | wc -l)
+    fi
     
     TESTS_TOTAL=$((TESTS_TOTAL + 1))
     print_test "验证分析文件数量"
@@ -261,8 +288,287 @@ main() {
     test_file_exists "$PROJECT_ROOT/analysis/optimization_impact.csv" "检查optimization_impact.csv"
     test_file_exists "$PROJECT_ROOT/analysis/summary_report.txt" "检查summary_report.txt"
     
-    # 8. 运行可视化
-    print_header "步骤 8: 运行可视化"
+    # 8. 验证扩展测量阶段的输出和核心算法
+    print_header "步骤 8: 验证扩展测量阶段"
+    
+    # 自助法置信区间和显著性检验
+    test_csv_columns "$PROJECT_ROOT/analysis/summary_statistics.csv" \
+        "total_size_ci_low total_size_ci_high" "验证summary_statistics.csv置信区间列"
+    test_csv_columns "$PROJECT_ROOT/analysis/opt_level_significance.csv" \
+        "opt_a opt_b size_diff ci_low ci_high p_value significant" "验证opt_level_significance.csv列"
+    test_python "验证自助法置信区间" "
+import pandas as pd
+from bootstrap_stats import bootstrap_ci
+df = pd.DataFrame({'g': ['a'] * 4 + ['b'] * 4 + ['c'], 'x': [1.0, 2, 3, 4, 5, 5, 5, 5, 7]})
+ci = bootstrap_ci(df, 'x', ['g']).set_index('g')
+assert ((ci['ci_low'] <= ci['mean']) & (ci['mean'] <= ci['ci_high'])).all()
+assert ci.loc['b', 'ci_low'] == ci.loc['b', 'ci_high'] == 5
+assert bootstrap_ci(df.iloc[0:0], 'x', ['g']).empty
+stats = pd.read_csv('analysis/summary_statistics.csv')
+assert (stats['total_size_ci_low'] <= stats['total_size_mean']).all()
+assert (stats['total_size_mean'] <= stats['total_size_ci_high']).all()
+"
+    test_python "验证自助法差异检验（含样本不足）" "
+import numpy as np
+import pandas as pd
+from bootstrap_stats import bootstrap_difference
+df = pd.DataFrame({'p': ['x'] * 6 + ['y'] * 2, 'c': list('aaabbbab'),
+                   'v': [1, 1.1, 0.9, 5, 5.1, 4.9, 1, 5]})
+diff = bootstrap_difference(df, 'v', ['p'], 'c', 'a', 'b').set_index('p')
+assert diff.loc['x', 'significant'] and diff.loc['x', 'ci_low'] > 0
+assert not diff.loc['y', 'significant'] and np.isnan(diff.loc['y', 'p_value'])
+"
+    
+    # 运行时内存测量
+    test_csv_format "$PROJECT_ROOT/results/memory_footprint.csv" "验证memory_footprint.csv格式"
+    test_csv_columns "$PROJECT_ROOT/results/memory_footprint.csv" \
+        "program compiler opt_level run peak_rss_kb minor_faults exit_status timestamp" \
+        "验证memory_footprint.csv列"
+    test_csv_columns "$PROJECT_ROOT/analysis/memory_footprint.csv" \
+        "runs peak_rss_ci_low peak_rss_ci_high peak_rss_delta_kb peak_rss_p_value" \
+        "验证内存占用分析列"
+    test_python "验证内存测量结果" "
+import pandas as pd
+memory = pd.read_csv('results/memory_footprint.csv')
+assert (memory['exit_status'] == 0).all() and (memory['peak_rss_kb'] > 0).all()
+assert {'-O2', 'static'} <= set(memory['opt_level'])
+"
+    test_python "验证只列出配置中单元的可执行文件" "
+import os
+import tempfile
+from pathlib import Path
+from profile_memory import find_executables
+with tempfile.TemporaryDirectory() as build_dir:
+    for opt_dir in ['O2', 'Og', 'lto']:
+        path = Path(build_dir) / 'gcc' / opt_dir / 'demo'
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b'')
+        os.chmod(path, 0o755)
+    (Path(build_dir) / 'gcc' / 'O2' / '.demo.cache').write_text('0')
+    cells = {('demo', 'gcc', '-O2'), ('demo', 'gcc', 'lto')}
+    found = [cell for _, cell in find_executables(build_dir, cells=cells)]
+    assert found == [('demo', 'gcc', '-O2'), ('demo', 'gcc', 'lto')], found
+    assert len(find_executables(build_dir)) == 3
+"
+    
+    # 微基准测试
+    test_csv_format "$PROJECT_ROOT/results/microbench.csv" "验证microbench.csv格式"
+    test_csv_columns "$PROJECT_ROOT/results/microbench.csv" \
+        "program compiler opt_level function run iterations ns_per_call timestamp" "验证microbench.csv列"
+    test_csv_columns "$PROJECT_ROOT/results/microbench_sizes.csv" \
+        "program compiler opt_level function function_size" "验证microbench_sizes.csv列"
+    test_python "验证每个单元测量了所有被测函数" "
+from pathlib import Path
+import pandas as pd
+from microbench import BENCHMARKS
+from project_config import load_config, list_cells
+config = load_config('config.sh')
+programs = [p for p in BENCHMARKS if (Path(config['SRC_DIR']) / f'{p}.c').exists()]
+bench = pd.read_csv('results/microbench.csv')
+assert (bench['ns_per_call'] > 0).all()
+measured = set(bench[['program', 'compiler', 'opt_level', 'function']].itertuples(index=False, name=None))
+for program, compiler, opt_level in list_cells(config, programs):
+    for function in BENCHMARKS[program]['variants']:
+        assert (program, compiler, opt_level, function) in measured, (program, compiler, opt_level, function)
+analysis = pd.read_csv('analysis/microbench.csv')
+assert (analysis.loc[analysis['opt_level'] == '-O0', 'speedup'] == 1).all()
+"
+    
+    # 压缩后大小和ELF读取
+    test_csv_format "$PROJECT_ROOT/results/compressed_size.csv" "验证compressed_size.csv格式"
+    test_csv_columns "$PROJECT_ROOT/results/compressed_size.csv" \
+        "program compiler opt_level stripped_size text_section_size stripped_lzma_6 text_zlib_9 timestamp" \
+        "验证compressed_size.csv列"
+    test_csv_columns "$PROJECT_ROOT/analysis/transfer_size.csv" \
+        "program target codec level best_compiler best_opt_level best_size winner_differs" \
+        "验证传输大小分析列"
+    test_python "验证ELF读取与objdump/nm一致" "
+import subprocess
+from pathlib import Path
+import pandas as pd
+from elf_reader import read_sections, read_section, function_symbols
+executable = sorted(Path('build/gcc/O2').glob('[!.]*'))[0]
+image = executable.read_bytes()
+headers = subprocess.run(['objdump', '-h', str(executable)], capture_output=True, text=True,
+                         check=True).stdout
+sizes = {f[1]: int(f[2], 16) for f in (line.split() for line in headers.splitlines())
+         if len(f) > 2 and f[0].isdigit()}
+sections = {section.name: section for section in read_sections(image)}
+assert all(sections[name].size == size for name, size in sizes.items()), sizes
+assert len(read_section(image, '.text')) == sizes['.text']
+nm = subprocess.run(['nm', '-S', str(executable)], capture_output=True, text=True, check=True).stdout
+expected = {(f[3], int(f[1], 16)) for f in (line.split() for line in nm.splitlines())
+            if len(f) == 4 and f[2] in 'tTwW' and int(f[1], 16) > 0}
+assert {(symbol.name, symbol.size) for symbol in function_symbols(image)} == expected
+compressed = pd.read_csv('results/compressed_size.csv')
+row = compressed[(compressed['program'] == executable.name) & (compressed['compiler'] == 'gcc')
+                 & (compressed['opt_level'] == '-O2')].iloc[-1]
+assert row['text_section_size'] == sizes['.text']
+assert (compressed['stripped_lzma_6'] < compressed['stripped_size']).all()
+"
+    
+    # 相同代码检测
+    test_csv_format "$PROJECT_ROOT/results/function_hashes.csv" "验证function_hashes.csv格式"
+    test_csv_columns "$PROJECT_ROOT/results/function_hashes.csv" \
+        "program compiler opt_level function address size hash" "验证function_hashes.csv列"
+    test_csv_columns "$PROJECT_ROOT/results/near_identical_functions.csv" \
+        "program scope compiler_a opt_level_a function_a compiler_b opt_level_b function_b similarity" \
+        "验证near_identical_functions.csv列"
+    test_csv_columns "$PROJECT_ROOT/analysis/identical_code.csv" \
+        "program builds functions icf_savings_bytes dedup_savings_bytes near_identical_within" \
+        "验证相同代码分析列"
+    test_python "验证MinHash LSH找出近似相同的函数" "
+import numpy as np
+import pandas as pd
+from identical_code import shingles, near_identical_pairs
+rng = np.random.default_rng(1)
+base = rng.integers(0, 256, 400, dtype=np.uint8).tobytes()
+near = base[:200] + bytes(4) + base[204:]
+codes = [base, near, rng.integers(0, 256, 400, dtype=np.uint8).tobytes(), base]
+index = pd.DataFrame({'hash': ['a', 'b', 'c', 'a']})
+pairs = near_identical_pairs(index, [shingles(code) for code in codes], 0.8)
+assert [(i, j) for i, j, _ in pairs] == [(0, 1), (1, 3)], pairs
+assert all(0.8 <= similarity < 1 for _, _, similarity in pairs)
+"
+    test_python "验证函数哈希索引" "
+import pandas as pd
+from project_config import load_config
+hashes = pd.read_csv('results/function_hashes.csv')
+assert (hashes.groupby(['program', 'hash'])['size'].nunique() == 1).all()
+near = pd.read_csv('results/near_identical_functions.csv')
+threshold = float(load_config('config.sh')['IDENTICAL_CODE_THRESHOLD'] or 0.8)
+assert near['similarity'].between(threshold, 1).all()
+"
+    
+    # 函数级运行时剖析
+    test_csv_format "$PROJECT_ROOT/results/function_profile.csv" "验证function_profile.csv格式"
+    test_csv_columns "$PROJECT_ROOT/results/function_profile.csv" \
+        "program compiler opt_level function runs calls self_ns total_ns timestamp" \
+        "验证function_profile.csv列"
+    test_csv_columns "$PROJECT_ROOT/analysis/function_hotness.csv" \
+        "function calls self_us self_time_share hot function_size bytes_per_hot_us compile_for" \
+        "验证函数热度分析列"
+    test_python "验证函数级剖析结果" "
+import pandas as pd
+from profile_functions import read_profile
+assert read_profile('401126 3 120 450\n401000 1 30 480\n') == {0x401126: (3, 120, 450),
+                                                              0x401000: (1, 30, 480)}
+profile = pd.read_csv('results/function_profile.csv')
+keys = ['program', 'compiler', 'opt_level', 'timestamp']
+main = profile[profile['function'] == 'main'].set_index(keys)['total_ns'].rename('main_total_ns')
+assert (profile[profile['function'] == 'main']['calls'] == 1).all()
+# 递归调用只计最外层的包含时间，任何函数的包含时间都不超过main
+profile = profile.join(main, on=keys)
+assert (profile['self_ns'] <= profile['total_ns']).all()
+assert (profile['total_ns'] <= profile['main_total_ns']).all()
+hotness = pd.read_csv('analysis/function_hotness.csv')
+assert not hotness.loc[hotness['function'] == 'main', 'hot'].any()
+assert hotness.groupby(['program', 'compiler', 'opt_level'])['hot'].any().all()
+"
+    
+    # 工件内容寻址存储
+    test_python "验证工件存储分块与读写" "
+import tempfile
+from pathlib import Path
+from artifact_store import ArtifactKey, ArtifactStore, split_chunks
+lines = [f'  401{i:03x}:\t48 89 e5    \tmov    %rsp,%rbp\n' for i in range(2000)]
+text = ''.join(lines)
+assert b''.join(split_chunks(text.encode())) == text.encode()
+with tempfile.TemporaryDirectory() as tmp:
+    with ArtifactStore(Path(tmp) / 'store.db') as store:
+        first = ArtifactKey('objdump', 'demo', 'gcc', '-O2')
+        second = ArtifactKey('objdump', 'demo', 'clang', '-O2')
+        written = store.put(first, text)
+        # 只有末尾不同的第二个工件复用前面所有的块
+        assert store.put(second, text + 'extra\n') < written / 4
+        assert store.get(first) == text and store.get(second) == text + 'extra\n'
+        stats = store.stats()
+        assert stats['artifacts'] == 2 and stats['unique_bytes'] < stats['raw_bytes']
+        store.delete(second)
+        assert store.gc() >= 1 and store.get(second) is None and store.get(first) == text
+"
+    if [ -f "$PROJECT_ROOT/results/artifacts.db" ]; then
+        test_python "验证存储中的工件可完整读出" "
+from artifact_store import ArtifactStore, TOOL_SUFFIXES
+with ArtifactStore('results/artifacts.db') as store:
+    for tool in TOOL_SUFFIXES:
+        keys = store.keys(tool)
+        assert keys, tool
+        # get()会校验整个工件的摘要
+        assert all(store.get(key) for key in keys)
+    assert 'Disassembly of section' in store.get(store.keys('objdump')[0])
+"
+    fi
+    
+    # 编译器优化备注
+    test_python "验证GCC优化记录解析" "
+import io, json
+from opt_remarks import gcc_remarks
+def record(kind, function, *message):
+    return {'kind': kind, 'pass': 'test', 'function': function, 'message': list(message)}
+records = [
+    record('success', 'main', 'Inlining ', {'symtab_node': 'helper/1'}, ' into ', {'symtab_node': 'main/2'}),
+    record('success', 'sum', 'loop vectorized using 16 byte vectors'),
+    record('success', 'sum', 'loop unrolled 3 times'),
+    record('failure', 'sum', 'not vectorized: unsupported data-type'),
+    record('note', 'sum', 'considering loop'),
+    record('success', 'sum', 'loop versioned for vectorization'),
+]
+stream = io.StringIO(json.dumps([{'format': '1'}, [{'name': 'passes'}], records]))
+assert list(gcc_remarks(stream)) == [('main', 'inlined'), ('sum', 'vectorized'),
+                                     ('sum', 'unrolled'), ('sum', 'missed')]
+assert list(gcc_remarks(io.StringIO('[{}, [], []]'))) == []
+"
+    test_python "验证Clang优化记录解析" "
+import io
+from opt_remarks import clang_remarks
+documents = '''--- !Passed
+Pass:            inline
+Name:            Inlined
+Function:        main
+Args:
+  - Callee:          helper
+...
+--- !Passed
+Pass:            loop-unroll
+Name:            FullyUnrolled
+Function:        sum
+...
+--- !Missed
+Pass:            loop-vectorize
+Name:            MissedDetails
+Function:        sum
+...
+--- !Analysis
+Pass:            prologepilog
+Function:        sum
+...
+--- !Passed
+Pass:            licm
+Function:        sum
+...
+'''
+assert list(clang_remarks(io.StringIO(documents))) == [('main', 'inlined'), ('sum', 'unrolled'),
+                                                        ('sum', 'missed')]
+"
+    test_csv_format "$PROJECT_ROOT/results/opt_remarks.csv" "验证opt_remarks.csv格式"
+    test_csv_columns "$PROJECT_ROOT/results/opt_remarks.csv" \
+        "program compiler opt_level function inlined vectorized unrolled missed timestamp" \
+        "验证opt_remarks.csv列"
+    test_csv_columns "$PROJECT_ROOT/analysis/remark_attribution.csv" \
+        "function_size size_growth inlined_delta vectorized_delta unrolled_delta missed_delta growth_cause" \
+        "验证优化备注归因列"
+    test_python "验证优化备注统计" "
+import pandas as pd
+remarks = pd.read_csv('results/opt_remarks.csv')
+counts = remarks[['inlined', 'vectorized', 'unrolled', 'missed']]
+assert (counts >= 0).all().all()
+o3 = remarks[remarks['opt_level'] == '-O3']
+assert (o3['inlined'] + o3['unrolled']).gt(0).any()
+"
+    
+    # 9. 运行可视化
+    print_header "步骤 9: 运行可视化"
     print_info "执行: python3 scripts/visualize.py"
     
     if python3 scripts/visualize.py >> "$TEST_LOG" 2>&1; then
@@ -273,8 +579,8 @@ main() {
         exit 1
     fi
     
-    # 9. 验证图表输出
-    print_header "步骤 9: 验证图表输出"
+    # 10. 验证图表输出
+    print_header "步骤 10: 验证图表输出"
     
     test_dir_exists "$PROJECT_ROOT/reports/figures" "检查figures目录"
     
@@ -298,7 +604,7 @@ main() {
         fi
     fi
     
-    # 10. 测试摘要
+    # 11. 测试摘要
     print_header "测试摘要"
     
     echo ""
@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+微基准测试脚本 - 为src/中每个程序生成基准测试工具，
+分别测量每种算法实现在各编译器/优化级别下的单次调用耗时
+
+程序源文件以被测配置的编译选项单独编译（main被重命名），
+与生成的基准测试main链接，因此被测函数不会被内联到测量循环中（LTO配置除外）。
+"""
+
+import pandas as pd
+import subprocess
+import sys
+import os
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import symbol_sizes
+from project_config import load_config, list_programs, list_cells, config_flags
+
+
+# microbench.csv的列顺序
+BENCH_COLUMNS = ['program', 'compiler', 'opt_level', 'function', 'run', 'iterations',
+                 'ns_per_call', 'timestamp']
+
+# 被测函数大小文件（与microbench.csv位于同一目录）及其列顺序
+SIZES_FILE = 'microbench_sizes.csv'
+SIZE_COLUMNS = ['program', 'compiler', 'opt_level', 'function', 'function_size']
+
+# 每个程序的被测函数：声明、全局数据、一次性初始化和每次迭代执行的代码
+# 输入通过volatile读取，结果通过DO_NOT_OPTIMIZE使用，防止编译器消除或提升调用
+BENCHMARKS = {
+    'fibonacci': {
+        'declarations': '''
+int fib_recursive(int n);
+int fib_iterative(int n);
+int fib_tail_recursive(int n);
+static volatile int fib_n = 20;''',
+        'init': '',
+        'variants': {
+            'fib_recursive': 'int r = fib_recursive(fib_n); DO_NOT_OPTIMIZE(r);',
+            'fib_iterative': 'int r = fib_iterative(fib_n); DO_NOT_OPTIMIZE(r);',
+            'fib_tail_recursive': 'int r = fib_tail_recursive(fib_n); DO_NOT_OPTIMIZE(r);',
+        },
+    },
+    'popcount': {
+        'declarations': '''
+int popcount_naive(unsigned int x);
+int popcount_kernighan(unsigned int x);
+int popcount_lookup(unsigned int x);
+int popcount_parallel(unsigned int x);
+static volatile unsigned int pop_x = 0x12345678u;''',
+        'init': '',
+        'variants': {
+            'popcount_naive': 'int r = popcount_naive(pop_x ^ (unsigned int)i); DO_NOT_OPTIMIZE(r);',
+            'popcount_kernighan': 'int r = popcount_kernighan(pop_x ^ (unsigned int)i); DO_NOT_OPTIMIZE(r);',
+            'popcount_lookup': 'int r = popcount_lookup(pop_x ^ (unsigned int)i); DO_NOT_OPTIMIZE(r);',
+            'popcount_parallel': 'int r = popcount_parallel(pop_x ^ (unsigned int)i); DO_NOT_OPTIMIZE(r);',
+        },
+    },
+    'quicksort': {
+        'declarations': '''
+void quicksort(int arr[], int low, int high);
+static const int qs_input[] = {64, 34, 25, 12, 22, 11, 90, 88, 45, 50, 23, 36, 18, 77, 29};
+static int qs_work[sizeof(qs_input) / sizeof(qs_input[0])];''',
+        'init': '',
+        'variants': {
+            # 每次迭代重新复制输入，复制开销计入测量结果
+            'quicksort': '''memcpy(qs_work, qs_input, sizeof(qs_work)); CLOBBER_MEMORY();
+        quicksort(qs_work, 0, (int)(sizeof(qs_work) / sizeof(qs_work[0])) - 1); CLOBBER_MEMORY();''',
+        },
+    },
+    'string_search': {
+        'declarations': '''
+char* string_search(const char* haystack, const char* needle);
+static const char* volatile ss_text = "The quick brown fox jumps over the lazy dog";
+static const char* volatile ss_pattern = "lazy";''',
+        'init': '',
+        'variants': {
+            'string_search': 'char* r = string_search(ss_text, ss_pattern); DO_NOT_OPTIMIZE(r);',
+        },
+    },
+    'matrix_add': {
+        'declarations': '''
+#define N 4
+void mat_add(int A[N][N], int B[N][N], int C[N][N]);
+static int ma_A[N][N], ma_B[N][N], ma_C[N][N];''',
+        'init': '''
+    for (int i = 0; i < N; i++)
+        for (int j = 0; j < N; j++) {
+            ma_A[i][j] = i + j;
+            ma_B[i][j] = i - j;
+        }''',
+        'variants': {
+            'mat_add': 'CLOBBER_MEMORY(); mat_add(ma_A, ma_B, ma_C); CLOBBER_MEMORY();',
+        },
+    },
+    'matrix_mult': {
+        'declarations': '''
+#define N 4
+void mat_mult(int A[N][N], int B[N][N], int C[N][N]);
+static int mm_A[N][N], mm_B[N][N], mm_C[N][N];''',
+        'init': '''
+    for (int i = 0; i < N; i++)
+        for (int j = 0; j < N; j++) {
+            mm_A[i][j] = i + j + 1;
+            mm_B[i][j] = (i == j) ? 1 : 0;
+        }''',
+        'variants': {
+            'mat_mult': 'CLOBBER_MEMORY(); mat_mult(mm_A, mm_B, mm_C); CLOBBER_MEMORY();',
+        },
+    },
+    'linked_list': {
+        'declarations': '''
+typedef struct Node {
+    int data;
+    struct Node* next;
+} Node;
+typedef void (*NodeCallback)(Node* node, void* context);
+Node* create_node(int data);
+void traverse_list(Node* head, NodeCallback callback, void* context);
+void sum_callback(Node* node, void* context);
+void free_list(Node* head);
+static Node* ll_head;''',
+        'init': '''
+    for (int i = 0; i < 64; i++) {
+        Node* node = create_node(i);
+        node->next = ll_head;
+        ll_head = node;
+    }''',
+        'variants': {
+            'traverse_list': 'int sum = 0; traverse_list(ll_head, sum_callback, &sum); DO_NOT_OPTIMIZE(sum);',
+            # 创建并立即释放一个节点
+            'create_node': 'Node* node = create_node((int)i); DO_NOT_OPTIMIZE(node); free_list(node);',
+        },
+    },
+}
+
+HARNESS_TEMPLATE = '''/* 由 scripts/microbench.py 生成，请勿手工修改 */
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+/* 防止编译器消除被测调用或把内存访问移出循环 */
+#define DO_NOT_OPTIMIZE(x) __asm__ __volatile__("" : : "g"(x) : "memory")
+#define CLOBBER_MEMORY() __asm__ __volatile__("" : : : "memory")
+
+{declarations}
+
+static double now_ns(void) {{
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec * 1e9 + ts.tv_nsec;
+}}
+
+{functions}
+
+typedef void (*bench_fn)(long iterations);
+
+static const struct {{
+    const char* name;
+    bench_fn fn;
+}} benches[] = {{
+{table}
+}};
+
+int main(int argc, char* argv[]) {{
+    double min_time_ns = (argc > 1 ? atof(argv[1]) : 10.0) * 1e6;
+    int repeats = argc > 2 ? atoi(argv[2]) : 5;
+{init}
+
+    for (size_t b = 0; b < sizeof(benches) / sizeof(benches[0]); b++) {{
+        /* 校准迭代次数：加倍直到单次测量达到最短时间 */
+        long iterations = 1;
+        for (;;) {{
+            double start = now_ns();
+            benches[b].fn(iterations);
+            if (now_ns() - start >= min_time_ns || iterations >= (1L << 40)) break;
+            iterations *= 2;
+        }}
+
+        for (int r = 1; r <= repeats; r++) {{
+            double start = now_ns();
+            benches[b].fn(iterations);
+            double elapsed = now_ns() - start;
+            printf("%s %d %ld %.4f\\n", benches[b].name, r, iterations, elapsed / iterations);
+        }}
+    }}
+    return 0;
+}}
+'''
+
+FUNCTION_TEMPLATE = '''static void bench_{name}(long iterations) {{
+    for (long i = 0; i < iterations; i++) {{
+        {body}
+    }}
+}}'''
+
+
+def generate_harness(program):
+    """
+    生成某个程序的基准测试main源代码
+
+    Args:
+        program: 程序名称（BENCHMARKS中的键）
+
+    Returns:
+        C源代码字符串
+    """
+    spec = BENCHMARKS[program]
+    functions = '\n\n'.join(FUNCTION_TEMPLATE.format(name=name, body=body)
+                            for name, body in spec['variants'].items())
+    table = '\n'.join(f'    {{"{name}", bench_{name}}},' for name in spec['variants'])
+    return HARNESS_TEMPLATE.format(declarations=spec['declarations'].strip(), functions=functions,
+                                   table=table, init=spec['init'])
+
+
+def build_benchmark(compiler, opt_level, source_file, bench_dir):
+    """
+    编译并链接单个 (程序, 编译器, 优化级别) 的基准测试工具
+
+    被测程序使用该配置的选项编译，生成的main固定使用-O2（LTO配置同时加-flto）。
+
+    Args:
+        compiler: 编译器
+        opt_level: 优化级别
+        source_file: 被测程序源文件
+        bench_dir: 基准测试输出目录
+
+    Returns:
+        基准测试可执行文件路径，编译失败时返回None
+    """
+    program = source_file.stem
+    flags = config_flags(opt_level)
+    output_dir = bench_dir / compiler / opt_level.lstrip('-')
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    harness_source = output_dir / f'{program}_bench.c'
+    harness_source.write_text(generate_harness(program), encoding='utf-8')
+    program_object = output_dir / f'{program}.o'
+    harness_object = output_dir / f'{program}_bench.o'
+    executable = output_dir / f'{program}_bench'
+    harness_flags = ['-O2', '-flto'] if '-flto' in flags else ['-O2']
+
+    commands = [
+        [compiler, *flags, '-Dmain=benchmarked_program_main', '-c', '-o', program_object, source_file],
+        [compiler, *harness_flags, '-c', '-o', harness_object, harness_source],
+        [compiler, *harness_flags, '-o', executable, harness_object, program_object],
+    ]
+    for cmd in commands:
+        result = subprocess.run([str(arg) for arg in cmd], capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"  ✗ 编译失败: {program} {compiler} {opt_level}: {result.stderr.strip()}",
+                  file=sys.stderr)
+            return None
+    return executable
+
+
+def run_benchmark(executable, cell, min_time_ms=10.0, repeats=5, timeout=120):
+    """
+    运行基准测试工具并解析结果
+
+    Args:
+        executable: 基准测试可执行文件
+        cell: (程序, 编译器, 优化级别) 元组
+        min_time_ms: 每次测量的最短时间（毫秒），用于校准迭代次数
+        repeats: 每个函数的重复测量次数
+        timeout: 超时时间（秒）
+
+    Returns:
+        microbench.csv的行字典列表
+    """
+    program, compiler, opt_level = cell
+    try:
+        result = subprocess.run([str(executable), str(min_time_ms), str(repeats)],
+                                capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        print(f"  ✗ 运行超时: {executable}", file=sys.stderr)
+        return []
+
+    if result.returncode != 0:
+        print(f"  ✗ 运行失败: {executable}", file=sys.stderr)
+        return []
+
+    timestamp = pd.Timestamp.now(tz='UTC').isoformat(timespec='seconds')
+    rows = []
+    for line in result.stdout.splitlines():
+        function, run, iterations, ns_per_call = line.split()
+        rows.append({'program': program, 'compiler': compiler, 'opt_level': opt_level,
+                     'function': function, 'run': int(run), 'iterations': int(iterations),
+                     'ns_per_call': float(ns_per_call), 'timestamp': timestamp})
+    return rows
+
+
+def measure_function_sizes(executable, cell):
+    """
+    用nm -S读取基准测试工具中被测函数的大小
+
+    LTO配置的被测程序在链接时与生成的main一起优化，函数大小与整个程序的构建不同，
+    因此从实际运行的可执行文件中读取。被完全内联的函数没有符号，不产生记录。
+
+    Args:
+        executable: 基准测试可执行文件
+        cell: (程序, 编译器, 优化级别) 元组
+
+    Returns:
+        microbench_sizes.csv的行字典列表
+    """
+    program, compiler, opt_level = cell
+    result = subprocess.run(['nm', '-S', str(executable)], capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"  ✗ nm失败: {executable}", file=sys.stderr)
+        return []
+
+    sizes = symbol_sizes.parse_nm_sizes(result.stdout)
+    return [{'program': program, 'compiler': compiler, 'opt_level': opt_level,
+             'function': function, 'function_size': sizes[function]}
+            for function in BENCHMARKS[program]['variants'] if function in sizes]
+
+
+def parse_arguments():
+    """
+    解析命令行参数
+
+    Returns:
+        argparse.Namespace: 解析后的参数
+    """
+    parser = argparse.ArgumentParser(
+        description='代码空间优化微基准测试脚本 - 分别测量每种算法实现的调用耗时',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  %(prog)s                                    # 测量所有程序
+  %(prog)s --program popcount                 # 仅测量popcount的各个实现
+  %(prog)s --min-time 50 --repeats 10         # 更长、更多次的测量
+        """
+    )
+
+    parser.add_argument(
+        '--output', '-o',
+        type=str,
+        default='results/microbench.csv',
+        help='输出CSV文件路径 (默认: results/microbench.csv)'
+    )
+
+    parser.add_argument(
+        '--build', '-b',
+        type=str,
+        default='build/bench',
+        help='基准测试编译输出目录 (默认: build/bench)'
+    )
+
+    parser.add_argument(
+        '--min-time',
+        type=float,
+        default=10.0,
+        help='每次测量的最短时间（毫秒）(默认: 10)'
+    )
+
+    parser.add_argument(
+        '--repeats', '-n',
+        type=int,
+        default=5,
+        help='每个函数的重复测量次数 (默认: 5)'
+    )
+
+    parser.add_argument(
+        '--program',
+        type=str,
+        help='仅测量指定程序'
+    )
+
+    parser.add_argument(
+        '--compiler',
+        type=str,
+        help='仅测量指定编译器'
+    )
+
+    parser.add_argument(
+        '--no-lto',
+        action='store_true',
+        help='不测量LTO配置'
+    )
+
+    parser.add_argument(
+        '--version', '-v',
+        action='version',
+        version='%(prog)s 1.0'
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_arguments()
+
+    project_root = Path(__file__).resolve().parent.parent
+    output_file = Path(args.output)
+    bench_dir = Path(args.build)
+
+    try:
+        print("=" * 80)
+        print("开始微基准测试")
+        print("=" * 80)
+
+        config = load_config(project_root / 'config.sh')
+        src_dir = project_root / config['SRC_DIR']
+        programs = [p for p in sorted(BENCHMARKS) if (src_dir / f'{p}.c').exists()]
+        unbenchmarked = [p for p in list_programs(src_dir) if p not in BENCHMARKS]
+        if unbenchmarked and not args.program:
+            print(f"警告: 以下程序没有定义基准测试，已跳过（需在BENCHMARKS中添加）: "
+                  f"{', '.join(unbenchmarked)}", file=sys.stderr)
+        if args.program:
+            if args.program not in BENCHMARKS:
+                raise ValueError(f"没有为该程序定义基准测试: {args.program}")
+            programs = [args.program]
+
+        cells = list_cells(config, programs, args.compiler, not args.no_lto)
+        print(f"共 {len(cells)} 个基准测试单元")
+
+        # 并行编译，串行运行以避免相互干扰
+        jobs = int(config['PARALLEL_JOBS'] or os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            executables = list(executor.map(
+                lambda cell: build_benchmark(cell[1], cell[2], src_dir / f'{cell[0]}.c', bench_dir),
+                cells))
+
+        rows = []
+        size_rows = []
+        for cell, executable in zip(cells, executables):
+            if executable is None:
+                continue
+            size_rows.extend(measure_function_sizes(executable, cell))
+            cell_rows = run_benchmark(executable, cell, args.min_time, args.repeats)
+            for function in dict.fromkeys(row['function'] for row in cell_rows):
+                best = min(row['ns_per_call'] for row in cell_rows if row['function'] == function)
+                print(f"  ✓ {' '.join(cell)} {function}: {best:.2f} ns/次")
+            rows.extend(cell_rows)
+
+        # 与code_size.csv一样追加记录
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        df = pd.DataFrame(rows, columns=BENCH_COLUMNS)
+        df.to_csv(output_file, mode='a', index=False, header=not output_file.exists())
+
+        # 函数大小只保留每个单元最近一次编译的结果
+        sizes_file = output_file.parent / SIZES_FILE
+        built = {cell for cell, executable in zip(cells, executables) if executable is not None}
+        sizes = pd.DataFrame(size_rows, columns=SIZE_COLUMNS)
+        if sizes_file.exists():
+            existing = pd.read_csv(sizes_file)
+            rebuilt = pd.MultiIndex.from_frame(existing[SIZE_COLUMNS[:3]]).isin(list(built))
+            sizes = pd.concat([existing[~rebuilt], sizes], ignore_index=True)
+        sizes.to_csv(sizes_file, index=False)
+
+        print(f"\n微基准测试结果已保存到: {output_file}")
+        print(f"记录了 {len(df)} 次测量")
+        print(f"被测函数大小已保存到: {sizes_file}")
+
+    except Exception as e:
+        print(f"\n错误: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
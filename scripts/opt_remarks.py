@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+优化备注收集脚本 - 以 -fsave-optimization-record 编译每个程序，
+把编译器的优化备注（remarks）汇总为每个函数的内联、向量化、展开和错失优化次数
+
+GCC写出gzip压缩的JSON记录（*.opt-record.json.gz），Clang写出YAML记录（*.opt.yaml）。
+两种记录都逐条流式解析，不把整个文件读入内存。
+-fopt-info-all 和 -Rpass 的文本输出只有源码位置、没有所在函数，因此使用结构化记录。
+"""
+
+import pandas as pd
+import subprocess
+import tempfile
+import gzip
+import json
+import re
+import sys
+import os
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from project_config import load_config, list_programs, list_cells, config_flags
+from symbol_sizes import base_function_name
+
+
+# 每个函数统计的备注类别
+REMARK_CATEGORIES = ['inlined', 'vectorized', 'unrolled', 'missed']
+
+# opt_remarks.csv的列顺序
+REMARK_COLUMNS = ['program', 'compiler', 'opt_level', 'function', *REMARK_CATEGORIES, 'timestamp']
+
+# GCC成功备注的消息前缀/关键字 -> 类别
+GCC_SUCCESS_PATTERNS = [
+    (re.compile(r'^\s*Inlin(ing|ed)\b'), 'inlined'),
+    (re.compile(r'\bvectorized\b'), 'vectorized'),
+    (re.compile(r'\bunrolled\b'), 'unrolled'),
+]
+
+# Clang通过的备注: Pass -> 类别
+CLANG_PASSES = {
+    'inline': 'inlined',
+    'always-inline': 'inlined',
+    'loop-vectorize': 'vectorized',
+    'slp-vectorizer': 'vectorized',
+    'loop-unroll': 'unrolled',
+    'loop-unroll-and-jam': 'unrolled',
+}
+
+# Clang YAML文档的顶层字段
+YAML_FIELD = re.compile(r'^(Pass|Name|Function):\s*(.*?)\s*$')
+
+# 流式解析时每次读取的字符数
+READ_SIZE = 1 << 20
+
+
+class _JsonStream:
+    """
+    从文本流中逐个解析JSON值，缓冲区只保留尚未解析的部分
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size=READ_SIZE):
+        """
+        读取更多内容，已到文件末尾时返回False
+        """
+        if self._eof:
+            return False
+        data = self._stream.read(size)
+        if not data:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + data
+        self._pos = 0
+        return True
+
+    def _skip_whitespace(self):
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos].isspace():
+                self._pos += 1
+            if self._pos < len(self._buffer) or not self._fill():
+                return
+
+    def take(self, char):
+        """
+        跳过空白，如果下一个字符是char则消费它并返回True
+        """
+        self._skip_whitespace()
+        if self._buffer[self._pos:self._pos + 1] == char:
+            self._pos += 1
+            return True
+        return False
+
+    def expect(self, char):
+        """
+        同take，但下一个字符不是char时抛出ValueError
+        """
+        if not self.take(char):
+            raise ValueError(f"JSON格式错误: 期望 '{char}'")
+
+    def value(self):
+        """
+        解析下一个完整的JSON值；值跨越缓冲区末尾时读取更多内容后重试，
+        每次重试读取量加倍，使很大的值（如SLP向量化的长备注）的解析时间保持线性
+        """
+        self._skip_whitespace()
+        size = READ_SIZE
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+            self._pos = end
+            return value
+
+
+def message_text(message):
+    """
+    拼接GCC备注消息的各部分（字符串，或带symtab_node/expr/stmt的对象）
+    """
+    parts = []
+    for part in message:
+        if isinstance(part, str):
+            parts.append(part)
+        else:
+            parts.append(str(part.get('symtab_node') or part.get('expr') or part.get('stmt') or ''))
+    return ''.join(parts)
+
+
+def gcc_remarks(stream):
+    """
+    流式解析GCC的优化记录
+
+    文件是一个三元素数组 [头部, 优化遍树, 备注数组]，只逐条解析备注数组。
+
+    Args:
+        stream: 解压后的文本流
+
+    Yields:
+        (函数名, 类别)
+    """
+    parser = _JsonStream(stream)
+    parser.expect('[')
+    parser.value()
+    parser.expect(',')
+    parser.value()
+    parser.expect(',')
+    parser.expect('[')
+    if parser.take(']'):
+        return
+    while True:
+        record = parser.value()
+        function = record.get('function')
+        kind = record.get('kind')
+        if function and kind in ('success', 'failure'):
+            text = message_text(record.get('message', []))
+            if kind == 'failure':
+                if text.strip():
+                    yield function, 'missed'
+            else:
+                for pattern, category in GCC_SUCCESS_PATTERNS:
+                    if pattern.search(text):
+                        yield function, category
+                        break
+        if not parser.take(','):
+            break
+    parser.expect(']')
+
+
+def clang_remarks(stream):
+    """
+    逐行解析Clang的YAML优化记录，只读取每个文档的顶层 Pass 和 Function 字段
+
+    Args:
+        stream: 文本流
+
+    Yields:
+        (函数名, 类别)
+    """
+    def classify(document):
+        function = document.get('Function', '').strip('\'"')
+        if not function:
+            return None
+        if document['kind'] == 'Missed':
+            return function, 'missed'
+        if document['kind'] == 'Passed' and document.get('Pass') in CLANG_PASSES:
+            return function, CLANG_PASSES[document['Pass']]
+        return None
+
+    # 每个文档以 "--- !类型" 开始，以 "..." 结束
+    document = None
+    for line in stream:
+        if line.startswith('--- !'):
+            document = {'kind': line[5:].strip()}
+        elif line.startswith('...') and document is not None:
+            remark = classify(document)
+            document = None
+            if remark:
+                yield remark
+        elif document is not None:
+            match = YAML_FIELD.match(line)
+            if match:
+                document[match.group(1)] = match.group(2)
+
+
+def read_remarks(record_file):
+    """
+    按文件类型选择解析器
+
+    Yields:
+        (函数名, 类别)
+    """
+    name = record_file.name
+    if name.endswith('.json.gz'):
+        with gzip.open(record_file, 'rt', encoding='utf-8') as stream:
+            yield from gcc_remarks(stream)
+    elif name.endswith('.yaml'):
+        with open(record_file, encoding='utf-8', errors='replace') as stream:
+            yield from clang_remarks(stream)
+
+
+def collect_cell(cell, source_file):
+    """
+    带优化记录编译并链接单个 (程序, 编译器, 优化级别)，汇总每个函数的备注
+
+    在临时目录中编译，LTO配置的链接时优化（ltrans）记录也写在这里。
+
+    Args:
+        cell: (程序, 编译器, 优化级别) 元组
+        source_file: 程序源文件
+
+    Returns:
+        opt_remarks.csv的行字典列表，编译失败时返回None
+    """
+    program, compiler, opt_level = cell
+    flags = config_flags(opt_level)
+    counts = Counter()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cmd = [compiler, *flags, '-fsave-optimization-record', '-o', program,
+               str(Path(source_file).resolve())]
+        result = subprocess.run(cmd, cwd=tmp_dir, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"  ✗ 编译失败: {' '.join(cell)}: {result.stderr.strip()}", file=sys.stderr)
+            return None
+        for record_file in sorted(Path(tmp_dir).iterdir()):
+            for function, category in read_remarks(record_file):
+                counts[base_function_name(function), category] += 1
+
+    timestamp = pd.Timestamp.now(tz='UTC').isoformat(timespec='seconds')
+    functions = sorted({function for function, _ in counts})
+    return [{'program': program, 'compiler': compiler, 'opt_level': opt_level,
+             'function': function,
+             **{category: counts[function, category] for category in REMARK_CATEGORIES},
+             'timestamp': timestamp}
+            for function in functions]
+
+
+def parse_arguments():
+    """
+    解析命令行参数
+
+    Returns:
+        argparse.Namespace: 解析后的参数
+    """
+    parser = argparse.ArgumentParser(
+        description='代码空间优化备注收集脚本 - 统计每个函数的内联、向量化、展开和错失优化',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  %(prog)s                                    # 收集所有程序的优化备注
+  %(prog)s --program quicksort --compiler gcc # 仅收集指定程序和编译器
+  %(prog)s --no-lto                           # 不收集LTO配置
+        """
+    )
+
+    parser.add_argument(
+        '--output', '-o',
+        type=str,
+        default='results/opt_remarks.csv',
+        help='输出CSV文件路径 (默认: results/opt_remarks.csv)'
+    )
+
+    parser.add_argument(
+        '--program',
+        type=str,
+        help='仅收集指定程序'
+    )
+
+    parser.add_argument(
+        '--compiler',
+        type=str,
+        help='仅收集指定编译器'
+    )
+
+    parser.add_argument(
+        '--no-lto',
+        action='store_true',
+        help='不收集LTO配置'
+    )
+
+    parser.add_argument(
+        '--version', '-v',
+        action='version',
+        version='%(prog)s 1.0'
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_arguments()
+
+    project_root = Path(__file__).resolve().parent.parent
+    output_file = Path(args.output)
+
+    try:
+        print("=" * 80)
+        print("开始收集优化备注")
+        print("=" * 80)
+
+        config = load_config(project_root / 'config.sh')
+        src_dir = project_root / config['SRC_DIR']
+        programs = list_programs(src_dir)
+        if args.program:
+            programs = [p for p in programs if p == args.program]
+            if not programs:
+                raise FileNotFoundError(f"源文件不存在: {src_dir / args.program}.c")
+
+        cells = list_cells(config, programs, args.compiler, not args.no_lto)
+        print(f"共 {len(cells)} 个单元")
+
+        jobs = int(config['PARALLEL_JOBS'] or os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(
+                lambda cell: collect_cell(cell, src_dir / f'{cell[0]}.c'), cells))
+
+        rows = []
+        for cell, cell_rows in zip(cells, results):
+            if cell_rows is None:
+                continue
+            totals = {category: sum(row[category] for row in cell_rows)
+                      for category in REMARK_CATEGORIES}
+            print(f"  ✓ {' '.join(cell)}: 内联 {totals['inlined']}，向量化 {totals['vectorized']}，"
+                  f"展开 {totals['unrolled']}，错失 {totals['missed']}")
+            rows.extend(cell_rows)
+
+        # 与function_profile.csv一样追加记录，分析时重复收集的结果取平均
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        df = pd.DataFrame(rows, columns=REMARK_COLUMNS)
+        df.to_csv(output_file, mode='a', index=False, header=not output_file.exists())
+
+        print(f"\n优化备注已保存到: {output_file}")
+        print(f"记录了 {len(df)} 个函数")
+
+    except Exception as e:
+        print(f"\n错误: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+函数级运行时剖析脚本 - 以 -finstrument-functions 编译每个程序的插桩版本，
+与 scripts/instrument_runtime.c 链接后运行，收集每个函数的调用次数和自身时间
+
+测试程序的运行时间只有微秒级，远低于gprof采样的10毫秒间隔，因此使用插桩计时而不是-pg。
+"""
+
+import pandas as pd
+import subprocess
+import tempfile
+import sys
+import os
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import elf_reader
+from project_config import load_config, list_programs, list_cells, config_flags
+from symbol_sizes import base_function_name
+
+
+RUNTIME_SOURCE = Path(__file__).resolve().parent / 'instrument_runtime.c'
+
+# function_profile.csv的列顺序
+PROFILE_COLUMNS = ['program', 'compiler', 'opt_level', 'function', 'runs', 'calls',
+                   'self_ns', 'total_ns', 'timestamp']
+
+
+def build_instrumented(compiler, opt_level, source_file, profile_dir):
+    """
+    编译并链接单个 (程序, 编译器, 优化级别) 的插桩版本
+
+    Args:
+        compiler: 编译器
+        opt_level: 优化级别
+        source_file: 程序源文件
+        profile_dir: 插桩版本输出目录
+
+    Returns:
+        插桩可执行文件路径，编译失败时返回None
+    """
+    program = source_file.stem
+    flags = config_flags(opt_level)
+    output_dir = profile_dir / compiler / opt_level.lstrip('-')
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    program_object = output_dir / f'{program}.o'
+    runtime_object = output_dir / f'{program}_runtime.o'
+    executable = output_dir / program
+    runtime_flags = ['-O2', '-flto'] if '-flto' in flags else ['-O2']
+
+    commands = [
+        [compiler, *flags, '-finstrument-functions', '-c', '-o', program_object, source_file],
+        [compiler, *runtime_flags, '-c', '-o', runtime_object, RUNTIME_SOURCE],
+        [compiler, *flags, '-o', executable, program_object, runtime_object],
+    ]
+    for cmd in commands:
+        result = subprocess.run([str(arg) for arg in cmd], capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"  ✗ 编译失败: {program} {compiler} {opt_level}: {result.stderr.strip()}",
+                  file=sys.stderr)
+            return None
+    return executable
+
+
+def read_profile(output):
+    """
+    解析运行时库的输出
+
+    Returns:
+        {地址: (调用次数, 自身时间ns, 包含时间ns)} 字典
+    """
+    profile = {}
+    for line in output.splitlines():
+        address, calls, self_ns, total_ns = line.split()
+        profile[int(address, 16)] = (int(calls), int(self_ns), int(total_ns))
+    return profile
+
+
+def profile_cell(executable, cell, runs=5, timeout=10):
+    """
+    多次运行插桩程序，按函数汇总每次运行的平均调用次数和时间
+
+    Args:
+        executable: 插桩可执行文件
+        cell: (程序, 编译器, 优化级别) 元组
+        runs: 运行次数
+        timeout: 每次运行的超时时间（秒）
+
+    Returns:
+        function_profile.csv的行字典列表
+    """
+    program, compiler, opt_level = cell
+    image = Path(executable).read_bytes()
+    names = {symbol.value: base_function_name(symbol.name)
+             for symbol in elf_reader.function_symbols(image)}
+
+    totals = {}
+    completed = 0
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_file = Path(tmp_dir) / 'profile.txt'
+        env = dict(os.environ, FUNC_PROFILE_OUT=str(output_file))
+        for _ in range(runs):
+            try:
+                result = subprocess.run([str(executable)], stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL, env=env, timeout=timeout)
+            except subprocess.TimeoutExpired:
+                print(f"  ✗ 运行超时: {executable}", file=sys.stderr)
+                continue
+            if result.returncode != 0 or not output_file.exists():
+                print(f"  ✗ 运行失败: {executable}", file=sys.stderr)
+                continue
+
+            completed += 1
+            for address, values in read_profile(output_file.read_text()).items():
+                name = names.get(address, f'0x{address:x}')
+                previous = totals.get(name, (0, 0, 0))
+                totals[name] = tuple(a + b for a, b in zip(previous, values))
+
+    timestamp = pd.Timestamp.now(tz='UTC').isoformat(timespec='seconds')
+    return [{'program': program, 'compiler': compiler, 'opt_level': opt_level,
+             'function': name, 'runs': completed, 'calls': calls / completed,
+             'self_ns': self_ns / completed, 'total_ns': total_ns / completed,
+             'timestamp': timestamp}
+            for name, (calls, self_ns, total_ns) in sorted(totals.items())]
+
+
+def parse_arguments():
+    """
+    解析命令行参数
+
+    Returns:
+        argparse.Namespace: 解析后的参数
+    """
+    parser = argparse.ArgumentParser(
+        description='代码空间优化函数级剖析脚本 - 收集每个函数的调用次数和自身时间',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  %(prog)s                                    # 剖析所有程序
+  %(prog)s --runs 20                          # 每个插桩程序运行20次
+  %(prog)s --program quicksort --compiler gcc # 仅剖析指定程序和编译器
+        """
+    )
+
+    parser.add_argument(
+        '--output', '-o',
+        type=str,
+        default='results/function_profile.csv',
+        help='输出CSV文件路径 (默认: results/function_profile.csv)'
+    )
+
+    parser.add_argument(
+        '--build', '-b',
+        type=str,
+        default='build/profile',
+        help='插桩版本编译输出目录 (默认: build/profile)'
+    )
+
+    parser.add_argument(
+        '--runs', '-n',
+        type=int,
+        default=5,
+        help='每个插桩程序的运行次数 (默认: 5)'
+    )
+
+    parser.add_argument(
+        '--program',
+        type=str,
+        help='仅剖析指定程序'
+    )
+
+    parser.add_argument(
+        '--compiler',
+        type=str,
+        help='仅剖析指定编译器'
+    )
+
+    parser.add_argument(
+        '--no-lto',
+        action='store_true',
+        help='不剖析LTO配置'
+    )
+
+    parser.add_argument(
+        '--version', '-v',
+        action='version',
+        version='%(prog)s 1.0'
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_arguments()
+
+    project_root = Path(__file__).resolve().parent.parent
+    output_file = Path(args.output)
+    profile_dir = Path(args.build)
+
+    try:
+        print("=" * 80)
+        print("开始函数级运行时剖析")
+        print("=" * 80)
+
+        config = load_config(project_root / 'config.sh')
+        src_dir = project_root / config['SRC_DIR']
+        programs = list_programs(src_dir)
+        if args.program:
+            programs = [p for p in programs if p == args.program]
+            if not programs:
+                raise FileNotFoundError(f"源文件不存在: {src_dir / args.program}.c")
+
+        cells = list_cells(config, programs, args.compiler, not args.no_lto)
+        print(f"共 {len(cells)} 个剖析单元，每个运行 {args.runs} 次")
+
+        # 并行编译，串行运行以避免相互干扰
+        jobs = int(config['PARALLEL_JOBS'] or os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            executables = list(executor.map(
+                lambda cell: build_instrumented(cell[1], cell[2], src_dir / f'{cell[0]}.c',
+                                                profile_dir),
+                cells))
+
+        rows = []
+        for cell, executable in zip(cells, executables):
+            if executable is None:
+                continue
+            cell_rows = profile_cell(executable, cell, args.runs)
+            if cell_rows:
+                hottest = max(cell_rows, key=lambda row: row['self_ns'])
+                print(f"  ✓ {' '.join(cell)}: {len(cell_rows)} 个函数，"
+                      f"最热 {hottest['function']} ({hottest['self_ns'] / 1000:.1f} µs)")
+            rows.extend(cell_rows)
+
+        # 与code_size.csv一样追加记录
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        df = pd.DataFrame(rows, columns=PROFILE_COLUMNS)
+        df.to_csv(output_file, mode='a', index=False, header=not output_file.exists())
+
+        print(f"\n函数级剖析结果已保存到: {output_file}")
+        print(f"记录了 {len(df)} 个函数")
+
+    except Exception as e:
+        print(f"\n错误: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+运行时内存占用测量脚本 - 在轻量测量工具下运行编译好的程序，
+收集峰值常驻内存、缺页次数和上下文切换次数
+"""
+
+import pandas as pd
+import subprocess
+import signal
+import sys
+import os
+import argparse
+from pathlib import Path
+
+from project_config import load_config_cells
+
+
+HARNESS_SOURCE = Path(__file__).resolve().parent / 'rusage_harness.c'
+
+# memory_footprint.csv的列顺序
+MEMORY_COLUMNS = ['program', 'compiler', 'opt_level', 'run', 'peak_rss_kb', 'minor_faults',
+                  'major_faults', 'voluntary_ctx_switches', 'involuntary_ctx_switches',
+                  'exit_status', 'timestamp']
+
+# 测量工具输出的字段
+HARNESS_FIELDS = ['exit_status', 'peak_rss_kb', 'minor_faults', 'major_faults',
+                  'voluntary_ctx_switches', 'involuntary_ctx_switches']
+
+# 只用于运行时内存测量的配置：静态链接包含整个libc，不计入代码大小、压缩大小等结果
+MEMORY_ONLY_OPT_LEVELS = ['static']
+
+
+def build_harness(build_dir, compiler='gcc'):
+    """
+    编译测量工具，源文件未修改时复用已有的可执行文件
+
+    优先静态链接，使测量工具自身的常驻内存尽可能小。
+
+    Args:
+        build_dir: 编译输出目录
+        compiler: 用于编译测量工具的编译器
+
+    Returns:
+        测量工具可执行文件路径
+
+    Raises:
+        RuntimeError: 如果编译失败
+    """
+    tools_dir = Path(build_dir) / 'tools'
+    tools_dir.mkdir(parents=True, exist_ok=True)
+    harness = tools_dir / 'rusage_harness'
+
+    if harness.exists() and harness.stat().st_mtime >= HARNESS_SOURCE.stat().st_mtime:
+        return harness
+
+    for flags in (['-O2', '-static'], ['-O2']):
+        result = subprocess.run([compiler, *flags, '-o', str(harness), str(HARNESS_SOURCE)],
+                                capture_output=True, text=True)
+        if result.returncode == 0:
+            return harness
+
+    raise RuntimeError(f"编译测量工具失败: {result.stderr.strip()}")
+
+
+def opt_level_from_dir(name):
+    """
+    将build/下的目录名转换为code_size.csv中的优化级别（O2 -> -O2，lto保持不变）
+    """
+    return f'-{name}' if name.startswith('O') else name
+
+
+def find_executables(build_dir, program=None, compiler=None, cells=None):
+    """
+    列出build/<编译器>/<配置>/<程序>下的可执行文件（跳过测量工具、微基准测试和插桩版本目录）
+
+    Args:
+        build_dir: 编译输出目录
+        program: 仅包含该程序（可选）
+        compiler: 仅包含该编译器（可选）
+        cells: 仅包含这些 (程序, 编译器, 优化级别) 单元（可选，用于跳过已从配置中移除的单元留下的目录）
+
+    Returns:
+        [(可执行文件路径, (程序, 编译器, 优化级别))] 列表
+    """
+    executables = []
+    for compiler_dir in sorted(Path(build_dir).iterdir()):
+        if not compiler_dir.is_dir() or compiler_dir.name in ('tools', 'bench', 'profile'):
+            continue
+        if compiler and compiler_dir.name != compiler:
+            continue
+
+        for opt_dir in sorted(compiler_dir.iterdir()):
+            if not opt_dir.is_dir():
+                continue
+            for path in sorted(opt_dir.iterdir()):
+                # 跳过缓存文件、profile数据和PGO的中间产物
+                if (not path.is_file() or path.name.startswith('.')
+                        or path.name.endswith('_stage1') or not os.access(path, os.X_OK)):
+                    continue
+                if program and path.name != program:
+                    continue
+                cell = (path.name, compiler_dir.name, opt_level_from_dir(opt_dir.name))
+                if cells is not None and cell not in cells:
+                    continue
+                executables.append((path, cell))
+    return executables
+
+
+def profile_binary(harness, executable, runs=5, timeout=10):
+    """
+    在测量工具下多次运行程序
+
+    Args:
+        harness: 测量工具路径
+        executable: 被测可执行文件
+        runs: 运行次数
+        timeout: 每次运行的超时时间（秒）
+
+    Returns:
+        每次运行的指标字典列表，超时或失败的运行被跳过
+    """
+    measurements = []
+    for run in range(1, runs + 1):
+        # 在新的进程组中运行，超时时连同被测程序一起终止
+        proc = subprocess.Popen([str(harness), str(executable)], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, text=True, start_new_session=True)
+        try:
+            output, _ = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.communicate()
+            print(f"  ✗ 运行超时: {executable}", file=sys.stderr)
+            continue
+
+        fields = output.split()
+        if proc.returncode != 0 or len(fields) != len(HARNESS_FIELDS):
+            print(f"  ✗ 测量失败: {executable}", file=sys.stderr)
+            continue
+
+        measurement = dict(zip(HARNESS_FIELDS, map(int, fields)))
+        measurement['run'] = run
+        measurements.append(measurement)
+    return measurements
+
+
+def profile_cell(harness, executable, cell, runs=5, timeout=10):
+    """
+    测量单个 (程序, 编译器, 优化级别) 单元
+
+    Returns:
+        memory_footprint.csv的行字典列表
+    """
+    program, compiler, opt_level = cell
+    timestamp = pd.Timestamp.now(tz='UTC').isoformat(timespec='seconds')
+    return [{'program': program, 'compiler': compiler, 'opt_level': opt_level,
+             'timestamp': timestamp, **measurement}
+            for measurement in profile_binary(harness, executable, runs, timeout)]
+
+
+def parse_arguments():
+    """
+    解析命令行参数
+
+    Returns:
+        argparse.Namespace: 解析后的参数
+    """
+    parser = argparse.ArgumentParser(
+        description='代码空间优化运行时内存测量脚本 - 测量峰值RSS、缺页和上下文切换',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  %(prog)s                                    # 测量build/下所有程序
+  %(prog)s --runs 10                          # 每个程序运行10次
+  %(prog)s --program fibonacci --compiler gcc # 仅测量指定程序和编译器
+        """
+    )
+
+    parser.add_argument(
+        '--build', '-b',
+        type=str,
+        default='build',
+        help='编译输出目录 (默认: build)'
+    )
+
+    parser.add_argument(
+        '--output', '-o',
+        type=str,
+        default='results/memory_footprint.csv',
+        help='输出CSV文件路径 (默认: results/memory_footprint.csv)'
+    )
+
+    parser.add_argument(
+        '--runs', '-n',
+        type=int,
+        default=5,
+        help='每个程序的运行次数 (默认: 5)'
+    )
+
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=10,
+        help='每次运行的超时时间（秒）(默认: 10)'
+    )
+
+    parser.add_argument(
+        '--program',
+        type=str,
+        help='仅测量指定程序'
+    )
+
+    parser.add_argument(
+        '--compiler',
+        type=str,
+        help='仅测量指定编译器'
+    )
+
+    parser.add_argument(
+        '--version', '-v',
+        action='version',
+        version='%(prog)s 1.0'
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_arguments()
+
+    build_dir = Path(args.build)
+    output_file = Path(args.output)
+
+    try:
+        print("=" * 80)
+        print("开始运行时内存测量")
+        print("=" * 80)
+
+        if not build_dir.is_dir():
+            raise FileNotFoundError(f"编译输出目录不存在: {build_dir}")
+
+        harness = build_harness(build_dir)
+        # 只测量配置中的单元，已从配置中移除的单元在build/下留下的目录不再测量
+        cells = load_config_cells(Path(__file__).resolve().parent.parent / 'config.sh')
+        executables = find_executables(build_dir, args.program, args.compiler, cells)
+        print(f"找到 {len(executables)} 个可执行文件，每个运行 {args.runs} 次")
+
+        rows = []
+        for executable, cell in executables:
+            measurements = profile_cell(harness, executable, cell, args.runs, args.timeout)
+            if measurements:
+                peak = max(m['peak_rss_kb'] for m in measurements)
+                print(f"  ✓ {' '.join(cell)}: 峰值RSS {peak} KB")
+            rows.extend(measurements)
+
+        # 与code_size.csv一样追加记录，重复运行的结果作为重复测量参与统计
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        df = pd.DataFrame(rows, columns=MEMORY_COLUMNS)
+        df.to_csv(output_file, mode='a', index=False, header=not output_file.exists())
+
+        print(f"\n内存测量结果已保存到: {output_file}")
+        print(f"记录了 {len(df)} 次运行")
+
+    except Exception as e:
+        print(f"\n错误: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
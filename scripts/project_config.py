@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+项目配置模块 - 读取config.sh并列出配置中的程序和 (程序, 编译器, 优化级别) 单元，
+供各测量和分析脚本共用，保证它们与run_tests.sh看到的配置一致
+"""
+
+import subprocess
+from pathlib import Path
+
+
+# 从config.sh读取的变量
+CONFIG_KEYS = ['COMPILERS', 'GCC_OPT_LEVELS', 'CLANG_OPT_LEVELS', 'ENABLE_LTO',
+               'ENABLE_PGO', 'ENABLE_STATIC', 'ENABLE_MEMORY_PROFILE', 'MEMORY_PROFILE_RUNS',
+               'ENABLE_MICROBENCH', 'MICROBENCH_REPEATS', 'MICROBENCH_MIN_TIME_MS',
+               'ENABLE_FUNCTION_PROFILE', 'FUNCTION_PROFILE_RUNS', 'ENABLE_OPT_REMARKS',
+               'ENABLE_COMPRESSED_SIZE', 'ENABLE_IDENTICAL_CODE', 'IDENTICAL_CODE_THRESHOLD',
+               'ENABLE_ARTIFACT_STORE', 'KEEP_TEXT_ARTIFACTS',
+               'BUILD_DIR', 'RESULTS_DIR', 'SRC_DIR', 'PARALLEL_JOBS']
+
+# 单独编译被测程序时支持的非-O配置及其编译选项；
+# PGO需要每个程序单独的profile数据，静态链接与-O2生成相同的函数代码，均不支持
+SEPARATE_BUILD_FLAGS = {'lto': ['-O2', '-flto']}
+
+
+def load_config(config_file):
+    """
+    通过bash加载config.sh，保证与run_tests.sh看到的配置一致
+
+    Args:
+        config_file: config.sh路径
+
+    Returns:
+        配置字典
+
+    Raises:
+        RuntimeError: 如果配置文件无法加载
+    """
+    script = 'source "$1"; ' + ' '.join(f'printf "%s\\n" "${key}";' for key in CONFIG_KEYS)
+    result = subprocess.run(['bash', '-c', script, 'bash', str(config_file)],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"加载配置文件失败: {config_file}: {result.stderr.strip()}")
+
+    values = result.stdout.split('\n')
+    return dict(zip(CONFIG_KEYS, values))
+
+
+def list_programs(src_dir):
+    """
+    列出src/中的程序名称
+    """
+    return sorted(path.stem for path in src_dir.glob('*.c'))
+
+
+def compiler_opt_levels(config, compiler):
+    """
+    返回配置中某个编译器的基本优化级别（不含lto/pgo/static），不支持的编译器返回空列表
+    """
+    if compiler == 'gcc':
+        return config['GCC_OPT_LEVELS'].split()
+    if compiler == 'clang':
+        return config['CLANG_OPT_LEVELS'].split()
+    return []
+
+
+def config_cells(config, programs):
+    """
+    根据配置列出所有 (程序, 编译器, 优化级别) 单元
+
+    Args:
+        config: 配置字典
+        programs: 程序名称列表
+
+    Returns:
+        单元元组集合
+    """
+    cells = set()
+    for compiler in config['COMPILERS'].split():
+        opt_levels = compiler_opt_levels(config, compiler)
+        if not opt_levels:
+            continue
+
+        if config['ENABLE_LTO'] == 'true':
+            opt_levels.append('lto')
+        if config['ENABLE_PGO'] == 'true':
+            opt_levels.append('pgo')
+        if config['ENABLE_STATIC'] == 'true':
+            opt_levels.append('static')
+
+        for program in programs:
+            for opt_level in opt_levels:
+                cells.add((program, compiler, opt_level))
+
+    return cells
+
+
+def load_config_cells(config_file):
+    """
+    加载config.sh并列出其中所有程序的 (程序, 编译器, 优化级别) 单元
+
+    Args:
+        config_file: config.sh路径（SRC_DIR相对于其所在目录）
+
+    Returns:
+        单元元组集合
+
+    Raises:
+        RuntimeError: 如果配置文件无法加载
+    """
+    config_file = Path(config_file)
+    config = load_config(config_file)
+    return config_cells(config, list_programs(config_file.parent / config['SRC_DIR']))
+
+
+def list_cells(config, programs, compiler=None, include_lto=True):
+    """
+    按配置顺序列出基本优化级别（及可选的LTO）的 (程序, 编译器, 优化级别) 单元，
+    供单独编译被测程序的脚本使用
+
+    Args:
+        config: 配置字典
+        programs: 程序名称列表
+        compiler: 仅列出该编译器的单元（可选）
+        include_lto: 配置启用LTO时是否包含lto单元
+
+    Returns:
+        单元元组列表
+    """
+    cells = []
+    for comp in config['COMPILERS'].split():
+        if compiler and comp != compiler:
+            continue
+        opt_levels = compiler_opt_levels(config, comp)
+        if include_lto and opt_levels and config['ENABLE_LTO'] == 'true':
+            opt_levels.append('lto')
+        cells.extend((program, comp, opt_level) for opt_level in opt_levels for program in programs)
+    return cells
+
+
+def config_flags(opt_level):
+    """
+    返回单独编译被测程序时优化级别对应的编译选项，不支持的配置返回None
+    """
+    if opt_level.startswith('-O'):
+        return [opt_level]
+    return SEPARATE_BUILD_FLAGS.get(opt_level)
@@ -6,6 +6,13 @@ QUICK_MODE=false
 SPECIFIC_PROGRAM=""
 SPECIFIC_COMPILER=""
 SKIP_ADVANCED=false
+SKIP_MEMORY=false
+SKIP_BENCH=false
+SKIP_COMPRESS=false
+SKIP_ICF=false
+SKIP_PROFILE=false
+SKIP_REMARKS=false
+SKIP_STORE=false
 
 # 显示帮助信息
 show_help() {
@@ -19,7 +26,14 @@ show_help() {
   --quick             快速测试模式，仅测试一个程序（fibonacci）
   --program NAME      指定要测试的程序名称（不含.c扩展名）
   --compiler NAME     指定编译器（gcc 或 clang）
-  --no-advanced       跳过LTO和PGO高级优化测试
+  --no-advanced       跳过LTO、PGO和静态链接高级优化测试
+  --no-memory         跳过运行时内存测量
+  --no-bench          跳过微基准测试
+  --no-compress       跳过压缩后大小测量
+  --no-icf            跳过相同代码检测
+  --no-profile        跳过函数级运行时剖析
+  --no-remarks        跳过优化备注收集
+  --no-store          跳过工具输出归档
 
 示例:
   $0                              # 运行所有测试
@@ -27,7 +41,14 @@ show_help() {
   $0 --program fibonacci          # 仅测试fibonacci程序
   $0 --compiler gcc               # 仅使用GCC编译器
   $0 --program quicksort --compiler clang  # 测试quicksort，仅使用Clang
-  $0 --no-advanced                # 跳过LTO和PGO测试
+  $0 --no-advanced                # 跳过LTO、PGO和静态链接测试
+  $0 --no-memory                  # 跳过运行时内存测量
+  $0 --no-bench                   # 跳过微基准测试
+  $0 --no-compress                # 跳过压缩后大小测量
+  $0 --no-icf                     # 跳过相同代码检测
+  $0 --no-profile                 # 跳过函数级运行时剖析
+  $0 --no-remarks                 # 跳过优化备注收集
+  $0 --no-store                   # 不将工具输出写入工件存储
 
 EOF
     exit 0
@@ -68,6 +89,34 @@ parse_arguments() {
                 SKIP_ADVANCED=true
                 shift
                 ;;
+            --no-memory)
+                SKIP_MEMORY=true
+                shift
+                ;;
+            --no-bench)
+                SKIP_BENCH=true
+                shift
+                ;;
+            --no-compress)
+                SKIP_COMPRESS=true
+                shift
+                ;;
+            --no-icf)
+                SKIP_ICF=true
+                shift
+                ;;
+            --no-profile)
+                SKIP_PROFILE=true
+                shift
+                ;;
+            --no-remarks)
+                SKIP_REMARKS=true
+                shift
+                ;;
+            --no-store)
+                SKIP_STORE=true
+                shift
+                ;;
             *)
                 echo "错误: 未知选项 $1"
                 echo "使用 --help 查看帮助信息"
@@ -289,6 +338,31 @@ compile_with_lto() {
     fi
 }
 
+# 静态链接编译函数
+compile_with_static() {
+    local compiler=$1
+    local source_file=$2
+    local output_dir=$3
+    
+    local program_name=$(basename "$source_file" .c)
+    local output_file="$output_dir/$program_name"
+    
+    log_message "编译 $program_name 使用 $compiler -static..." >&2
+    
+    # 静态链接编译命令
+    local compile_cmd="$compiler -O2 -static -o $output_file $source_file"
+    
+    # 执行编译并记录输出
+    if $compile_cmd 2>> "$LOG_FILE"; then
+        log_message "  ✓ 静态链接编译成功: $output_file" >&2
+        echo "$output_file"
+        return 0
+    else
+        log_error "静态链接编译失败: $program_name with $compiler" >&2
+        return 1
+    fi
+}
+
 # PGO编译函数（两阶段）
 compile_with_pgo() {
     local compiler=$1
@@ -410,9 +484,10 @@ measure_size() {
     fi
     
     # 解析 size 输出提取 text, data, bss 段大小
-    local text_size=$(echo "$size_output" | grep "^\.text" | awk '{print $2}')
-    local data_size=$(echo "$size_output" | grep "^\.data" | awk '{print $2}')
-    local bss_size=$(echo "$size_output" | grep "^\.bss" | awk '{print $2}')
+    # 精确匹配段名，避免匹配到.data.rel.ro等同前缀的段（静态链接时出现）
+    local text_size=$(echo "$size_output" | awk '$1 == ".text" {print $2; exit}')
+    local data_size=$(echo "$size_output" | awk '$1 == ".data" {print $2; exit}')
+    local bss_size=$(echo "$size_output" | awk '$1 == ".bss" {print $2; exit}')
     
     # 如果某些段不存在，设置为0
     text_size=${text_size:-0}
@@ -1012,6 +1087,371 @@ run_pgo_tests() {
     log_message "失败: $failed_tests"
 }
 
+# 静态链接测试
+run_static_tests() {
+    if [ "$SKIP_ADVANCED" = true ]; then
+        log_message "跳过静态链接测试（--no-advanced）"
+        return 0
+    fi
+    
+    if [ "$ENABLE_STATIC" != "true" ]; then
+        log_message "静态链接测试已禁用，跳过"
+        return 0
+    fi
+    
+    log_message "=========================================="
+    log_message "开始静态链接编译测试"
+    log_message "=========================================="
+    
+    # 静态链接构建只用于运行时内存测量，不写入code_size.csv
+    
+    # 检测源文件
+    local source_files=$(detect_source_files)
+    
+    # 统计变量
+    local total_tests=0
+    local successful_tests=0
+    local failed_tests=0
+    
+    # 确定要使用的编译器列表
+    local compilers_to_test="$COMPILERS"
+    if [ -n "$SPECIFIC_COMPILER" ]; then
+        compilers_to_test="$SPECIFIC_COMPILER"
+    fi
+    
+    # 遍历编译器
+    for compiler in $compilers_to_test; do
+        log_message "----------------------------------------"
+        log_message "使用编译器: $compiler (静态链接)"
+        log_message "----------------------------------------"
+        
+        # 创建静态链接输出目录
+        local output_dir="$PROJECT_ROOT/$BUILD_DIR/$compiler/static"
+        mkdir -p "$output_dir"
+        
+        # 遍历所有源文件
+        for source_file in $source_files; do
+            local program_name=$(basename "$source_file" .c)
+            
+            total_tests=$((total_tests + 1))
+            
+            # 使用静态链接编译程序
+            local executable=$(compile_with_static "$compiler" "$source_file" "$output_dir")
+            
+            if [ $? -eq 0 ] && [ -n "$executable" ]; then
+                successful_tests=$((successful_tests + 1))
+            else
+                failed_tests=$((failed_tests + 1))
+                continue
+            fi
+        done
+    done
+    
+    # 输出测试摘要
+    log_message "=========================================="
+    log_message "静态链接测试完成"
+    log_message "=========================================="
+    log_message "总测试数: $total_tests"
+    log_message "成功: $successful_tests"
+    log_message "失败: $failed_tests"
+}
+
+# 压缩后大小测量
+run_compressed_size() {
+    if [ "$SKIP_COMPRESS" = true ]; then
+        log_message "跳过压缩后大小测量（--no-compress）"
+        return 0
+    fi
+    
+    if [ "$ENABLE_COMPRESSED_SIZE" != "true" ]; then
+        log_message "压缩后大小测量已禁用，跳过"
+        return 0
+    fi
+    
+    if ! command -v python3 &> /dev/null; then
+        log_error "python3 未安装，跳过压缩后大小测量"
+        return 1
+    fi
+    
+    log_message "=========================================="
+    log_message "开始压缩后大小测量"
+    log_message "=========================================="
+    
+    local compress_args=(--build "$PROJECT_ROOT/$BUILD_DIR"
+                         --output "$PROJECT_ROOT/$RESULTS_DIR/compressed_size.csv"
+                         --jobs "${PARALLEL_JOBS:-4}")
+    if [ -n "$SPECIFIC_PROGRAM" ]; then
+        compress_args+=(--program "$SPECIFIC_PROGRAM")
+    elif [ "$QUICK_MODE" = true ]; then
+        compress_args+=(--program fibonacci)
+    fi
+    if [ -n "$SPECIFIC_COMPILER" ]; then
+        compress_args+=(--compiler "$SPECIFIC_COMPILER")
+    fi
+    
+    python3 "$SCRIPT_DIR/compressed_size.py" "${compress_args[@]}" 2>&1 | tee -a "$LOG_FILE"
+    if [ "${PIPESTATUS[0]}" -eq 0 ]; then
+        log_message "压缩后大小测量完成"
+    else
+        log_error "压缩后大小测量失败"
+        return 1
+    fi
+}
+
+# 相同代码检测
+run_identical_code() {
+    if [ "$SKIP_ICF" = true ]; then
+        log_message "跳过相同代码检测（--no-icf）"
+        return 0
+    fi
+    
+    if [ "$ENABLE_IDENTICAL_CODE" != "true" ]; then
+        log_message "相同代码检测已禁用，跳过"
+        return 0
+    fi
+    
+    if ! command -v python3 &> /dev/null; then
+        log_error "python3 未安装，跳过相同代码检测"
+        return 1
+    fi
+    
+    log_message "=========================================="
+    log_message "开始相同代码检测"
+    log_message "=========================================="
+    
+    local icf_args=(--build "$PROJECT_ROOT/$BUILD_DIR"
+                    --results "$PROJECT_ROOT/$RESULTS_DIR"
+                    --threshold "${IDENTICAL_CODE_THRESHOLD:-0.8}")
+    if [ -n "$SPECIFIC_PROGRAM" ]; then
+        icf_args+=(--program "$SPECIFIC_PROGRAM")
+    elif [ "$QUICK_MODE" = true ]; then
+        icf_args+=(--program fibonacci)
+    fi
+    if [ -n "$SPECIFIC_COMPILER" ]; then
+        icf_args+=(--compiler "$SPECIFIC_COMPILER")
+    fi
+    
+    python3 "$SCRIPT_DIR/identical_code.py" "${icf_args[@]}" 2>&1 | tee -a "$LOG_FILE"
+    if [ "${PIPESTATUS[0]}" -eq 0 ]; then
+        log_message "相同代码检测完成"
+    else
+        log_error "相同代码检测失败"
+        return 1
+    fi
+}
+
+# 运行时内存测量
+run_memory_profiling() {
+    if [ "$SKIP_MEMORY" = true ]; then
+        log_message "跳过运行时内存测量（--no-memory）"
+        return 0
+    fi
+    
+    if [ "$ENABLE_MEMORY_PROFILE" != "true" ]; then
+        log_message "运行时内存测量已禁用，跳过"
+        return 0
+    fi
+    
+    if ! command -v python3 &> /dev/null; then
+        log_error "python3 未安装，跳过运行时内存测量"
+        return 1
+    fi
+    
+    log_message "=========================================="
+    log_message "开始运行时内存测量"
+    log_message "=========================================="
+    
+    local profile_args=(--build "$PROJECT_ROOT/$BUILD_DIR"
+                        --output "$PROJECT_ROOT/$RESULTS_DIR/memory_footprint.csv"
+                        --runs "${MEMORY_PROFILE_RUNS:-5}")
+    if [ -n "$SPECIFIC_PROGRAM" ]; then
+        profile_args+=(--program "$SPECIFIC_PROGRAM")
+    elif [ "$QUICK_MODE" = true ]; then
+        profile_args+=(--program fibonacci)
+    fi
+    if [ -n "$SPECIFIC_COMPILER" ]; then
+        profile_args+=(--compiler "$SPECIFIC_COMPILER")
+    fi
+    
+    python3 "$SCRIPT_DIR/profile_memory.py" "${profile_args[@]}" 2>&1 | tee -a "$LOG_FILE"
+    if [ "${PIPESTATUS[0]}" -eq 0 ]; then
+        log_message "运行时内存测量完成"
+    else
+        log_error "运行时内存测量失败"
+        return 1
+    fi
+}
+
+# 微基准测试
+run_microbenchmarks() {
+    if [ "$SKIP_BENCH" = true ]; then
+        log_message "跳过微基准测试（--no-bench）"
+        return 0
+    fi
+    
+    if [ "$ENABLE_MICROBENCH" != "true" ]; then
+        log_message "微基准测试已禁用，跳过"
+        return 0
+    fi
+    
+    if ! command -v python3 &> /dev/null; then
+        log_error "python3 未安装，跳过微基准测试"
+        return 1
+    fi
+    
+    log_message "=========================================="
+    log_message "开始微基准测试"
+    log_message "=========================================="
+    
+    local bench_args=(--build "$PROJECT_ROOT/$BUILD_DIR/bench"
+                      --output "$PROJECT_ROOT/$RESULTS_DIR/microbench.csv"
+                      --repeats "${MICROBENCH_REPEATS:-5}"
+                      --min-time "${MICROBENCH_MIN_TIME_MS:-10}")
+    if [ -n "$SPECIFIC_PROGRAM" ]; then
+        bench_args+=(--program "$SPECIFIC_PROGRAM")
+    elif [ "$QUICK_MODE" = true ]; then
+        bench_args+=(--program fibonacci)
+    fi
+    if [ -n "$SPECIFIC_COMPILER" ]; then
+        bench_args+=(--compiler "$SPECIFIC_COMPILER")
+    fi
+    if [ "$SKIP_ADVANCED" = true ]; then
+        bench_args+=(--no-lto)
+    fi
+    
+    python3 "$SCRIPT_DIR/microbench.py" "${bench_args[@]}" 2>&1 | tee -a "$LOG_FILE"
+    if [ "${PIPESTATUS[0]}" -eq 0 ]; then
+        log_message "微基准测试完成"
+    else
+        log_error "微基准测试失败"
+        return 1
+    fi
+}
+
+# 函数级运行时剖析
+run_function_profiling() {
+    if [ "$SKIP_PROFILE" = true ]; then
+        log_message "跳过函数级运行时剖析（--no-profile）"
+        return 0
+    fi
+    
+    if [ "$ENABLE_FUNCTION_PROFILE" != "true" ]; then
+        log_message "函数级运行时剖析已禁用，跳过"
+        return 0
+    fi
+    
+    if ! command -v python3 &> /dev/null; then
+        log_error "python3 未安装，跳过函数级运行时剖析"
+        return 1
+    fi
+    
+    log_message "=========================================="
+    log_message "开始函数级运行时剖析"
+    log_message "=========================================="
+    
+    local profile_args=(--build "$PROJECT_ROOT/$BUILD_DIR/profile"
+                        --output "$PROJECT_ROOT/$RESULTS_DIR/function_profile.csv"
+                        --runs "${FUNCTION_PROFILE_RUNS:-5}")
+    if [ -n "$SPECIFIC_PROGRAM" ]; then
+        profile_args+=(--program "$SPECIFIC_PROGRAM")
+    elif [ "$QUICK_MODE" = true ]; then
+        profile_args+=(--program fibonacci)
+    fi
+    if [ -n "$SPECIFIC_COMPILER" ]; then
+        profile_args+=(--compiler "$SPECIFIC_COMPILER")
+    fi
+    if [ "$SKIP_ADVANCED" = true ]; then
+        profile_args+=(--no-lto)
+    fi
+    
+    python3 "$SCRIPT_DIR/profile_functions.py" "${profile_args[@]}" 2>&1 | tee -a "$LOG_FILE"
+    if [ "${PIPESTATUS[0]}" -eq 0 ]; then
+        log_message "函数级运行时剖析完成"
+    else
+        log_error "函数级运行时剖析失败"
+        return 1
+    fi
+}
+
+# 优化备注收集
+run_opt_remarks() {
+    if [ "$SKIP_REMARKS" = true ]; then
+        log_message "跳过优化备注收集（--no-remarks）"
+        return 0
+    fi
+    
+    if [ "$ENABLE_OPT_REMARKS" != "true" ]; then
+        log_message "优化备注收集已禁用，跳过"
+        return 0
+    fi
+    
+    if ! command -v python3 &> /dev/null; then
+        log_error "python3 未安装，跳过优化备注收集"
+        return 1
+    fi
+    
+    log_message "=========================================="
+    log_message "开始收集优化备注"
+    log_message "=========================================="
+    
+    local remarks_args=(--output "$PROJECT_ROOT/$RESULTS_DIR/opt_remarks.csv")
+    if [ -n "$SPECIFIC_PROGRAM" ]; then
+        remarks_args+=(--program "$SPECIFIC_PROGRAM")
+    elif [ "$QUICK_MODE" = true ]; then
+        remarks_args+=(--program fibonacci)
+    fi
+    if [ -n "$SPECIFIC_COMPILER" ]; then
+        remarks_args+=(--compiler "$SPECIFIC_COMPILER")
+    fi
+    if [ "$SKIP_ADVANCED" = true ]; then
+        remarks_args+=(--no-lto)
+    fi
+    
+    python3 "$SCRIPT_DIR/opt_remarks.py" "${remarks_args[@]}" 2>&1 | tee -a "$LOG_FILE"
+    if [ "${PIPESTATUS[0]}" -eq 0 ]; then
+        log_message "优化备注收集完成"
+    else
+        log_error "优化备注收集失败"
+        return 1
+    fi
+}
+
+# 工具输出归档
+run_artifact_store() {
+    if [ "$SKIP_STORE" = true ]; then
+        log_message "跳过工具输出归档（--no-store）"
+        return 0
+    fi
+    
+    if [ "$ENABLE_ARTIFACT_STORE" != "true" ]; then
+        log_message "工件存储已禁用，跳过"
+        return 0
+    fi
+    
+    if ! command -v python3 &> /dev/null; then
+        log_error "python3 未安装，跳过工具输出归档"
+        return 1
+    fi
+    
+    log_message "=========================================="
+    log_message "开始工具输出归档"
+    log_message "=========================================="
+    
+    # 同时删除已从配置中移除的单元（程序、编译器或优化级别）的工件，避免分析读到过期的输出
+    local store_args=(--results "$PROJECT_ROOT/$RESULTS_DIR" ingest --config "$CONFIG_FILE")
+    if [ "$KEEP_TEXT_ARTIFACTS" != "true" ]; then
+        store_args+=(--prune)
+    fi
+    
+    python3 "$SCRIPT_DIR/artifact_store.py" "${store_args[@]}" 2>&1 | tee -a "$LOG_FILE"
+    if [ "${PIPESTATUS[0]}" -eq 0 ]; then
+        log_message "工具输出归档完成"
+    else
+        log_error "工具输出归档失败"
+        return 1
+    fi
+}
+
 # 主函数
 main() {
     # 解析命令行参数
@@ -1035,6 +1475,27 @@ main() {
     if [ "$SKIP_ADVANCED" = true ]; then
         log_message "跳过高级优化测试"
     fi
+    if [ "$SKIP_MEMORY" = true ]; then
+        log_message "跳过运行时内存测量"
+    fi
+    if [ "$SKIP_BENCH" = true ]; then
+        log_message "跳过微基准测试"
+    fi
+    if [ "$SKIP_COMPRESS" = true ]; then
+        log_message "跳过压缩后大小测量"
+    fi
+    if [ "$SKIP_ICF" = true ]; then
+        log_message "跳过相同代码检测"
+    fi
+    if [ "$SKIP_PROFILE" = true ]; then
+        log_message "跳过函数级运行时剖析"
+    fi
+    if [ "$SKIP_REMARKS" = true ]; then
+        log_message "跳过优化备注收集"
+    fi
+    if [ "$SKIP_STORE" = true ]; then
+        log_message "跳过工具输出归档"
+    fi
     
     # 检查工具
     check_tools
@@ -1051,6 +1512,30 @@ main() {
     # 运行PGO测试
     run_pgo_tests
     
+    # 运行静态链接测试
+    run_static_tests
+    
+    # 压缩后大小测量
+    run_compressed_size
+    
+    # 相同代码检测
+    run_identical_code
+    
+    # 运行时内存测量
+    run_memory_profiling
+    
+    # 微基准测试
+    run_microbenchmarks
+    
+    # 函数级运行时剖析
+    run_function_profiling
+    
+    # 优化备注收集
+    run_opt_remarks
+    
+    # 工具输出归档（在所有读取文本输出的步骤之后）
+    run_artifact_store
+    
     log_message "=========================================="
     log_message "所有测试完成"
     log_message "结束时间: $(date)"
@@ -0,0 +1,54 @@
+/*
+ * 运行时内存占用测量工具
+ *
+ * 用法: rusage_harness <可执行文件> [参数...]
+ *
+ * fork并执行目标程序（标准输出重定向到/dev/null），通过wait4获取子进程的资源使用，
+ * 在标准输出打印一行:
+ *   exit_status peak_rss_kb minor_faults major_faults voluntary_ctx_switches involuntary_ctx_switches
+ *
+ * Linux的ru_maxrss包含exec之前的常驻内存，因此测量必须由这样一个
+ * 常驻内存很小的进程启动，而不能直接由Python解释器fork。
+ */
+#include <fcntl.h>
+#include <stdio.h>
+#include <sys/resource.h>
+#include <sys/types.h>
+#include <sys/wait.h>
+#include <unistd.h>
+
+int main(int argc, char* argv[]) {
+    if (argc < 2) {
+        fprintf(stderr, "usage: %s <executable> [args...]\n", argv[0]);
+        return 2;
+    }
+
+    pid_t pid = fork();
+    if (pid < 0) {
+        perror("fork");
+        return 2;
+    }
+
+    if (pid == 0) {
+        int devnull = open("/dev/null", O_WRONLY);
+        if (devnull >= 0) {
+            dup2(devnull, STDOUT_FILENO);
+            close(devnull);
+        }
+        execv(argv[1], &argv[1]);
+        perror("execv");
+        _exit(127);
+    }
+
+    int status;
+    struct rusage usage;
+    if (wait4(pid, &status, 0, &usage) < 0) {
+        perror("wait4");
+        return 2;
+    }
+
+    int exit_status = WIFEXITED(status) ? WEXITSTATUS(status) : 128 + WTERMSIG(status);
+    printf("%d %ld %ld %ld %ld %ld\n", exit_status, usage.ru_maxrss, usage.ru_minflt,
+           usage.ru_majflt, usage.ru_nvcsw, usage.ru_nivcsw);
+    return 0;
+}
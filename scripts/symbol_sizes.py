@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+符号大小模块 - 从nm -S输出中提取每个函数的字节大小
+"""
+
+import pandas as pd
+import re
+
+import artifact_store
+
+
+# nm -S 输出: 地址 大小 类型 名称（无大小的符号只有三列）
+NM_LINE = re.compile(r'^([0-9a-fA-F]+)\s+([0-9a-fA-F]+)\s+([A-Za-z])\s+(\S+)$')
+
+
+def base_function_name(symbol):
+    """
+    去掉编译器生成的克隆后缀，如 fib_recursive.constprop.0、popcount.lto_priv.0、swap.part.0
+    """
+    return symbol.split('.', 1)[0]
+
+
+def parse_nm_sizes(text):
+    """
+    解析nm -S输出，统计每个函数的代码大小
+
+    编译器为同一函数生成的克隆（constprop、isra、part、lto_priv等）计入原函数。
+    被完全内联的函数不会出现在结果中。
+
+    Args:
+        text: nm -S的输出文本
+
+    Returns:
+        {函数名: 字节大小} 字典
+    """
+    sizes = {}
+    for line in text.splitlines():
+        match = NM_LINE.match(line.strip())
+        if not match or match.group(3) not in 'Tt':
+            continue
+        name = base_function_name(match.group(4))
+        sizes[name] = sizes.get(name, 0) + int(match.group(2), 16)
+    return sizes
+
+
+def load_function_sizes(results_dir):
+    """
+    读取所有nm输出的函数大小（results/nm下的文本文件或工件存储）
+
+    Args:
+        results_dir: 结果目录（results）
+
+    Returns:
+        DataFrame，包含 program, compiler, opt_level, function, function_size
+    """
+    rows = []
+    for key in artifact_store.list_artifacts(results_dir, 'nm'):
+        sizes = parse_nm_sizes(artifact_store.read_artifact(results_dir, key))
+        for function, size in sizes.items():
+            rows.append({'program': key.program, 'compiler': key.compiler,
+                         'opt_level': key.opt_level, 'function': function, 'function_size': size})
+
+    return pd.DataFrame(rows, columns=['program', 'compiler', 'opt_level', 'function', 'function_size'])
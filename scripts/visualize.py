@@ -12,6 +12,8 @@ import argparse
 from pathlib import Path
 import numpy as np
 
+import derived_tables
+
 
 # 设置中文字体支持
 plt.rcParams['font.sans-serif'] = ['DejaVu Sans', 'Arial', 'sans-serif']
@@ -22,31 +24,13 @@ sns.set_style("whitegrid")
 sns.set_palette("husl")
 
 
-def load_data(csv_file):
-    """
-    加载CSV文件到pandas DataFrame
-    
-    Args:
-        csv_file: CSV文件路径
-        
-    Returns:
-        pandas DataFrame包含代码大小数据
-    """
-    if not os.path.exists(csv_file):
-        raise FileNotFoundError(f"数据文件不存在: {csv_file}")
-    
-    df = pd.read_csv(csv_file)
-    print(f"成功加载 {len(df)} 条记录")
-    return df
-
-
 def plot_code_size_by_program(df, output_dir):
     """
     为每个测试程序生成柱状图，显示不同优化级别的代码大小
     按编译器分组显示
     
     Args:
-        df: pandas DataFrame
+        df: program_sizes派生表
         output_dir: 输出目录路径
     """
     print("\n生成按程序的代码大小可视化...")
@@ -109,10 +93,10 @@ def plot_code_size_by_program(df, output_dir):
 def plot_optimization_comparison(df, output_dir):
     """
     生成折线图显示优化趋势
-    计算并显示所有程序的平均值
+    显示所有程序的平均值
     
     Args:
-        df: pandas DataFrame
+        df: opt_level_means派生表
         output_dir: 输出目录路径
     """
     print("\n生成优化级别对比可视化...")
@@ -135,12 +119,8 @@ def plot_optimization_comparison(df, output_dir):
         else:
             opt_levels = [opt for opt in standard_opts if opt in compiler_data['opt_level'].values]
         
-        # 计算每个优化级别的平均代码大小
-        avg_sizes = []
-        for opt in opt_levels:
-            opt_data = compiler_data[compiler_data['opt_level'] == opt]
-            avg_size = opt_data['total_size'].mean()
-            avg_sizes.append(avg_size)
+        # 每个优化级别的平均代码大小
+        avg_sizes = compiler_data.set_index('opt_level').loc[opt_levels, 'total_size'].tolist()
         
         # 绘制折线图
         ax.plot(opt_levels, avg_sizes, marker='o', linewidth=2, 
@@ -174,7 +154,7 @@ def plot_compiler_comparison(df, output_dir):
     按优化级别分组
     
     Args:
-        df: pandas DataFrame
+        df: compiler_pivot派生表
         output_dir: 输出目录路径
     """
     print("\n生成编译器对比可视化...")
@@ -183,22 +163,18 @@ def plot_compiler_comparison(df, output_dir):
     fig, ax = plt.subplots(figsize=(14, 7))
     
     # 获取共同的优化级别
-    gcc_opts = set(df[df['compiler'] == 'gcc']['opt_level'].unique())
-    clang_opts = set(df[df['compiler'] == 'clang']['opt_level'].unique())
-    common_opts = sorted(gcc_opts & clang_opts,
+    pivot = df.set_index('opt_level')
+    for compiler in ['gcc', 'clang']:
+        if compiler not in pivot.columns:
+            pivot[compiler] = np.nan
+    pivot = pivot.dropna(subset=['gcc', 'clang'])
+    common_opts = sorted(pivot.index,
                         key=lambda x: (['-O0', '-O1', '-O2', '-O3', '-Os'].index(x) 
                                       if x in ['-O0', '-O1', '-O2', '-O3', '-Os'] else 99))
     
-    # 计算每个编译器在每个优化级别的平均代码大小
-    gcc_sizes = []
-    clang_sizes = []
-    
-    for opt in common_opts:
-        gcc_data = df[(df['compiler'] == 'gcc') & (df['opt_level'] == opt)]
-        clang_data = df[(df['compiler'] == 'clang') & (df['opt_level'] == opt)]
-        
-        gcc_sizes.append(gcc_data['total_size'].mean())
-        clang_sizes.append(clang_data['total_size'].mean())
+    # 每个编译器在每个优化级别的平均代码大小
+    gcc_sizes = pivot.loc[common_opts, 'gcc'].tolist()
+    clang_sizes = pivot.loc[common_opts, 'clang'].tolist()
     
     # 设置柱状图参数
     x = np.arange(len(common_opts))
@@ -240,7 +216,7 @@ def plot_advanced_optimizations(df, output_dir):
     显示LTO和PGO的效果，与标准优化级别对比
     
     Args:
-        df: pandas DataFrame
+        df: opt_level_means派生表
         output_dir: 输出目录路径
     """
     print("\n生成高级优化可视化...")
@@ -258,11 +234,8 @@ def plot_advanced_optimizations(df, output_dir):
         compiler_data = df[df['compiler'] == compiler]
         available_opts = [opt for opt in all_opts if opt in compiler_data['opt_level'].values]
         
-        # 计算平均代码大小
-        avg_sizes = []
-        for opt in available_opts:
-            opt_data = compiler_data[compiler_data['opt_level'] == opt]
-            avg_sizes.append(opt_data['total_size'].mean())
+        # 平均代码大小
+        avg_sizes = compiler_data.set_index('opt_level').loc[available_opts, 'total_size'].tolist()
         
         # 绘制柱状图
         colors = ['#1f77b4' if opt in ['-O0', '-O1', '-O2', '-O3', '-Os', '-Oz'] 
@@ -305,7 +278,7 @@ def plot_size_reduction_heatmap(df, output_dir):
     使用颜色表示代码大小减少百分比
     
     Args:
-        df: pandas DataFrame
+        df: impact_matrix派生表
         output_dir: 输出目录路径
     """
     print("\n生成代码大小减少热力图...")
@@ -314,41 +287,17 @@ def plot_size_reduction_heatmap(df, output_dir):
     compilers = sorted(df['compiler'].unique())
     
     for compiler in compilers:
-        compiler_data = df[df['compiler'] == compiler].copy()
+        compiler_data = df[df['compiler'] == compiler]
         
-        # 计算相对于-O0的减少百分比
-        programs = sorted(compiler_data['program'].unique())
         opt_levels = sorted(compiler_data['opt_level'].unique(),
                            key=lambda x: (x not in ['-O0', '-O1', '-O2', '-O3', '-Os', '-Oz'], x))
         
-        # 创建矩阵
-        reduction_matrix = []
-        
-        for program in programs:
-            program_data = compiler_data[compiler_data['program'] == program]
-            baseline = program_data[program_data['opt_level'] == '-O0']
-            
-            if baseline.empty:
-                continue
-            
-            baseline_size = baseline['total_size'].values[0]
-            
-            row = []
-            for opt in opt_levels:
-                opt_data = program_data[program_data['opt_level'] == opt]
-                if not opt_data.empty:
-                    opt_size = opt_data['total_size'].values[0]
-                    reduction_pct = (baseline_size - opt_size) / baseline_size * 100
-                    row.append(reduction_pct)
-                else:
-                    row.append(np.nan)
-            
-            reduction_matrix.append(row)
-        
-        # 创建DataFrame
-        heatmap_df = pd.DataFrame(reduction_matrix, 
-                                 index=programs, 
-                                 columns=opt_levels)
+        # 程序 x 优化级别 的减少百分比矩阵
+        heatmap_df = compiler_data.pivot(index='program', columns='opt_level',
+                                         values='reduction_pct')[opt_levels]
+        heatmap_df = heatmap_df.sort_index()
+        heatmap_df.index.name = None
+        heatmap_df.columns.name = None
         
         # 创建热力图
         fig, ax = plt.subplots(figsize=(12, 8))
@@ -404,6 +353,13 @@ def parse_arguments():
         help='输出目录路径 (默认: reports/figures)'
     )
     
+    parser.add_argument(
+        '--tables', '-t',
+        type=str,
+        default='analysis/derived',
+        help='派生表缓存目录，与analyze_data.py共用 (默认: analysis/derived)'
+    )
+    
     parser.add_argument(
         '--version', '-v',
         action='version',
@@ -431,17 +387,20 @@ def main():
         print("=" * 80)
         print(f"输入文件: {input_file}")
         print(f"输出目录: {figures_dir}")
+        print(f"派生表目录: {args.tables}")
         print()
         
-        # 加载数据
-        df = load_data(input_file)
+        # 加载派生表（输入未变化时直接读取analyze_data.py生成的缓存）
+        if not os.path.exists(input_file):
+            raise FileNotFoundError(f"数据文件不存在: {input_file}")
+        tables = derived_tables.load_tables(input_file, args.tables)
         
         # 生成各种可视化
-        plot_code_size_by_program(df, figures_dir)
-        plot_optimization_comparison(df, figures_dir)
-        plot_compiler_comparison(df, figures_dir)
-        plot_advanced_optimizations(df, figures_dir)
-        plot_size_reduction_heatmap(df, figures_dir)
+        plot_code_size_by_program(tables['program_sizes'], figures_dir)
+        plot_optimization_comparison(tables['opt_level_means'], figures_dir)
+        plot_compiler_comparison(tables['compiler_pivot'], figures_dir)
+        plot_advanced_optimizations(tables['opt_level_means'], figures_dir)
+        plot_size_reduction_heatmap(tables['impact_matrix'], figures_dir)
         
         print("\n" + "=" * 80)
         print("可视化完成！")
@@ -0,0 +1,672 @@
+#!/usr/bin/env python3
+"""
+监视模式脚本 - 监视src/和config.sh的变化，增量重新编译、测量、分析和绘图
+
+只重新处理受影响的 (程序, 编译器, 配置) 单元：
+  - src/X.c 变化: 重新编译程序X的所有单元
+  - config.sh 变化: 编译新增的单元，删除被移除单元的数据
+随后仅更新结果CSV中对应的行，对受影响的程序重新运行按程序进行的测量阶段，
+重新计算受影响的分析分组、重新绘制依赖它们的图表。
+"""
+
+import pandas as pd
+import subprocess
+import sys
+import os
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import analyze_data
+import artifact_store
+import compressed_size
+import derived_tables
+import microbench
+import profile_memory
+from project_config import load_config, config_cells, list_programs
+
+
+# code_size.csv的列顺序，与run_tests.sh保持一致
+RESULT_COLUMNS = ['program', 'compiler', 'opt_level', 'text_size', 'data_size',
+                  'bss_size', 'total_size', 'timestamp']
+
+
+def take_snapshot(src_dir, config_file):
+    """
+    记录被监视文件的修改时间和大小
+
+    Args:
+        src_dir: 源代码目录
+        config_file: config.sh路径
+
+    Returns:
+        {路径: (mtime_ns, size)} 字典
+    """
+    snapshot = {}
+    with os.scandir(src_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.c') and entry.is_file():
+                st = entry.stat()
+                snapshot[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+
+    if config_file.exists():
+        st = config_file.stat()
+        snapshot[config_file] = (st.st_mtime_ns, st.st_size)
+    return snapshot
+
+
+def wait_for_changes(src_dir, config_file, previous, interval, debounce):
+    """
+    轮询等待文件变化，并在文件稳定debounce秒后返回
+
+    Args:
+        src_dir: 源代码目录
+        config_file: config.sh路径
+        previous: 上一次的快照
+        interval: 轮询间隔（秒）
+        debounce: 变化后的稳定等待时间（秒）
+
+    Returns:
+        新快照
+    """
+    while True:
+        time.sleep(interval)
+        current = take_snapshot(src_dir, config_file)
+        if current == previous:
+            continue
+
+        # 编辑器保存时可能多次写入，等待文件稳定
+        while True:
+            time.sleep(debounce)
+            settled = take_snapshot(src_dir, config_file)
+            if settled == current:
+                return current
+            current = settled
+
+
+def changed_paths(old, new):
+    """
+    比较两次快照，返回新增、修改或删除的路径集合
+    """
+    return {path for path in set(old) | set(new) if old.get(path) != new.get(path)}
+
+
+def build_cell(project_root, config, cell, log_file):
+    """
+    编译单个单元，编译命令与run_tests.sh一致
+
+    Args:
+        project_root: 项目根目录
+        config: 配置字典
+        cell: (程序, 编译器, 优化级别) 元组
+        log_file: 编译错误日志文件对象
+
+    Returns:
+        可执行文件路径，编译失败时返回None
+    """
+    program, compiler, opt_level = cell
+    source_file = project_root / config['SRC_DIR'] / f'{program}.c'
+    output_dir = project_root / config['BUILD_DIR'] / compiler / opt_level.lstrip('-')
+    output_dir.mkdir(parents=True, exist_ok=True)
+    executable = output_dir / program
+
+    def run(cmd, **kwargs):
+        return subprocess.run([str(arg) for arg in cmd], stdout=subprocess.DEVNULL,
+                              stderr=log_file, **kwargs).returncode == 0
+
+    if opt_level == 'lto':
+        ok = run([compiler, '-O2', '-flto', '-o', executable, source_file])
+    elif opt_level == 'pgo':
+        ok = build_pgo(run, compiler, source_file, output_dir, program)
+    elif opt_level == 'static':
+        ok = run([compiler, '-O2', '-static', '-o', executable, source_file])
+    else:
+        ok = run([compiler, opt_level, '-o', executable, source_file])
+        if ok:
+            # 更新run_tests.sh使用的编译缓存
+            cache_file = output_dir / f'.{program}.cache'
+            cache_file.write_text(f'{int(source_file.stat().st_mtime)}\n')
+
+    return executable if ok else None
+
+
+def build_pgo(run, compiler, source_file, output_dir, program):
+    """
+    两阶段PGO编译，流程与run_tests.sh中的compile_with_pgo一致
+
+    Returns:
+        编译成功返回True
+    """
+    profile_dir = output_dir / 'profile_data'
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    stage1_output = output_dir / f'{program}_stage1'
+    executable = output_dir / program
+    profdata_file = profile_dir / f'{program}.profdata'
+    env = dict(os.environ)
+
+    # 阶段1: 生成profile数据
+    if compiler == 'gcc':
+        stage1_cmd = [compiler, '-O2', f'-fprofile-generate={profile_dir}',
+                      '-o', stage1_output, source_file]
+    elif compiler == 'clang':
+        stage1_cmd = [compiler, '-O2', '-fprofile-instr-generate',
+                      '-o', stage1_output, source_file]
+        env['LLVM_PROFILE_FILE'] = str(profile_dir / f'{program}.profraw')
+    else:
+        return False
+
+    if not run(stage1_cmd):
+        return False
+
+    try:
+        if not run([stage1_output], env=env, timeout=10):
+            return False
+    except subprocess.TimeoutExpired:
+        return False
+
+    if compiler == 'clang':
+        if not run(['llvm-profdata', 'merge', f'-output={profdata_file}',
+                    profile_dir / f'{program}.profraw']):
+            return False
+        stage2_cmd = [compiler, '-O2', f'-fprofile-instr-use={profdata_file}',
+                      '-o', executable, source_file]
+    else:
+        stage2_cmd = [compiler, '-O2', f'-fprofile-use={profile_dir}',
+                      '-o', executable, source_file]
+
+    ok = run(stage2_cmd)
+    stage1_output.unlink(missing_ok=True)
+    return ok
+
+
+def measure_size(executable):
+    """
+    使用size -A测量段大小，解析方式与run_tests.sh中的measure_size一致
+
+    Returns:
+        (text_size, data_size, bss_size, total_size) 元组
+    """
+    output = subprocess.run(['size', '-A', str(executable)], capture_output=True,
+                            text=True, check=True).stdout
+    sizes = {}
+    for line in output.splitlines():
+        fields = line.split()
+        if len(fields) >= 2 and fields[0] in ('.text', '.data', '.bss'):
+            sizes.setdefault(fields[0], int(fields[1]))
+
+    text_size = sizes.get('.text', 0)
+    data_size = sizes.get('.data', 0)
+    bss_size = sizes.get('.bss', 0)
+    return text_size, data_size, bss_size, text_size + data_size + bss_size
+
+
+def run_code_analysis(executable, cell, results_dir, log_file):
+    """
+    重新生成该单元的objdump、readelf和nm输出
+    """
+    program, compiler, opt_level = cell
+    tools = [('objdump', ['objdump', '-d'], 'asm'),
+             ('readelf', ['readelf', '-a'], 'txt'),
+             ('nm', ['nm', '-S'], 'txt')]
+
+    for name, cmd, suffix in tools:
+        tool_dir = results_dir / name
+        tool_dir.mkdir(parents=True, exist_ok=True)
+        output_file = tool_dir / f'{program}_{compiler}_{opt_level}.{suffix}'
+        with open(output_file, 'w') as f:
+            subprocess.run(cmd + [str(executable)], stdout=f, stderr=log_file)
+
+
+def process_cell(project_root, config, cell, log_file, harness=None):
+    """
+    编译、测量并分析单个单元
+
+    Args:
+        project_root: 项目根目录
+        config: 配置字典
+        cell: (程序, 编译器, 优化级别) 元组
+        log_file: 编译错误日志文件对象
+        harness: 内存测量工具路径，为None时不测量内存
+
+    Returns:
+        (code_size.csv中的一行, memory_footprint.csv中的行列表, compressed_size.csv中的一行或None)，
+        只用于内存测量的配置没有code_size.csv和compressed_size.csv的行（为None），编译失败时返回None
+    """
+    executable = build_cell(project_root, config, cell, log_file)
+    if executable is None:
+        print(f"  ✗ 编译失败: {' '.join(cell)}", file=sys.stderr)
+        return None
+
+    memory_rows = []
+    if harness is not None:
+        runs = int(config['MEMORY_PROFILE_RUNS'] or 5)
+        memory_rows = profile_memory.profile_cell(harness, executable, cell, runs)
+
+    if cell[2] in profile_memory.MEMORY_ONLY_OPT_LEVELS:
+        print(f"  ✓ {' '.join(cell)}: 内存测量 {len(memory_rows)} 次")
+        return None, memory_rows, None
+
+    compressed_row = None
+    if config['ENABLE_COMPRESSED_SIZE'] == 'true':
+        compressed_row = compressed_size.measure_cell(executable, cell)
+
+    text_size, data_size, bss_size, total_size = measure_size(executable)
+    run_code_analysis(executable, cell, project_root / config['RESULTS_DIR'], log_file)
+    print(f"  ✓ {' '.join(cell)}: total {total_size}")
+
+    program, compiler, opt_level = cell
+    return {
+        'program': program,
+        'compiler': compiler,
+        'opt_level': opt_level,
+        'text_size': text_size,
+        'data_size': data_size,
+        'bss_size': bss_size,
+        'total_size': total_size,
+        'timestamp': pd.Timestamp.now(tz='UTC').isoformat(timespec='seconds')
+    }, memory_rows, compressed_row
+
+
+def cell_mask(df, columns, keys):
+    """
+    返回df中键属于keys的行掩码
+    """
+    if df.empty:
+        return pd.Series(False, index=df.index)
+    index = pd.MultiIndex.from_frame(df[columns])
+    return pd.Series(index.isin(list(keys)), index=df.index)
+
+
+def replace_groups(existing, fresh, columns, keys):
+    """
+    用新计算的分组替换已有表中的同键分组
+    """
+    kept = existing[~cell_mask(existing, columns, keys)]
+    return pd.concat([kept, fresh], ignore_index=True)
+
+
+def update_results(csv_file, rows, cells, columns=RESULT_COLUMNS):
+    """
+    替换结果CSV中受影响单元的行
+
+    Args:
+        csv_file: 结果CSV路径（code_size.csv、memory_footprint.csv或compressed_size.csv）
+        rows: 新测量的行列表
+        cells: 受影响单元集合（包括被删除的单元）
+        columns: CSV列顺序
+
+    Returns:
+        更新后的DataFrame
+    """
+    existing = pd.read_csv(csv_file) if csv_file.exists() else pd.DataFrame(columns=columns)
+    fresh = pd.DataFrame(rows, columns=columns)
+    df = replace_groups(existing, fresh, ['program', 'compiler', 'opt_level'], cells)
+    df.to_csv(csv_file, index=False)
+    print(f"更新了 {len(fresh)} 条结果记录: {csv_file}")
+    return df
+
+
+def program_stages(project_root, config, cells, removed):
+    """
+    列出按程序重新运行的测量阶段，参数与run_tests.sh一致
+
+    Args:
+        project_root: 项目根目录
+        config: 配置字典
+        cells: 重新编译成功的单元集合
+        removed: 已从配置中移除的单元集合
+
+    Returns:
+        [(名称, 是否启用, 脚本参数列表, [(结果CSV, 分组列)], 需要重新运行的程序集合)] 列表
+    """
+    build_dir = project_root / config['BUILD_DIR']
+    results_dir = project_root / config['RESULTS_DIR']
+    cell_columns = ['program', 'compiler', 'opt_level']
+    programs = {program for program, _, _ in cells}
+    removed_programs = {program for program, _, _ in removed}
+    return [
+        # 近似相同的函数对在同一程序的所有构建之间查找，索引按程序整体替换，
+        # 移除单元后也要重新索引该程序剩余的构建
+        ('相同代码检测', config['ENABLE_IDENTICAL_CODE'] == 'true',
+         ['identical_code.py', '--build', build_dir, '--results', results_dir,
+          '--threshold', config['IDENTICAL_CODE_THRESHOLD'] or 0.8],
+         [(results_dir / 'function_hashes.csv', ['program']),
+          (results_dir / 'near_identical_functions.csv', ['program'])],
+         programs | removed_programs),
+        ('微基准测试', config['ENABLE_MICROBENCH'] == 'true',
+         ['microbench.py', '--build', build_dir / 'bench', '--output', results_dir / 'microbench.csv',
+          '--repeats', config['MICROBENCH_REPEATS'] or 5,
+          '--min-time', config['MICROBENCH_MIN_TIME_MS'] or 10],
+         [(results_dir / 'microbench.csv', cell_columns),
+          (results_dir / microbench.SIZES_FILE, cell_columns)],
+         programs & set(microbench.BENCHMARKS)),
+        ('函数级运行时剖析', config['ENABLE_FUNCTION_PROFILE'] == 'true',
+         ['profile_functions.py', '--build', build_dir / 'profile',
+          '--output', results_dir / 'function_profile.csv',
+          '--runs', config['FUNCTION_PROFILE_RUNS'] or 5],
+         [(results_dir / 'function_profile.csv', cell_columns)], programs),
+        ('优化备注收集', config['ENABLE_OPT_REMARKS'] == 'true',
+         ['opt_remarks.py', '--output', results_dir / 'opt_remarks.csv'],
+         [(results_dir / 'opt_remarks.csv', cell_columns)], programs),
+    ]
+
+
+def rerun_program_stages(project_root, config, cells, removed, log_file):
+    """
+    对受影响的程序重新运行相同代码检测、微基准测试、函数级剖析和优化备注收集
+
+    这些阶段按程序单独编译或索引，与run_tests.sh一样由config.sh中的ENABLE_*开关控制。
+    源代码修改后旧的测量已经过期，因此先删除受影响单元的旧记录再重新运行；
+    禁用的阶段只删除旧记录，使汇总报告不包含过期的结果。
+
+    Args:
+        project_root: 项目根目录
+        config: 配置字典
+        cells: 重新编译成功的单元集合
+        removed: 已从配置中移除的单元集合
+        log_file: 日志文件对象
+    """
+    affected = cells | removed
+    for name, enabled, command, outputs, programs in program_stages(project_root, config,
+                                                                    cells, removed):
+        for csv_file, columns in outputs:
+            if not csv_file.exists():
+                continue
+            keys = {tuple(cell[i] for i in key_positions(columns)) for cell in affected}
+            existing = pd.read_csv(csv_file)
+            existing[~cell_mask(existing, columns, keys)].to_csv(csv_file, index=False)
+
+        if not enabled:
+            continue
+        script = Path(__file__).resolve().parent / command[0]
+        for program in sorted(programs):
+            log_file.flush()
+            result = subprocess.run([sys.executable, str(script), *map(str, command[1:]),
+                                     '--program', program],
+                                    cwd=project_root, stdout=log_file, stderr=log_file)
+            if result.returncode == 0:
+                print(f"  ✓ {name}: {program}")
+            else:
+                print(f"  ✗ {name}失败: {program}，详见 test_run.log", file=sys.stderr)
+
+
+def key_positions(columns):
+    """
+    分组列在 (program, compiler, opt_level) 单元元组中的位置
+    """
+    return [('program', 'compiler', 'opt_level').index(col) for col in columns]
+
+
+def update_analysis(df, csv_file, analysis_dir, cells):
+    """
+    仅重新计算受影响的分析分组，重新生成派生表和汇总报告
+
+    内存占用、传输大小等可选测量结果的分析依赖各配置之间的对比，数据量都很小，
+    与analyze_data.py一样从results/中的文件完整重算，使汇总报告包含相同的章节。
+
+    各分析表的分组键:
+      - summary_statistics: (program, compiler, opt_level)
+      - compiler_comparison: (program, opt_level)
+      - optimization_impact: (program, compiler)
+      - opt_level_significance: (program, compiler)
+    """
+    stats_file = analysis_dir / 'summary_statistics.csv'
+    comparison_file = analysis_dir / 'compiler_comparison.csv'
+    impact_file = analysis_dir / 'optimization_impact.csv'
+    significance_file = analysis_dir / 'opt_level_significance.csv'
+    report_file = analysis_dir / 'summary_report.txt'
+
+    df = analyze_data.validate_data(df)
+    tables = derived_tables.load_tables(csv_file, analysis_dir / 'derived', df)
+
+    if not all(f.exists() for f in [stats_file, comparison_file, impact_file, significance_file]):
+        # 没有可复用的分析结果，完整计算一次
+        analysis_dir.mkdir(parents=True, exist_ok=True)
+        stats_df = analyze_data.calculate_statistics(df, stats_file)
+        comparison_df = analyze_data.compare_compilers(df, comparison_file, tables['program_sizes'])
+        impact_df = analyze_data.analyze_optimization_impact(df, impact_file, tables['impact_matrix'])
+        analyze_data.compare_opt_levels(df, significance_file)
+    else:
+        groups = [
+            (stats_file, analyze_data.calculate_statistics, ['program', 'compiler', 'opt_level']),
+            (comparison_file, analyze_data.compare_compilers, ['program', 'opt_level']),
+            (impact_file, analyze_data.analyze_optimization_impact, ['program', 'compiler']),
+            (significance_file, analyze_data.compare_opt_levels, ['program', 'compiler']),
+        ]
+        results = []
+        for output_file, compute, columns in groups:
+            keys = {tuple(cell[i] for i in key_positions(columns)) for cell in cells}
+            subset = df[cell_mask(df, columns, keys)]
+            existing = pd.read_csv(output_file)
+            fresh = compute(subset, None) if not subset.empty else existing.iloc[0:0]
+            table = replace_groups(existing, fresh, columns, keys)
+            table.to_csv(output_file, index=False)
+            print(f"重新计算 {len(keys)} 个分组: {output_file}")
+            results.append(table)
+        stats_df, comparison_df, impact_df, _ = results
+
+    results_dir = csv_file.parent
+    inputs = {name: results_dir / file_name
+              for name, file_name in analyze_data.OPTIONAL_INPUTS.items()}
+    optional = analyze_data.analyze_optional_inputs(inputs, results_dir, analysis_dir)
+
+    analyze_data.generate_summary_report(df, stats_df, comparison_df, impact_df, report_file,
+                                         **optional)
+    return tables
+
+
+def update_figures(tables, figures_dir, cells):
+    """
+    使用派生表仅重新绘制依赖受影响单元的图表
+
+    按程序的柱状图只对受影响的程序重绘，热力图只对受影响的编译器重绘；
+    跨程序平均的对比图依赖所有单元，总是重绘。
+    """
+    import visualize
+
+    figures_dir.mkdir(parents=True, exist_ok=True)
+    programs = {program for program, _, _ in cells}
+    compilers = {compiler for _, compiler, _ in cells}
+
+    sizes = tables['program_sizes']
+    program_sizes = sizes[sizes['program'].isin(programs)]
+    if not program_sizes.empty:
+        visualize.plot_code_size_by_program(program_sizes, figures_dir)
+
+    visualize.plot_optimization_comparison(tables['opt_level_means'], figures_dir)
+    visualize.plot_compiler_comparison(tables['compiler_pivot'], figures_dir)
+    visualize.plot_advanced_optimizations(tables['opt_level_means'], figures_dir)
+
+    impact = tables['impact_matrix']
+    compiler_impact = impact[impact['compiler'].isin(compilers)]
+    if not compiler_impact.empty:
+        visualize.plot_size_reduction_heatmap(compiler_impact, figures_dir)
+
+
+def process_changes(project_root, config, cells, removed, args):
+    """
+    处理一批受影响的单元：编译、更新结果、分析和图表
+
+    Args:
+        project_root: 项目根目录
+        config: 当前配置字典
+        cells: 需要重新编译的单元集合
+        removed: 已从配置中移除的单元集合
+        args: 命令行参数
+    """
+    start = time.time()
+    print(f"\n重新编译 {len(cells)} 个单元，移除 {len(removed)} 个单元...")
+
+    results_dir = project_root / config['RESULTS_DIR']
+    memory_file = results_dir / 'memory_footprint.csv'
+    harness = None
+    if config['ENABLE_MEMORY_PROFILE'] == 'true':
+        harness = profile_memory.build_harness(project_root / config['BUILD_DIR'])
+
+    jobs = max(1, int(config['PARALLEL_JOBS'] or 1))
+    with open(project_root / 'test_run.log', 'a') as log_file:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            ordered = sorted(cells)
+            outcomes = list(executor.map(
+                lambda cell: process_cell(project_root, config, cell, log_file, harness), ordered))
+    results = [result for result in outcomes if result is not None]
+    rows = [row for row, _, _ in results if row is not None]
+    memory_rows = [memory_row for _, memory, _ in results for memory_row in memory]
+    compressed_rows = [compressed for _, _, compressed in results if compressed is not None]
+
+    # 编译失败的单元保留旧数据
+    affected = {cell for cell, outcome in zip(ordered, outcomes) if outcome is not None} | removed
+    if not affected:
+        print("没有需要更新的单元")
+        return
+
+    csv_file = results_dir / 'code_size.csv'
+    df = update_results(csv_file, rows, affected)
+    if harness is not None or memory_file.exists():
+        update_results(memory_file, memory_rows, affected, profile_memory.MEMORY_COLUMNS)
+    compressed_file = results_dir / 'compressed_size.csv'
+    if config['ENABLE_COMPRESSED_SIZE'] == 'true' or compressed_file.exists():
+        update_results(compressed_file, compressed_rows, affected, compressed_size.COMPRESSED_COLUMNS)
+    if config['ENABLE_ARTIFACT_STORE'] == 'true':
+        with artifact_store.ArtifactStore(results_dir / artifact_store.STORE_NAME) as store:
+            artifact_store.ingest(store, results_dir, config['KEEP_TEXT_ARTIFACTS'] != 'true',
+                                  affected - removed)
+            artifact_store.delete_cells(store, results_dir, removed)
+            store.gc()
+    # 相同代码检测读取工具输出，在归档之后运行
+    with open(project_root / 'test_run.log', 'a') as log_file:
+        rerun_program_stages(project_root, config, affected - removed, removed, log_file)
+    if df.empty:
+        print("结果为空，跳过分析和可视化")
+        return
+
+    tables = update_analysis(df, csv_file, Path(args.analysis), affected)
+    if not args.no_figures:
+        update_figures(tables, Path(args.figures), affected)
+
+    print(f"增量更新完成，用时 {time.time() - start:.1f} 秒")
+
+
+def parse_arguments():
+    """
+    解析命令行参数
+
+    Returns:
+        argparse.Namespace: 解析后的参数
+    """
+    parser = argparse.ArgumentParser(
+        description='代码空间优化监视模式 - 源代码或配置变化时增量重新编译、测量、分析和绘图',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  %(prog)s                                    # 使用默认路径
+  %(prog)s --interval 0.2                     # 更快的轮询间隔
+  %(prog)s --no-figures                       # 仅更新数据和分析
+        """
+    )
+
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=0.5,
+        help='轮询间隔（秒）(默认: 0.5)'
+    )
+
+    parser.add_argument(
+        '--debounce',
+        type=float,
+        default=0.3,
+        help='检测到变化后等待文件稳定的时间（秒）(默认: 0.3)'
+    )
+
+    parser.add_argument(
+        '--analysis',
+        type=str,
+        default='analysis',
+        help='分析结果目录 (默认: analysis)'
+    )
+
+    parser.add_argument(
+        '--figures',
+        type=str,
+        default='reports/figures',
+        help='图表输出目录 (默认: reports/figures)'
+    )
+
+    parser.add_argument(
+        '--no-figures',
+        action='store_true',
+        help='不重新绘制图表'
+    )
+
+    parser.add_argument(
+        '--version', '-v',
+        action='version',
+        version='%(prog)s 1.0'
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_arguments()
+
+    project_root = Path(__file__).resolve().parent.parent
+    config_file = project_root / 'config.sh'
+
+    try:
+        config = load_config(config_file)
+        src_dir = project_root / config['SRC_DIR']
+        programs = list_programs(src_dir)
+        snapshot = take_snapshot(src_dir, config_file)
+
+        print("=" * 80)
+        print("监视模式")
+        print("=" * 80)
+        print(f"监视目录: {src_dir}")
+        print(f"监视配置: {config_file}")
+        print("按 Ctrl+C 退出")
+
+        while True:
+            new_snapshot = wait_for_changes(src_dir, config_file, snapshot,
+                                            args.interval, args.debounce)
+            changed = changed_paths(snapshot, new_snapshot)
+            snapshot = new_snapshot
+
+            old_cells = config_cells(config, programs)
+            if config_file in changed:
+                try:
+                    config = load_config(config_file)
+                except RuntimeError as e:
+                    print(f"\n错误: {e}，保留旧配置", file=sys.stderr)
+            programs = list_programs(src_dir)
+            new_cells = config_cells(config, programs)
+
+            # 修改过的源文件影响其所有单元，配置变化只影响新增或移除的单元
+            changed_programs = {path.stem for path in changed if path.suffix == '.c'}
+            cells = {cell for cell in new_cells
+                     if cell[0] in changed_programs or cell not in old_cells}
+            removed = old_cells - new_cells
+
+            if cells or removed:
+                try:
+                    process_changes(project_root, config, cells, removed, args)
+                except Exception as e:
+                    # 监视模式下出错不退出，等待下一次修改
+                    print(f"\n错误: {e}", file=sys.stderr)
+                    import traceback
+                    traceback.print_exc()
+
+    except KeyboardInterrupt:
+        print("\n退出监视模式")
+    except Exception as e:
+        print(f"\n错误: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()